@@ -0,0 +1,194 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import svg
+from helpers import quality, xml
+
+EXECUTOR_KINDS = ('thread', 'process')
+DEFAULT_EXECUTOR_KIND = 'thread'
+DEFAULT_CONCURRENCY = os.cpu_count() or 1
+DEFAULT_TIMEOUT = 30
+OUTPUT_FORMATS = ('png', 'pixels')
+worker_pool = None
+
+
+def init_worker():
+    """Import cairo and every shape module, so the first render of a worker does not pay for it,
+    and create the pool of surfaces reused by the renders of the worker.
+    """
+
+    global worker_pool
+    from helpers.surface_pool import SurfacePool
+
+    for item_tag in svg.SHAPE_MODULES:
+        svg.get_shape_module(item_tag)
+    if worker_pool is None:
+        worker_pool = SurfacePool()
+
+
+def render_in_worker(svg_data, quality_profile, output_format, mode, cancel_event=None, scale=svg.PIXEL_SCALE):
+    """Render svg bytes in a worker thread or process.
+
+    :param svg_data: Content of a svg file.
+    :param quality_profile: Name of a helpers.quality profile.
+    :param output_format: One of OUTPUT_FORMATS.
+    :param mode: Pixel layout for the pixels format, as accepted by svg.render_pixels.
+    :param cancel_event: Optional threading.Event stopping the render once set.
+    :param scale: Number of pixels per svg unit.
+    :return: Content of the png file, or a tuple (numpy array of the pixels, raster info).
+    """
+
+    if output_format == 'pixels':
+        return svg.render_pixels(svg_data, quality_profile, mode, cancel_event, scale)
+
+    return svg.render_png(svg_data, worker_pool, quality_profile, cancel_event=cancel_event, scale=scale)
+
+
+class AsyncRenderer:
+    """Render svg documents from asyncio code without blocking the event loop.
+
+    Parsing, rasterization and encoding run on an executor, with at most concurrency renders at once.
+    Other renders wait for a free slot without holding a thread. A render which is cancelled or times
+    out while waiting never starts. In threads, a running render stops before its next element;
+    in processes, it runs to its end, and its result is dropped.
+    """
+
+    def __init__(self, executor_kind=DEFAULT_EXECUTOR_KIND, concurrency=DEFAULT_CONCURRENCY,
+                 timeout=DEFAULT_TIMEOUT, executor=None):
+        """Create the executor.
+
+        :param executor_kind: 'thread' to render in threads of this process, which suits documents
+               with few large elements as cairo releases the GIL while it rasterizes
+               (the only state renders share, the surface pool and the path cache, is locked),
+               or 'process' to render in worker processes, which also parse documents in parallel.
+        :param concurrency: Maximum number of renders running at once.
+        :param timeout: Default number of seconds a render may take, including the wait for a free slot,
+               None to wait without limit.
+        :param executor: Optional concurrent.futures executor to use instead of creating one.
+               It is not shut down by close.
+        :raise: ValueError if the executor kind does not exist or the concurrency is not positive.
+        """
+
+        if executor_kind not in EXECUTOR_KINDS:
+            raise ValueError('Unknown executor kind: {}, expected one of {}'.format(
+                executor_kind, ', '.join(EXECUTOR_KINDS)))
+        if concurrency < 1:
+            raise ValueError('Concurrency must be at least 1')
+
+        self.executor_kind = executor_kind
+        self.timeout = timeout
+        self.slots = asyncio.Semaphore(concurrency)
+        self.owns_executor = executor is None
+        if executor is not None:
+            self.executor = executor
+        elif executor_kind == 'process':
+            self.executor = ProcessPoolExecutor(max_workers=concurrency, initializer=init_worker)
+        else:
+            init_worker()
+            self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='svg-render')
+        self.rendered = 0
+        self.cancelled = 0
+        self.timed_out = 0
+
+    async def run(self, svg_data, quality_profile, output_format, mode, scale=svg.PIXEL_SCALE):
+        """Wait for a free slot, then render on the executor.
+
+        The slot is given back when the executor is done with the render, not when the caller
+        stops waiting, so renders abandoned by their callers never exceed the concurrency limit.
+        """
+
+        await self.slots.acquire()
+        loop = asyncio.get_running_loop()
+        cancel_event = threading.Event() if self.executor_kind == 'thread' else None
+        try:
+            future = self.executor.submit(render_in_worker, svg_data, quality_profile, output_format, mode,
+                                          cancel_event, scale)
+        except BaseException:
+            self.slots.release()
+            raise
+
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self.slots.release))
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if cancel_event is not None:
+                cancel_event.set()
+            raise
+
+    async def render(self, svg_data, quality_profile=quality.DEFAULT_PROFILE, output_format='png', mode=None,
+                     timeout=None, scale=svg.PIXEL_SCALE):
+        """Convert svg bytes to png bytes or to pixels.
+
+        :param svg_data: Content of a svg file.
+        :param quality_profile: Name of a helpers.quality profile.
+        :param output_format: 'png' to get the encoded image, or 'pixels' to get the pixels without encoding them.
+        :param mode: Pixel layout for the pixels format, as accepted by svg.render_pixels.
+        :param timeout: Number of seconds this render may take, None to use the timeout of the renderer.
+        :param scale: Number of pixels per svg unit, e.g. the scale of a helpers.cost plan.
+        :return: Content of the png file, or a tuple (numpy array of the pixels, raster info).
+        :rtype: bytes or tuple
+        :raise: ValueError if the data is not a svg document, the quality profile or the output format does not
+                exist, asyncio.TimeoutError if the render takes longer than the timeout.
+        """
+
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError('Unknown output format: {}, expected one of {}'.format(
+                output_format, ', '.join(OUTPUT_FORMATS)))
+        quality.get_profile(quality_profile)
+        xml.check_svg_content(svg_data[:xml.SNIFF_BYTES])
+
+        try:
+            result = await asyncio.wait_for(self.run(svg_data, quality_profile, output_format, mode, scale),
+                                            timeout if timeout is not None else self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+        self.rendered += 1
+        return result
+
+    def stats(self):
+        """Get the counters of the renderer, as a dictionary."""
+        return {
+            'executor': self.executor_kind,
+            'rendered': self.rendered,
+            'cancelled': self.cancelled,
+            'timed_out': self.timed_out
+        }
+
+    def close(self, wait=True):
+        """Shut the executor down, dropping the renders which have not started.
+
+        :param wait: True to wait for the running renders to end.
+        """
+
+        if self.owns_executor:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+
+
+async def render_png(svg_data, renderer=None, quality_profile=quality.DEFAULT_PROFILE, timeout=None,
+                     scale=svg.PIXEL_SCALE):
+    """Convert svg bytes to png bytes without blocking the event loop.
+
+    :param svg_data: Content of a svg file.
+    :param renderer: AsyncRenderer to render with, None to use a new one for this render only.
+    :param quality_profile: Name of a helpers.quality profile.
+    :param timeout: Number of seconds the render may take, None to use the timeout of the renderer.
+    :param scale: Number of pixels per svg unit.
+    :return: Content of the png file.
+    :rtype: bytes
+    """
+
+    if renderer is not None:
+        return await renderer.render(svg_data, quality_profile, timeout=timeout, scale=scale)
+
+    renderer = AsyncRenderer(concurrency=1)
+    try:
+        return await renderer.render(svg_data, quality_profile, timeout=timeout, scale=scale)
+    finally:
+        renderer.close(wait=False)
@@ -0,0 +1,257 @@
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import svg
+from helpers import quality
+
+DEFAULT_OUTPUT_TEMPLATE = 'outputs/{stem}.png'
+DEFAULT_CHUNK_SIZE = 16
+DEFAULT_POOL_BYTES = 256 * 2 ** 20
+worker_pool = None
+worker_cache = None
+worker_quality_profile = quality.DEFAULT_PROFILE
+worker_scale = svg.PIXEL_SCALE
+
+
+def find_svg_files_in_directory(directory):
+    """Find all svg files inside a directory and its subdirectories.
+
+    :param directory: Path to a directory.
+    :return: Sorted list of paths to svg files.
+    :rtype: list
+    """
+
+    svg_files = []
+    for parent, _, filenames in os.walk(directory):
+        svg_files.extend(os.path.join(parent, filename) for filename in filenames
+                         if filename.lower().endswith('.svg'))
+
+    return sorted(svg_files)
+
+
+def read_manifest(manifest_filename):
+    """Read the svg files listed in a manifest.
+
+    :param manifest_filename: Path to a text file with one svg file per line.
+           Empty lines and lines starting with # are ignored.
+    :return: List of paths to svg files.
+    :rtype: list
+    """
+
+    with open(manifest_filename) as manifest:
+        lines = [line.strip() for line in manifest]
+
+    return [line for line in lines if line and not line.startswith('#')]
+
+
+def collect_svg_files(sources, manifest_filename=None):
+    """Expand the inputs received from command line to a list of svg files.
+
+    :param sources: Paths to svg files, directories or glob patterns.
+    :param manifest_filename: Optional path to a manifest of svg files.
+    :return: List of paths to svg files, without duplicates.
+    :rtype: list
+    """
+
+    svg_files = []
+    for source in sources:
+        if os.path.isdir(source):
+            svg_files.extend(find_svg_files_in_directory(source))
+        elif glob.has_magic(source):
+            svg_files.extend(sorted(glob.glob(source, recursive=True)))
+        else:
+            svg_files.append(source)
+
+    if manifest_filename is not None:
+        svg_files.extend(read_manifest(manifest_filename))
+
+    return list(dict.fromkeys(svg_files))
+
+
+def get_output_filename(template, svg_file, index):
+    """Build the output path of a svg file from a naming template.
+
+    :param template: A format string which can use the fields
+           {stem} (file name without extension), {name} (file name),
+           {parent} (name of the parent directory), {dir} (path of the parent directory)
+           and {index} (position of the file in the batch).
+    :param svg_file: Path to a svg file.
+    :param index: Position of the svg file in the batch.
+    :return: Path to the png file.
+    :rtype: str
+    """
+
+    directory, name = os.path.split(svg_file)
+    return template.format(stem=os.path.splitext(name)[0],
+                           name=name,
+                           parent=os.path.basename(os.path.abspath(directory)),
+                           dir=directory or '.',
+                           index=index)
+
+
+def describe_error(error):
+    """Build a human readable message for an error raised while converting a file, printed after its name."""
+    if isinstance(error, FileNotFoundError):
+        return 'File not found'
+    if isinstance(error, ValueError):
+        return 'Invalid file. Should be a svg'
+
+    return '{0}: {1}'.format(type(error).__name__, error)
+
+
+def init_worker(pool_bytes, cache_dir=None, cache_bytes=None, quality_profile=quality.DEFAULT_PROFILE,
+                scale=svg.PIXEL_SCALE):
+    """Create the surface pool and open the render cache of a worker, shared by all files it converts.
+
+    :param pool_bytes: Maximum size of the pooled surfaces, 0 to disable pooling.
+    :param cache_dir: Optional directory of the render cache shared by all workers.
+    :param cache_bytes: Maximum size of the render cache.
+    :param quality_profile: Name of the helpers.quality profile of all renders.
+    :param scale: Number of pixels per svg unit of all renders.
+    """
+
+    global worker_pool, worker_cache, worker_quality_profile, worker_scale
+    worker_quality_profile = quality_profile
+    worker_scale = scale
+    if pool_bytes > 0:
+        from helpers.surface_pool import SurfacePool
+        worker_pool = SurfacePool(pool_bytes)
+    else:
+        worker_pool = None
+
+    if cache_dir is not None:
+        from helpers import render_cache
+        worker_cache = render_cache.RenderCache(cache_dir, cache_bytes or render_cache.DEFAULT_MAX_BYTES)
+    else:
+        worker_cache = None
+
+
+def convert_file(job):
+    """Convert one svg file of the batch.
+
+    :param job: A tuple (svg_file, png_filename).
+    :return: A tuple (svg_file, png_filename, error message or None, True if the png came from the cache).
+    :rtype: tuple
+    """
+
+    svg_file, png_filename = job
+    hits = worker_cache.hits if worker_cache is not None else 0
+    try:
+        output_directory = os.path.dirname(png_filename)
+        if output_directory:
+            os.makedirs(output_directory, exist_ok=True)
+        svg.convert(svg_file, png_filename, worker_pool, worker_cache, worker_quality_profile, scale=worker_scale)
+    except Exception as error:
+        return svg_file, png_filename, describe_error(error), False
+
+    return svg_file, png_filename, None, worker_cache is not None and worker_cache.hits > hits
+
+
+def run_jobs(jobs, workers, chunk_size=DEFAULT_CHUNK_SIZE, pool_bytes=DEFAULT_POOL_BYTES,
+             cache_dir=None, cache_bytes=None, quality_profile=quality.DEFAULT_PROFILE, scale=svg.PIXEL_SCALE):
+    """Convert all files of the batch, yielding one result per file as soon as it is ready.
+
+    :param jobs: List of tuples (svg_file, png_filename).
+    :param workers: Number of worker processes. With 1 worker the batch runs in this process.
+    :param chunk_size: Number of jobs sent to a worker at once.
+    :param pool_bytes: Maximum size of the surfaces pooled by each worker, 0 to disable pooling.
+    :param cache_dir: Optional directory of a render cache shared by all workers.
+    :param cache_bytes: Maximum size of the render cache.
+    :param quality_profile: Name of the helpers.quality profile of all renders.
+    :param scale: Number of pixels per svg unit of all renders.
+    :return: A generator of tuples returned by convert_file. If a worker process dies,
+             the files which were not converted yet are reported as failed.
+    """
+
+    worker_arguments = (pool_bytes, cache_dir, cache_bytes, quality_profile, scale)
+    if workers == 1:
+        init_worker(*worker_arguments)
+        yield from map(convert_file, jobs)
+        return
+
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=worker_arguments) as executor:
+            for result in executor.map(convert_file, jobs, chunksize=chunk_size):
+                yield result
+                done += 1
+    except BrokenProcessPool:
+        for svg_file, png_filename in jobs[done:]:
+            yield svg_file, png_filename, 'Worker process terminated abruptly', False
+
+
+def parse_arguments(argv):
+    """Parse the arguments received from command line.
+
+    :param argv: The list of arguments received from command line.
+    :return: The parsed arguments.
+    :rtype: argparse.Namespace
+    """
+
+    parser = argparse.ArgumentParser(prog='batch.py', description='Convert many svg files to png format.')
+    parser.add_argument('sources', nargs='*', help='svg files, directories or glob patterns')
+    parser.add_argument('-m', '--manifest', help='text file with one svg file per line')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT_TEMPLATE,
+                        help='naming template for png files, with fields {stem}, {name}, {parent}, '
+                             '{dir} and {index} (default: %(default)s)')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='number of worker processes (default: %(default)s)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='number of files sent to a worker at once (default: %(default)s)')
+    parser.add_argument('--pool-bytes', type=int, default=DEFAULT_POOL_BYTES,
+                        help='memory each worker may keep in reusable surfaces, 0 to disable '
+                             '(default: %(default)s)')
+    parser.add_argument('--cache-dir', help='directory of a cache of previous renders')
+    parser.add_argument('--cache-size', type=int, help='maximum size of the cache in bytes (default: 1 GiB)')
+    parser.add_argument('-q', '--quality', choices=sorted(quality.PROFILES), default=quality.DEFAULT_PROFILE,
+                        help='quality profile, draft and fast trade fidelity for speed (default: %(default)s)')
+
+    arguments = parser.parse_args(argv)
+    if not arguments.sources and arguments.manifest is None:
+        parser.error('no input files')
+    if arguments.workers < 1 or arguments.chunk_size < 1:
+        parser.error('--workers and --chunk-size must be positive')
+
+    return arguments
+
+
+def main(argv):
+    """Convert many svg files to png format.
+
+    :param argv: The list of arguments received from command line.
+    :return: Exit status, 0 if all files were converted.
+    :rtype: int
+    """
+
+    arguments = parse_arguments(argv)
+    svg_files = collect_svg_files(arguments.sources, arguments.manifest)
+    jobs = [(svg_file, get_output_filename(arguments.output, svg_file, index))
+            for index, svg_file in enumerate(svg_files)]
+
+    png_filenames = [png_filename for _, png_filename in jobs]
+    if len(set(png_filenames)) != len(png_filenames):
+        print('Output template', arguments.output, 'gives the same png file to several inputs', file=sys.stderr)
+        return 2
+
+    failures = 0
+    cache_hits = 0
+    for svg_file, png_filename, error, cache_hit in run_jobs(jobs, arguments.workers, arguments.chunk_size,
+                                                                arguments.pool_bytes, arguments.cache_dir,
+                                                                arguments.cache_size, arguments.quality):
+        if error is not None:
+            failures += 1
+            print('{0}: {1}'.format(svg_file, error), file=sys.stderr)
+        cache_hits += cache_hit
+
+    print('Converted {0} of {1} files'.format(len(jobs) - failures, len(jobs)))
+    if arguments.cache_dir is not None:
+        print('Cache: {0} hits, {1} misses'.format(cache_hits, len(jobs) - failures - cache_hits))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
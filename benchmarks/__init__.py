@@ -0,0 +1,20 @@
+"""
+This package contains scripts used to measure the performance of the renderer.
+
+Each module can be run with `python -m benchmarks.<module>` from the repository root.
+
+benchmarks/batching: Compare drawing elements one by one with batched fills, and check their pixels.
+benchmarks/concurrency: Measure how long the event loop stalls while documents are rendered from asyncio code.
+benchmarks/display_list: Compare parsing a document for every output scale with replaying a display list.
+benchmarks/elements: Measure the cost per element of converting attributes, bounding elements and building paths.
+benchmarks/generators: Generate synthetic svg documents of any size, used by the benchmark suite.
+benchmarks/instancing: Compare drawing a symbol with <use> elements with drawing inline copies of it.
+benchmarks/loader: Compare the streaming svg loader with the two-parse loader.
+benchmarks/path_cache: Compare rendering paths with and without the cache of path geometries.
+benchmarks/path_parsing: Measure the speed of the path data tokenizer.
+benchmarks/polylines: Measure the parsing, simplification and drawing of large polylines.
+benchmarks/quality: Compare the render time and the pixels of every quality profile.
+benchmarks/striped: Check that striped rendering gives the same pixels as a single pass, and compare their peak memory.
+benchmarks/suite: Time every stage on synthetic documents and compare the times with saved baselines.
+benchmarks/startup: Measure the time from interpreter start to the first drawn element.
+"""
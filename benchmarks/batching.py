@@ -0,0 +1,133 @@
+"""Compare drawing elements one by one with drawing them through helpers.painter.Painter,
+and check that both give the same pixels.
+
+Usage: python -m benchmarks.batching [number_of_elements]
+
+Two scatter plots are rendered. In the first one, elements of the same color never
+overlap, so batched fills must give exactly the same pixels. In the second one they
+overlap, and a merged fill covers the antialiased edges inside a run once instead of
+once per element, so only the number of differing pixels is reported. The script exits
+with status 1 when the first scatter plot differs.
+"""
+import io
+import random
+import sys
+import time
+
+import svg
+from helpers import xml
+
+DEFAULT_NUMBER_OF_ELEMENTS = 100000
+COLORS = ('#1f77b4', '#ff7f0e', '#2ca02c')
+SIZE = 200
+
+
+def generate_scatter_plot(number_of_elements, overlapping, seed=0):
+    """Generate a svg scatter plot of circles, with a few rectangles, ellipses and stroked markers.
+
+    :param number_of_elements: Number of markers.
+    :param overlapping: If False, markers lie on a grid and do not touch each other.
+    :param seed: Seed of the random generator.
+    :return: Content of the svg file.
+    :rtype: bytes
+    """
+
+    generator = random.Random(seed)
+    lines = ['<svg width="{0}" height="{0}" xmlns="http://www.w3.org/2000/svg">'.format(SIZE)]
+    columns = int(number_of_elements ** 0.5) + 1
+    step = SIZE / columns
+    for i in range(number_of_elements):
+        if overlapping:
+            x, y, radius = generator.uniform(0, SIZE), generator.uniform(0, SIZE), generator.uniform(0.2, 1)
+        else:
+            x, y, radius = (i % columns + 0.5) * step, (i // columns + 0.5) * step, step / 2.5
+        # long runs of the same color, as plotting libraries write one series after the other
+        color = COLORS[i * len(COLORS) // number_of_elements]
+        kind = generator.random()
+        if kind < 0.9:
+            lines.append('<circle cx="{0:.2f}" cy="{1:.2f}" r="{2:.2f}" fill="{3}"/>'.format(x, y, radius, color))
+        elif kind < 0.95:
+            lines.append('<rect x="{0:.2f}" y="{1:.2f}" width="{2:.2f}" height="{2:.2f}" fill="{3}"/>'
+                         .format(x - radius, y - radius, 2 * radius, color))
+        elif kind < 0.98:
+            lines.append('<ellipse cx="{0:.2f}" cy="{1:.2f}" rx="{2:.2f}" ry="{3:.2f}" fill="{4}"/>'
+                         .format(x, y, radius, radius / 2, color))
+        else:
+            lines.append('<circle cx="{0:.2f}" cy="{1:.2f}" r="{2:.2f}" fill="{3}" stroke="black" '
+                         'stroke-width="0.5"/>'.format(x, y, radius, color))
+    lines.append('</svg>')
+
+    return '\n'.join(lines).encode()
+
+
+def render(svg_data, batched):
+    """Render svg bytes and measure the time spent drawing.
+
+    :param svg_data: Content of a svg file.
+    :param batched: True to draw through a painter.
+    :return: A tuple (cairo surface, seconds).
+    :rtype: tuple
+    """
+
+    size, items = xml.stream_svg(io.BytesIO(svg_data))
+    items = list(items)
+    surface = svg.init_surface(size)
+    context = svg.init_cairo_context(surface, size)
+
+    start = time.perf_counter()
+    svg.fill_context(context, size, items, batched)
+    surface.flush()
+    return surface, time.perf_counter() - start
+
+
+def compare_pixels(surface1, surface2):
+    """Compare the pixels of two surfaces of the same size and format.
+
+    :return: A tuple (number of differing pixels, largest difference of a color channel).
+    :rtype: tuple
+    """
+
+    data1, data2 = bytes(surface1.get_data()), bytes(surface2.get_data())
+    if data1 == data2:
+        return 0, 0
+
+    differing_pixels = 0
+    largest_difference = 0
+    for offset in range(0, len(data1), 4):
+        pixel1, pixel2 = data1[offset:offset + 4], data2[offset:offset + 4]
+        if pixel1 != pixel2:
+            differing_pixels += 1
+            largest_difference = max(largest_difference, *(abs(a - b) for a, b in zip(pixel1, pixel2)))
+
+    return differing_pixels, largest_difference
+
+
+def main(argv):
+    """Run the batching benchmark.
+
+    :param argv: The list of arguments received from command line.
+    :return: Exit status, 1 if batching changes the pixels of elements which do not overlap.
+    :rtype: int
+    """
+
+    number_of_elements = int(argv[0]) if argv else DEFAULT_NUMBER_OF_ELEMENTS
+    status = 0
+    for overlapping in (False, True):
+        svg_data = generate_scatter_plot(number_of_elements, overlapping)
+        unbatched_surface, unbatched_seconds = render(svg_data, batched=False)
+        batched_surface, batched_seconds = render(svg_data, batched=True)
+        differing_pixels, largest_difference = compare_pixels(unbatched_surface, batched_surface)
+
+        print('{0} elements, {1}'.format(number_of_elements, 'overlapping' if overlapping else 'not overlapping'))
+        print('{0:>24}: {1:9.2f} ms'.format('one by one', unbatched_seconds * 1000))
+        print('{0:>24}: {1:9.2f} ms'.format('batched', batched_seconds * 1000))
+        print('{0:>24}: {1} (largest channel difference {2})'.format('differing pixels', differing_pixels,
+                                                                     largest_difference))
+        if not overlapping and differing_pixels:
+            status = 1
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
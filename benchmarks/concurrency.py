@@ -0,0 +1,87 @@
+"""Measure how long the event loop stalls while documents are rendered from asyncio code.
+
+Usage: python -m benchmarks.concurrency [number_of_documents]
+
+A heartbeat task records how late it wakes up while the documents are rendered, once by calling
+svg.render_png on the event loop and once with each executor kind of async_render.AsyncRenderer.
+"""
+import asyncio
+import sys
+import time
+
+import async_render
+import svg
+from benchmarks import generators
+
+DEFAULT_NUMBER_OF_DOCUMENTS = 16
+NUMBER_OF_SHAPES = 2000
+HEARTBEAT_SECONDS = 0.005
+
+
+async def heartbeat(delays, stop):
+    """Sleep in a loop and record how much later than asked each wake up happens."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        delays.append(loop.time() - start - HEARTBEAT_SECONDS)
+
+
+async def measure(documents, render):
+    """Render documents concurrently while a heartbeat runs.
+
+    :param documents: List of svg bytes.
+    :param render: Coroutine function converting svg bytes to png bytes.
+    :return: A tuple (total seconds, worst heartbeat delay in seconds).
+    :rtype: tuple
+    """
+
+    delays = []
+    stop = asyncio.Event()
+    heartbeat_task = asyncio.create_task(heartbeat(delays, stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(render(svg_data) for svg_data in documents))
+    seconds = time.perf_counter() - start
+    stop.set()
+    await heartbeat_task
+
+    return seconds, max(delays, default=0.0)
+
+
+async def render_blocking(svg_data):
+    """Render on the event loop, as a service calling the blocking api would."""
+    return svg.render_png(svg_data)
+
+
+async def run(number_of_documents):
+    """Measure every way of rendering and print the results."""
+    documents = [generators.generate_shapes('circle', NUMBER_OF_SHAPES, seed) for seed in range(number_of_documents)]
+    print('{0} documents of {1} circles'.format(number_of_documents, NUMBER_OF_SHAPES))
+
+    seconds, worst_delay = await measure(documents, render_blocking)
+    print('  {0:>8}: {1:9.2f} ms  worst event loop stall {2:9.2f} ms'.format(
+        'blocking', seconds * 1000, worst_delay * 1000))
+    for executor_kind in async_render.EXECUTOR_KINDS:
+        renderer = async_render.AsyncRenderer(executor_kind, timeout=None)
+        try:
+            # the first render of each worker pays for its warm up, which is not what is measured
+            await asyncio.gather(*(renderer.render(svg_data) for svg_data in documents))
+            seconds, worst_delay = await measure(documents, renderer.render)
+        finally:
+            renderer.close()
+        print('  {0:>8}: {1:9.2f} ms  worst event loop stall {2:9.2f} ms'.format(
+            executor_kind, seconds * 1000, worst_delay * 1000))
+
+
+def main(argv):
+    """Run the concurrency benchmark.
+
+    :param argv: The list of arguments received from command line.
+    """
+
+    asyncio.run(run(int(argv[0]) if argv else DEFAULT_NUMBER_OF_DOCUMENTS))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
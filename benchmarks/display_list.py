@@ -0,0 +1,83 @@
+"""Compare rendering a document at several scales by parsing it again for each scale
+with parsing it once, compiling it to a display list and replaying the list.
+
+Usage: python -m benchmarks.display_list [svg_file] [scale ...]
+
+Without a svg file, every file of inputs and inputs/path is rendered.
+"""
+import glob
+import math
+import sys
+import time
+
+import cairo
+
+from renderers.display_list import compile_document, render_display_list
+from renderers.document import load_document
+
+DEFAULT_SCALES = (1, 10, 40)
+REPEAT = 5
+
+
+def render_parsed(svg_file, scale):
+    """Parse a svg file and draw its elements at a scale, as the default renderer does."""
+    document = load_document(svg_file)
+    width, height = document.size
+    surface = cairo.ImageSurface(cairo.FORMAT_RGB24, math.ceil(width * scale), math.ceil(height * scale))
+    context = cairo.Context(surface)
+    context.scale(scale, scale)
+    context.rectangle(0, 0, width, height)
+    context.fill()
+    for shape, attributes in document.elements:
+        shape.draw(context, attributes)
+
+    return surface
+
+
+def best_time(function):
+    """Get the best wall time of a function over REPEAT runs, in seconds."""
+    best = math.inf
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main(argv):
+    """Run the display list benchmark.
+
+    :param argv: The list of arguments received from command line.
+    """
+
+    svg_files = argv[:1] or sorted(glob.glob('inputs/*.svg') + glob.glob('inputs/path/*.svg'))
+    scales = [float(scale) for scale in argv[1:]] or DEFAULT_SCALES
+
+    def parse_every_time():
+        for svg_file in svg_files:
+            for scale in scales:
+                render_parsed(svg_file, scale)
+
+    def parse_once():
+        for svg_file in svg_files:
+            display_list = compile_document(load_document(svg_file))
+            for scale in scales:
+                render_display_list(display_list, scale)
+
+    display_lists = [compile_document(load_document(svg_file)) for svg_file in svg_files]
+
+    def replay_only():
+        for display_list in display_lists:
+            for scale in scales:
+                render_display_list(display_list, scale)
+
+    print('{0} files at scales {1}'.format(len(svg_files), ', '.join(str(scale) for scale in scales)))
+    for label, function in (('parse for every scale', parse_every_time),
+                            ('parse and compile once', parse_once),
+                            ('replay only', replay_only)):
+        print('{0:>24}: {1:9.2f} ms'.format(label, best_time(function) * 1000))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
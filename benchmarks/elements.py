@@ -0,0 +1,91 @@
+"""Measure the cost per element of converting attributes, bounding elements and building their paths.
+
+Usage: python -m benchmarks.elements [number_of_elements]
+
+Synthetic documents of every shape are parsed once, then each step is timed
+separately on the parsed elements. Paths are built on a scratch context whose
+current path is discarded, so the times are dominated by the interpreter work
+done per element rather than by rasterization. The memory column is the size
+of the converted attributes of all elements.
+"""
+import io
+import sys
+import time
+import tracemalloc
+
+import svg
+from benchmarks import generators
+from helpers import xml
+
+DEFAULT_NUMBER_OF_ELEMENTS = 20000
+REPEAT = 5
+
+
+def get_documents(number_of_elements):
+    """Generate one document per benchmarked element type."""
+    documents = {tag: generators.generate_shapes(tag, number_of_elements)
+                 for tag in ('rect', 'circle', 'ellipse', 'line')}
+    documents['path'] = generators.generate_paths(number_of_elements // 20, 20)
+    return documents
+
+
+def measure(function):
+    """Get the best time of REPEAT calls of a function, in seconds."""
+    best_seconds = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+
+    return best_seconds
+
+
+def parse_items(items, size):
+    """Convert the attributes of every item."""
+    return [svg.parse_item(item, size) for item in items]
+
+
+def bound_elements(elements):
+    """Get the bounding box of every element."""
+    for shape, attributes in elements:
+        shape.get_bounding_box(attributes)
+
+
+def build_paths(context, elements):
+    """Add the outline of every element to the path of a context, then discard it."""
+    for shape, attributes in elements:
+        shape.add_path(context, attributes)
+        context.new_path()
+
+
+def main(argv):
+    """Run the element benchmark.
+
+    :param argv: The list of arguments received from command line.
+    """
+
+    import cairo
+
+    number_of_elements = int(argv[0]) if argv else DEFAULT_NUMBER_OF_ELEMENTS
+    context = cairo.Context(cairo.ImageSurface(cairo.FORMAT_A8, 1, 1))
+
+    for tag, svg_data in get_documents(number_of_elements).items():
+        size, items = xml.stream_svg(io.BytesIO(svg_data))
+        items = list(items)
+
+        tracemalloc.start()
+        elements = parse_items(items, size)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        per_element = 1e6 / len(items)
+        print('{0:>8}: attributes {1:6.2f} us  bounding box {2:6.2f} us  path {3:6.2f} us  memory {4:6.0f} B'
+              ' per element'.format(tag, measure(lambda: parse_items(items, size)) * per_element,
+                                    measure(lambda: bound_elements(elements)) * per_element,
+                                    measure(lambda: build_paths(context, elements)) * per_element,
+                                    memory / len(items)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,153 @@
+"""Generate synthetic svg documents of any size, always the same for the same parameters."""
+import random
+
+from shapes import path
+
+SIZE = (1000, 1000)
+COLORS = ('red', '#336699', 'rgb(20, 160, 80)', 'hsl(45, 100%, 50%)', '#f0f')
+
+
+def get_document(elements, size=SIZE):
+    """Wrap svg elements in a svg document.
+
+    :param elements: List of svg elements as strings.
+    :param size: Width and height of the document.
+    :return: Content of the svg file.
+    :rtype: bytes
+    """
+
+    header = '<svg width="{0}" height="{1}" xmlns="http://www.w3.org/2000/svg">'.format(*size)
+    return '\n'.join([header] + elements + ['</svg>']).encode()
+
+
+def get_style(generator, stroke_share=0.3):
+    """Get random fill and stroke attributes."""
+    style = 'fill="{0}"'.format(generator.choice(COLORS))
+    if generator.random() < stroke_share:
+        style += ' stroke="{0}" stroke-width="{1:.1f}"'.format(generator.choice(COLORS), generator.uniform(0.5, 3))
+
+    return style
+
+
+def generate_shapes(tag, number_of_elements, seed=0, size=SIZE):
+    """Generate a document of rect, circle, ellipse or line elements.
+
+    :param tag: Tag of the elements.
+    :param number_of_elements: Number of elements.
+    :param seed: Seed of the random generator.
+    :param size: Width and height of the document, over which the elements are spread.
+    :return: Content of the svg file.
+    :rtype: bytes
+    """
+
+    generator = random.Random(seed)
+    width, height = size
+    elements = []
+    for _ in range(number_of_elements):
+        x, y = generator.uniform(0, width), generator.uniform(0, height)
+        a, b = generator.uniform(1, 40), generator.uniform(1, 40)
+        if tag == 'rect':
+            attributes = 'x="{0:.2f}" y="{1:.2f}" width="{2:.2f}" height="{3:.2f}"'.format(x, y, a, b)
+        elif tag == 'circle':
+            attributes = 'cx="{0:.2f}" cy="{1:.2f}" r="{2:.2f}"'.format(x, y, a)
+        elif tag == 'ellipse':
+            attributes = 'cx="{0:.2f}" cy="{1:.2f}" rx="{2:.2f}" ry="{3:.2f}"'.format(x, y, a, b)
+        elif tag == 'line':
+            attributes = 'x1="{0:.2f}" y1="{1:.2f}" x2="{2:.2f}" y2="{3:.2f}" stroke="{4}"'.format(
+                x, y, x + a, y + b, generator.choice(COLORS))
+            elements.append('<line {0}/>'.format(attributes))
+            continue
+        else:
+            raise ValueError('Unsupported tag: ' + tag)
+        elements.append('<{0} {1} {2}/>'.format(tag, attributes, get_style(generator)))
+
+    return get_document(elements, size)
+
+
+def generate_polyline(number_of_points, seed=0):
+    """Generate a document with one polyline, a random walk across the whole width.
+
+    :param number_of_points: Number of points of the polyline.
+    :param seed: Seed of the random generator.
+    :return: Content of the svg file.
+    :rtype: bytes
+    """
+
+    generator = random.Random(seed)
+    width, height = SIZE
+    y = height / 2
+    points = []
+    for i in range(number_of_points):
+        y = min(max(y + generator.gauss(0, 1), 0), height)
+        points.append('{0:.3f},{1:.3f}'.format(i * width / number_of_points, y))
+
+    return get_document(['<polyline points="{0}" fill="none" stroke="white" stroke-width="0.5"/>'
+                         .format(' '.join(points))])
+
+
+def get_command_arguments(generator, command, number_of_arguments):
+    """Get random arguments of a path command, as a string."""
+    width, height = SIZE
+    if command.lower() == 'a':
+        rx, ry = generator.uniform(1, 30), generator.uniform(1, 30)
+        end = (generator.uniform(-30, 30), generator.uniform(-30, 30)) if command == 'a' else \
+            (generator.uniform(0, width), generator.uniform(0, height))
+        arguments = (rx, ry, generator.uniform(0, 360), generator.randint(0, 1), generator.randint(0, 1)) + end
+    elif command.islower():
+        arguments = [generator.uniform(-30, 30) for _ in range(number_of_arguments)]
+    else:
+        arguments = [generator.uniform(0, height if i % 2 or command == 'V' else width)
+                     for i in range(number_of_arguments)]
+
+    return ' '.join('{0:.2f}'.format(argument) if isinstance(argument, float) else str(argument)
+                    for argument in arguments)
+
+
+def generate_paths(number_of_paths, commands_per_path, seed=0):
+    """Generate a document of paths mixing every command of shapes.path, absolute and relative.
+
+    :param number_of_paths: Number of path elements.
+    :param commands_per_path: Number of commands after the initial moveto of each path.
+    :param seed: Seed of the random generator.
+    :return: Content of the svg file.
+    :rtype: bytes
+    """
+
+    generator = random.Random(seed)
+    width, height = SIZE
+    commands = path.LINE_COMMANDS + path.CURVE_COMMANDS + path.ARC_COMMANDS
+    elements = []
+    for _ in range(number_of_paths):
+        parts = ['M {0:.2f} {1:.2f}'.format(generator.uniform(0, width), generator.uniform(0, height))]
+        for _ in range(commands_per_path):
+            command = generator.choice(commands)
+            number_of_arguments = path.NUMBER_OF_ARGUMENTS[command.lower()]
+            parts.append((command + ' ' + get_command_arguments(generator, command, number_of_arguments)).strip())
+        elements.append('<path d="{0}" {1}/>'.format(' '.join(parts), get_style(generator)))
+
+    return get_document(elements)
+
+
+def generate_instances(number_of_instances, inline=False, seed=0):
+    """Generate a document drawing the same map marker many times.
+
+    :param number_of_instances: Number of markers.
+    :param inline: If True, each marker is written out in a group instead of referencing a symbol with <use>.
+    :param seed: Seed of the random generator.
+    :return: Content of the svg file.
+    :rtype: bytes
+    """
+
+    generator = random.Random(seed)
+    width, height = SIZE
+    marker = ('<path d="M 0 0 C -4 -6 -8 -10 -8 -14 A 8 8 0 1 1 8 -14 C 8 -10 4 -6 0 0 Z" fill="#d33" stroke="#700"/>'
+              '<circle cy="-14" r="3" fill="white"/>')
+    elements = [] if inline else ['<defs><symbol id="marker">{0}</symbol></defs>'.format(marker)]
+    for _ in range(number_of_instances):
+        x, y = generator.uniform(0, width), generator.uniform(0, height)
+        if inline:
+            elements.append('<g transform="translate({0:.2f} {1:.2f})">{2}</g>'.format(x, y, marker))
+        else:
+            elements.append('<use href="#marker" x="{0:.2f}" y="{1:.2f}"/>'.format(x, y))
+
+    return get_document(elements)
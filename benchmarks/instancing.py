@@ -0,0 +1,47 @@
+"""Compare drawing a symbol referenced by <use> elements with drawing inline copies of it.
+
+Usage: python -m benchmarks.instancing [number_of_instances]
+
+Each <use> replays the recording of the symbol, while inline copies are parsed and drawn one by one.
+"""
+import sys
+import time
+
+import svg
+from benchmarks import generators
+from helpers import profiling
+
+DEFAULT_NUMBER_OF_INSTANCES = 5000
+REPEAT = 3
+
+
+def measure(svg_data):
+    """Render a document and get the best time in seconds and the counters of its last render."""
+    best_seconds = None
+    for _ in range(REPEAT):
+        profiler = profiling.Profiler(slowest_elements=0)
+        start = time.perf_counter()
+        svg.render_png(svg_data, profiler=profiler)
+        seconds = time.perf_counter() - start
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+
+    return best_seconds, profiler.counters
+
+
+def main(argv):
+    """Run the instancing benchmark.
+
+    :param argv: The list of arguments received from command line.
+    """
+
+    number_of_instances = int(argv[0]) if argv else DEFAULT_NUMBER_OF_INSTANCES
+    inline_seconds, _ = measure(generators.generate_instances(number_of_instances, inline=True))
+    use_seconds, counters = measure(generators.generate_instances(number_of_instances))
+    print('{0} markers'.format(number_of_instances))
+    print('  inline: {0:9.2f} ms'.format(inline_seconds * 1000))
+    print('     use: {0:9.2f} ms  speedup {1:5.2f}x  {2} of {3} instances replayed from a recording'.format(
+        use_seconds * 1000, inline_seconds / use_seconds, counters['cached_instances'], counters['instances']))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,90 @@
+"""Compare wall time and peak memory of the streaming loader and the two-parse loader.
+
+Usage: python -m benchmarks.loader [number_of_elements]
+
+Each loader runs in its own interpreter, so the reported peak RSS
+belongs to that loader only.
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import svg
+from helpers import xml
+
+DEFAULT_NUMBER_OF_ELEMENTS = 200000
+LOADERS = ('two-pass', 'streaming')
+
+
+def write_synthetic_svg(file, number_of_elements):
+    """Write a svg document made of many small paths and polylines.
+
+    :param file: A text file object.
+    :param number_of_elements: Number of children of the root element.
+    """
+
+    file.write('<svg width="100" height="100" xmlns="http://www.w3.org/2000/svg">\n')
+    for i in range(number_of_elements):
+        x, y = i % 100, (i // 100) % 100
+        if i % 2:
+            file.write('<path d="M {0} {1} l 1 0 l 0 1 z" fill="#336699"/>\n'.format(x, y))
+        else:
+            file.write('<polyline points="{0},{1} {2},{1} {2},{3}" fill="none" stroke="red"/>\n'
+                       .format(x, y, x + 1, y + 1))
+    file.write('</svg>\n')
+
+
+def run_loader(loader, svg_filename):
+    """Render a svg file with the given loader and print the measurements as json.
+
+    :param loader: One of LOADERS.
+    :param svg_filename: Path to the svg file.
+    """
+
+    start = time.perf_counter()
+    if loader == 'two-pass':
+        items = xml.get_items_from_svg_root(svg_filename)
+        size = xml.get_svg_dimensions(svg_filename)
+        surface = svg.init_surface(size)
+        svg.build_cairo_context(size, items, surface)
+    else:
+        svg.render(svg_filename)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is reported in kilobytes on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    print(json.dumps({'loader': loader, 'seconds': elapsed, 'peak_rss': peak_rss}))
+
+
+def main(argv):
+    """Generate a synthetic document and measure every loader on it.
+
+    :param argv: The list of arguments received from command line.
+    """
+
+    if len(argv) == 3 and argv[0] == '--run':
+        run_loader(argv[1], argv[2])
+        return
+
+    number_of_elements = int(argv[0]) if argv else DEFAULT_NUMBER_OF_ELEMENTS
+    with tempfile.NamedTemporaryFile('w', suffix='.svg', delete=False) as file:
+        write_synthetic_svg(file, number_of_elements)
+    try:
+        size_in_mb = os.path.getsize(file.name) / 2 ** 20
+        print('{0} elements, {1:.1f} MB'.format(number_of_elements, size_in_mb))
+        for loader in LOADERS:
+            output = subprocess.run([sys.executable, '-m', 'benchmarks.loader', '--run', loader, file.name],
+                                    check=True, capture_output=True, text=True).stdout
+            result = json.loads(output)
+            print('{0:>10}: {1:8.3f} s  {2:8.1f} MB peak RSS'
+                  .format(loader, result['seconds'], result['peak_rss'] / 2 ** 20))
+    finally:
+        os.remove(file.name)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
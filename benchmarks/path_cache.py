@@ -0,0 +1,76 @@
+"""Compare rendering paths with and without the cache of path geometries.
+
+Usage: python -m benchmarks.path_cache [number_of_elements]
+
+Inline markers repeat the same path data in every element, while random paths never repeat it,
+which measures what the cache costs when it never hits. Each document is rendered with a cold
+cache, then again with the cache left warm by the first render, as for a second document.
+"""
+import sys
+import time
+
+import svg
+from benchmarks import generators
+from helpers.path_cache import PathCache
+from shapes import path
+
+DEFAULT_NUMBER_OF_ELEMENTS = 5000
+COMMANDS_PER_PATH = 20
+REPEAT = 3
+
+
+def measure(svg_data, cache, warm=False):
+    """Get the best time in seconds of rendering a document with a cache, None to disable it.
+
+    :param svg_data: Content of the svg file.
+    :param cache: The helpers.path_cache.PathCache used by shapes.path, None to disable it.
+    :param warm: If True, the cache keeps the geometries of the previous renders, otherwise it is cleared first.
+    :return: The best time in seconds.
+    :rtype: float
+    """
+
+    path.geometry_cache = cache
+    best_seconds = None
+    for _ in range(REPEAT):
+        if cache is not None and not warm:
+            cache.clear()
+        start = time.perf_counter()
+        svg.render_png(svg_data)
+        seconds = time.perf_counter() - start
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+
+    return best_seconds
+
+
+def main(argv):
+    """Run the path cache benchmark.
+
+    :param argv: The list of arguments received from command line.
+    """
+
+    number_of_elements = int(argv[0]) if argv else DEFAULT_NUMBER_OF_ELEMENTS
+    documents = (
+        ('inline markers', generators.generate_instances(number_of_elements, inline=True)),
+        ('random paths', generators.generate_paths(number_of_elements, COMMANDS_PER_PATH))
+    )
+    cache = PathCache()
+    previous_cache = path.geometry_cache
+    try:
+        for name, svg_data in documents:
+            uncached_seconds = measure(svg_data, None)
+            cold_seconds = measure(svg_data, cache)
+            warm_seconds = measure(svg_data, cache, warm=True)
+            stats = cache.stats()
+            print('{0} ({1} elements)'.format(name, number_of_elements))
+            print('  no cache: {0:9.2f} ms'.format(uncached_seconds * 1000))
+            for label, seconds in (('cold', cold_seconds), ('warm', warm_seconds)):
+                print('  {0:>8}: {1:9.2f} ms  speedup {2:5.2f}x'.format(
+                    label, seconds * 1000, uncached_seconds / seconds))
+            print('  {0} entries, {1:.1f} KiB, hit rate {2:.1%}, {3} outlines built, {4} replayed'.format(
+                stats['entries'], stats['bytes'] / 1024, stats['hit_rate'], stats['outlines'], stats['replays']))
+    finally:
+        path.geometry_cache = previous_cache
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,79 @@
+"""Measure how fast path data is converted to command records.
+
+Usage: python -m benchmarks.path_parsing [number_of_coordinates]
+
+Path data comes from the files in inputs/path and from synthetic paths
+written both with separators and in the most compact form allowed by the
+svg grammar.
+"""
+import glob
+import random
+import re
+import sys
+import timeit
+
+from shapes import path
+
+DEFAULT_NUMBER_OF_COORDINATES = 100000
+PATH_DATA_ATTRIBUTE = re.compile(r'\sd="([^"]*)"')
+
+
+def read_sample_path_data():
+    """Read the path data of every path in inputs/path."""
+    path_data = []
+    for svg_filename in sorted(glob.glob('inputs/path/*.svg')):
+        with open(svg_filename) as svg_file:
+            path_data.extend(PATH_DATA_ATTRIBUTE.findall(svg_file.read()))
+
+    return path_data
+
+
+def generate_path_data(number_of_coordinates, compact, seed=0):
+    """Generate path data mixing line, curve and arc commands.
+
+    :param number_of_coordinates: Approximate number of numbers in the path data.
+    :param compact: If True, separators are omitted wherever the grammar allows it.
+    :param seed: Seed of the random generator.
+    :return: The path data.
+    :rtype: str
+    """
+
+    generator = random.Random(seed)
+    templates = [('l', 2), ('c', 6), ('s', 4), ('q', 4), ('t', 2), ('h', 1), ('v', 1)]
+    parts = ['M0 0']
+    count = 0
+    while count < number_of_coordinates:
+        command, number_of_arguments = generator.choice(templates)
+        arguments = ['{0:.2f}'.format(generator.uniform(-50, 50)) for _ in range(number_of_arguments)]
+        if generator.random() < 0.1:
+            arguments = ['10', '20', '30', '0', '1', '{0:.1f}'.format(generator.uniform(-50, 50)), '5']
+            command, number_of_arguments = 'a', 7
+        separator = '' if compact else ' '
+        parts.append(command + separator + ' '.join(arguments).replace(' -', '-' if compact else ' -'))
+        count += number_of_arguments
+
+    return ('' if compact else ' ').join(parts)
+
+
+def measure(label, path_data, repeat=5):
+    """Print the best time to parse a list of path data."""
+    number_of_numbers = sum(len(path.tokenize_path_data(data)) for data in path_data)
+    seconds = min(timeit.repeat(lambda: [path.parse_commands_to_list(data) for data in path_data],
+                                number=1, repeat=repeat))
+    print('{0:>24}: {1:9.2f} ms  {2:10.0f} numbers/s'.format(label, seconds * 1000, number_of_numbers / seconds))
+
+
+def main(argv):
+    """Run the path parsing benchmark.
+
+    :param argv: The list of arguments received from command line.
+    """
+
+    number_of_coordinates = int(argv[0]) if argv else DEFAULT_NUMBER_OF_COORDINATES
+    measure('inputs/path x 1000', read_sample_path_data() * 1000)
+    measure('synthetic, separated', [generate_path_data(number_of_coordinates, compact=False)])
+    measure('synthetic, compact', [generate_path_data(number_of_coordinates, compact=True)])
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,95 @@
+"""Measure how fast large polylines are parsed, simplified and drawn.
+
+Usage: python -m benchmarks.polylines [number_of_points]
+
+The polyline is a synthetic time series: a slow wave with noise, sampled many
+times per pixel as plotting libraries do for long recordings.
+"""
+import math
+import random
+import sys
+import time
+
+import cairo
+
+from shapes import polyline, records
+
+DEFAULT_NUMBER_OF_POINTS = 1000000
+WIDTH = 1000
+HEIGHT = 200
+SCALES = (1, 10, 40)
+TOLERANCE = 0.25  # device pixels
+
+
+def generate_points(number_of_points, seed=0):
+    """Generate the points attribute of a time series polyline.
+
+    :param number_of_points: Number of points.
+    :param seed: Seed of the random generator.
+    :return: The points attribute.
+    :rtype: str
+    """
+
+    generator = random.Random(seed)
+    step = WIDTH / number_of_points
+    return ' '.join('{0:.4f},{1:.3f}'.format(i * step, HEIGHT / 2 + HEIGHT / 4 * math.sin(i * step / 50)
+                                               + generator.gauss(0, 0.5))
+                    for i in range(number_of_points))
+
+
+def parse_points_one_by_one(string_points):
+    """Parse points the way polylines were parsed before, one tuple at a time."""
+    points = []
+    for point in string_points.split():
+        x, y = point.split(',')
+        points.append((float(x), float(y)))
+
+    return points
+
+
+def measure(label, function):
+    """Print the wall time of a function and return its result."""
+    start = time.perf_counter()
+    result = function()
+    print('{0:>36}: {1:9.2f} ms'.format(label, (time.perf_counter() - start) * 1000))
+    return result
+
+
+def draw(attributes, scale, tolerance):
+    """Stroke a polyline at a scale, with a curve tolerance in device pixels which also simplifies large polylines."""
+    surface = cairo.ImageSurface(cairo.FORMAT_RGB24, WIDTH * scale, HEIGHT * scale)
+    context = cairo.Context(surface)
+    context.scale(scale, scale)
+    context.set_tolerance(tolerance)
+    polyline.draw(context, attributes)
+    surface.flush()
+
+
+def main(argv):
+    """Run the polyline benchmark.
+
+    :param argv: The list of arguments received from command line.
+    """
+
+    number_of_points = int(argv[0]) if argv else DEFAULT_NUMBER_OF_POINTS
+    string_points = generate_points(number_of_points)
+    print('{0} points, {1} characters'.format(number_of_points, len(string_points)))
+
+    measure('parse one point at a time', lambda: parse_points_one_by_one(string_points))
+    coordinates = measure('parse with numpy', lambda: polyline.parse_points(string_points))
+    attributes = records.Polyline(coordinates, None, (1, 1, 1), 0.2)
+
+    for scale in SCALES:
+        simplified_coordinates = measure('simplify at {0}x ({1} px)'.format(scale, TOLERANCE),
+                                         lambda: polyline.simplify_points(coordinates, TOLERANCE / scale))
+        print('{0:>36}: {1} of {2} points ({3:.2%})'.format(
+            'kept', len(simplified_coordinates) // 2, number_of_points,
+            len(simplified_coordinates) / len(coordinates)))
+
+    for scale in SCALES[:2]:
+        measure('draw at {0}x'.format(scale), lambda: draw(attributes, scale, polyline.DEFAULT_TOLERANCE))
+        measure('simplify and draw at {0}x'.format(scale), lambda: draw(attributes, scale, TOLERANCE))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+"""Compare the render time and the pixels of every quality profile.
+
+Usage: python -m benchmarks.quality [svg_file ...]
+
+Without svg files, every file of inputs and inputs/path is rendered. Pixels
+of each profile are compared with the pixels of the default profile.
+"""
+import glob
+import sys
+import time
+
+import svg
+from benchmarks.batching import compare_pixels
+from helpers import quality
+
+REPEAT = 5
+
+
+def render_files(svg_files, quality_profile):
+    """Render svg files with a quality profile.
+
+    :param svg_files: Paths to svg files.
+    :param quality_profile: Name of a helpers.quality profile.
+    :return: A tuple (list of cairo surfaces, best total time in seconds).
+    :rtype: tuple
+    """
+
+    best_seconds = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        surfaces = [svg.render(svg_file, quality_profile=quality_profile) for svg_file in svg_files]
+        for surface in surfaces:
+            surface.flush()
+        seconds = time.perf_counter() - start
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+
+    return surfaces, best_seconds
+
+
+def main(argv):
+    """Run the quality benchmark.
+
+    :param argv: The list of arguments received from command line.
+    """
+
+    svg_files = argv or sorted(glob.glob('inputs/*.svg') + glob.glob('inputs/path/*.svg'))
+    reference_surfaces, reference_seconds = render_files(svg_files, quality.DEFAULT_PROFILE)
+    number_of_pixels = sum(surface.get_width() * surface.get_height() for surface in reference_surfaces)
+
+    print('{0} files, {1} pixels'.format(len(svg_files), number_of_pixels))
+    for quality_profile in quality.PROFILES:
+        surfaces, seconds = render_files(svg_files, quality_profile)
+        differences = [compare_pixels(reference_surface, surface)
+                       for reference_surface, surface in zip(reference_surfaces, surfaces)]
+        differing_pixels = sum(differing for differing, _ in differences)
+        largest_difference = max(largest for _, largest in differences)
+        print('{0:>8}: {1:9.2f} ms  speedup {2:5.2f}x  differing pixels {3:6.2%}  largest channel difference {4}'
+              .format(quality_profile, seconds * 1000, reference_seconds / seconds,
+                      differing_pixels / number_of_pixels, largest_difference))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
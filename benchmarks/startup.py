@@ -0,0 +1,72 @@
+"""Measure the time from interpreter start to the first drawn element.
+
+Usage: python -m benchmarks.startup [--budget-ms BUDGET] [--runs RUNS] [svg_file]
+
+Each run starts a fresh interpreter which imports the renderer, parses the
+svg file up to its first element and draws it. The script exits with status 1
+when the median time exceeds the budget, so it can gate changes in CI.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_SVG_FILE = 'inputs/1.svg'
+DEFAULT_BUDGET_MS = 150
+DEFAULT_RUNS = 20
+
+FIRST_PIXEL_SCRIPT = '''
+import itertools, sys, time
+import svg
+from helpers import xml
+size, items = xml.stream_svg(sys.argv[1])
+surface = svg.init_surface(size)
+context = svg.init_cairo_context(surface, size)
+svg.fill_context(context, size, itertools.islice(items, 1))
+print(time.time())
+'''
+
+
+def measure_first_pixel(svg_file):
+    """Start a new interpreter and measure the time until it draws the first element of a svg file.
+
+    :param svg_file: Path to a svg file.
+    :return: Elapsed time in milliseconds.
+    :rtype: float
+    """
+
+    start = time.time()
+    output = subprocess.run([sys.executable, '-c', FIRST_PIXEL_SCRIPT, svg_file],
+                            check=True, capture_output=True, text=True).stdout
+    return (float(output) - start) * 1000
+
+
+def main(argv):
+    """Run the startup benchmark.
+
+    :param argv: The list of arguments received from command line.
+    :return: Exit status, 1 if the budget is exceeded.
+    :rtype: int
+    """
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.startup')
+    parser.add_argument('svg_file', nargs='?', default=DEFAULT_SVG_FILE)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS)
+    arguments = parser.parse_args(argv)
+
+    timings = [measure_first_pixel(arguments.svg_file) for _ in range(arguments.runs)]
+    median = statistics.median(timings)
+    print('interpreter to first pixel: median {0:.1f} ms, min {1:.1f} ms, max {2:.1f} ms (budget {3:.0f} ms)'
+          .format(median, min(timings), max(timings), arguments.budget_ms))
+
+    if median > arguments.budget_ms:
+        print('Startup budget exceeded', file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
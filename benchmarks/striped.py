@@ -0,0 +1,163 @@
+"""Check that striped rendering gives the pixels of a single pass render, and compare their peak memory.
+
+Usage: python -m benchmarks.striped [--width WIDTH] [--height HEIGHT] [--stripe-height ROWS]
+
+Documents with overlapping elements of the same color, paths, strokes and <use> instances are rendered
+once in a single pass and once in stripes cut across their elements, and the pixels decoded from the
+striped png are compared with those of the single pass surface. Then a large-format document is converted
+both ways in fresh interpreters, which report their peak resident memory. The script exits with status 1
+when the pixels differ.
+"""
+import argparse
+import io
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+import svg
+from benchmarks import batching, generators
+from helpers import png
+from renderers import striped
+
+DEFAULT_WIDTH = 500
+DEFAULT_HEIGHT = 2000
+DEFAULT_NUMBER_OF_ELEMENTS = 20000
+CHECK_STRIPE_HEIGHT = 37  # rows, not a divisor of the image heights, so stripes end inside elements
+
+PEAK_MEMORY_SCRIPT = '''
+import resource, sys
+import svg
+from renderers import striped
+svg_file, png_file, stripe_height = sys.argv[1], sys.argv[2], int(sys.argv[3])
+if stripe_height:
+    striped.render_striped(svg_file, png_file, stripe_height)
+else:
+    svg.convert(svg_file, png_file)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def read_png_rows(png_data):
+    """Decode the rows of a png image written by helpers.png.PngWriter.
+
+    :param png_data: Content of the png file.
+    :return: List of rows, 3 bytes per pixel.
+    :rtype: list
+    """
+
+    width, height = struct.unpack('>II', png_data[16:24])
+    compressed = []
+    position = len(png.SIGNATURE)
+    while position < len(png_data):
+        length, chunk_type = struct.unpack('>I4s', png_data[position:position + 8])
+        if chunk_type == b'IDAT':
+            compressed.append(png_data[position + 8:position + 8 + length])
+        position += length + 12
+
+    data = zlib.decompress(b''.join(compressed))
+    row_bytes = width * 3
+    rows = []
+    previous_row = bytes(row_bytes)
+    for row_index in range(height):
+        start = row_index * (row_bytes + 1)
+        filter_type, row = data[start:start + 1], data[start + 1:start + 1 + row_bytes]
+        if filter_type == png.FILTER_UP:
+            row = bytes((a + b) & 0xff for a, b in zip(row, previous_row))
+        rows.append(row)
+        previous_row = row
+
+    return rows
+
+
+def get_surface_rows(surface):
+    """Get the rows of a cairo RGB24 surface, 3 bytes per pixel."""
+    data, stride, width = bytes(surface.get_data()), surface.get_stride(), surface.get_width()
+    red, green, blue = png.RGB_OFFSETS
+    rows = []
+    for row_index in range(surface.get_height()):
+        pixels = data[row_index * stride:row_index * stride + width * 4]
+        row = bytearray(width * 3)
+        row[0::3], row[1::3], row[2::3] = pixels[red::4], pixels[green::4], pixels[blue::4]
+        rows.append(bytes(row))
+
+    return rows
+
+
+def count_differing_rows(svg_data, stripe_height):
+    """Render a document in a single pass and in stripes, and count the rows whose pixels differ."""
+    surface = svg.render(io.BytesIO(svg_data))
+    png_file = io.BytesIO()
+    striped.render_striped(svg_data, png_file, stripe_height)
+
+    return sum(row1 != row2 for row1, row2 in zip(get_surface_rows(surface), read_png_rows(png_file.getvalue())))
+
+
+def measure_peak_memory(svg_file, stripe_height):
+    """Convert a svg file in a fresh interpreter.
+
+    :param svg_file: Path to a svg file.
+    :param stripe_height: Number of rows of the stripes, 0 for a single pass render.
+    :return: A tuple (seconds, peak resident memory in MiB).
+    :rtype: tuple
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', PEAK_MEMORY_SCRIPT, svg_file,
+                                 os.path.join(directory, 'image.png'), str(stripe_height)],
+                                check=True, capture_output=True, text=True).stdout
+        seconds = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = int(output) / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10)
+    return seconds, peak
+
+
+def main(argv):
+    """Run the striped rendering benchmark.
+
+    :param argv: The list of arguments received from command line.
+    :return: Exit status, 1 if striped rendering changes the pixels.
+    :rtype: int
+    """
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.striped')
+    parser.add_argument('--width', type=int, default=DEFAULT_WIDTH)
+    parser.add_argument('--height', type=int, default=DEFAULT_HEIGHT)
+    parser.add_argument('--stripe-height', type=int, default=striped.DEFAULT_STRIPE_HEIGHT)
+    arguments = parser.parse_args(argv)
+
+    status = 0
+    documents = (
+        ('overlapping scatter plot', batching.generate_scatter_plot(5000, overlapping=True)),
+        ('random paths', generators.generate_paths(200, 20)),
+        ('stroked lines', generators.generate_shapes('line', 2000)),
+        ('use instances', generators.generate_instances(500))
+    )
+    for name, svg_data in documents:
+        differing_rows = count_differing_rows(svg_data, CHECK_STRIPE_HEIGHT)
+        print('{0:>24}: {1} differing rows'.format(name, differing_rows))
+        if differing_rows:
+            status = 1
+
+    size = (arguments.width, arguments.height)
+    svg_data = generators.generate_shapes('circle', DEFAULT_NUMBER_OF_ELEMENTS, size=size)
+    with tempfile.NamedTemporaryFile(suffix='.svg', delete=False) as svg_file:
+        svg_file.write(svg_data)
+    try:
+        print('{0}x{1} pixels'.format(*svg.get_surface_size(size)))
+        for label, stripe_height in (('single pass', 0), ('striped', arguments.stripe_height)):
+            seconds, peak = measure_peak_memory(svg_file.name, stripe_height)
+            print('{0:>24}: {1:9.2f} ms  peak memory {2:9.1f} MiB'.format(label, seconds * 1000, peak))
+    finally:
+        os.remove(svg_file.name)
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
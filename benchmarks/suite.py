@@ -0,0 +1,247 @@
+"""Time every stage of the renderer on synthetic documents, save baselines and compare runs with them.
+
+Usage:
+    python -m benchmarks.suite run [--save NAME] [--scale SCALE] [--repeat REPEAT]
+    python -m benchmarks.suite compare BASELINE [CURRENT] [--threshold RATIO]
+
+run renders every scenario and prints the median time of each stage (the phases
+of helpers.profiling) and of whole renders without profiling. With --save, the
+results are written to benchmarks/baselines/NAME.json with the format version,
+the git revision and the interpreter which produced them.
+
+compare checks the stages of CURRENT, or of a new run when CURRENT is omitted,
+against BASELINE, and exits with status 1 if any stage is slower than the
+baseline by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import svg
+from benchmarks import generators
+from helpers.profiling import Profiler
+
+BASELINE_FORMAT_VERSION = 1
+BASELINES_DIRECTORY = os.path.join(os.path.dirname(__file__), 'baselines')
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.1
+MIN_COMPARED_SECONDS = 0.001  # faster stages are too noisy to be compared
+
+# scenario name: (generator, arguments before scaling, index of the argument multiplied by --scale)
+SCENARIOS = {
+    'rects': (generators.generate_shapes, ('rect', 5000), 1),
+    'circles': (generators.generate_shapes, ('circle', 5000), 1),
+    'ellipses': (generators.generate_shapes, ('ellipse', 5000), 1),
+    'lines': (generators.generate_shapes, ('line', 5000), 1),
+    'polyline': (generators.generate_polyline, (100000,), 0),
+    'paths': (generators.generate_paths, (500, 40), 0)
+}
+
+
+def generate_scenario(name, scale):
+    """Generate the svg document of a scenario.
+
+    :param name: Name of the scenario (i.e. one of SCENARIOS).
+    :param scale: Multiplier of the number of elements or points.
+    :return: Content of the svg file.
+    :rtype: bytes
+    """
+
+    generator, arguments, scaled_argument = SCENARIOS[name]
+    arguments = list(arguments)
+    arguments[scaled_argument] = max(1, int(arguments[scaled_argument] * scale))
+    return generator(*arguments)
+
+
+def measure_scenario(svg_data, repeat):
+    """Render a document several times and get the median time of each stage.
+
+    :param svg_data: Content of a svg file.
+    :param repeat: Number of renders with and without profiling.
+    :return: Dictionary mapping each stage to its median time in seconds.
+    :rtype: dict
+    """
+
+    svg.render_png(svg_data)
+    render_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        svg.render_png(svg_data)
+        render_times.append(time.perf_counter() - start)
+
+    phase_times = {}
+    for _ in range(repeat):
+        profiler = Profiler(slowest_elements=0)
+        svg.render_png(svg_data, profiler=profiler)
+        for phase, (seconds, _) in profiler.phases.items():
+            phase_times.setdefault(phase, []).append(seconds)
+
+    stages = {phase: statistics.median(times) for phase, times in phase_times.items()}
+    stages['render'] = statistics.median(render_times)
+    return stages
+
+
+def get_git_revision():
+    """Get the current git revision, or None outside of a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], check=True, capture_output=True,
+                              text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(scale, repeat):
+    """Measure every scenario.
+
+    :param scale: Multiplier of the number of elements or points.
+    :param repeat: Number of renders of each scenario.
+    :return: The results, in the format of a baseline.
+    :rtype: dict
+    """
+
+    results = {
+        'format_version': BASELINE_FORMAT_VERSION,
+        'git_revision': get_git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale,
+        'repeat': repeat,
+        'scenarios': {}
+    }
+    for name in SCENARIOS:
+        stages = measure_scenario(generate_scenario(name, scale), repeat)
+        results['scenarios'][name] = stages
+        print('{0:>10}: '.format(name) + '  '.join('{0} {1:.2f} ms'.format(stage, seconds * 1000)
+                                                   for stage, seconds in stages.items()))
+
+    return results
+
+
+def get_baseline_path(name):
+    """Get the path of a baseline, given by its name or by a path to a json file."""
+    if name.endswith('.json'):
+        return name
+
+    return os.path.join(BASELINES_DIRECTORY, name + '.json')
+
+
+def load_baseline(name):
+    """Load a baseline.
+
+    :param name: Name of a saved baseline or path to a json file.
+    :return: The baseline.
+    :rtype: dict
+    :raise: ValueError if the baseline was saved in another format.
+    """
+
+    with open(get_baseline_path(name)) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    if baseline.get('format_version') != BASELINE_FORMAT_VERSION:
+        raise ValueError('Baseline {0} has format version {1}, expected {2}'.format(
+            name, baseline.get('format_version'), BASELINE_FORMAT_VERSION))
+    return baseline
+
+
+def save_baseline(results, name):
+    """Save results as a baseline, given by its name or by a path to a json file."""
+    baseline_path = get_baseline_path(name)
+    if os.path.dirname(baseline_path):
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+    with open(baseline_path, 'w') as baseline_file:
+        json.dump(results, baseline_file, indent=2)
+    print('Saved', baseline_path)
+
+
+def find_regressions(baseline, current, threshold):
+    """Compare the stages of two runs.
+
+    :param baseline: The reference results.
+    :param current: The new results.
+    :param threshold: Largest accepted slowdown, as a ratio of the baseline time (e.g. 0.1 for 10%).
+    :return: List of tuples (scenario, stage, baseline seconds, current seconds) slower than the threshold.
+    :rtype: list
+    """
+
+    if baseline['scale'] != current['scale']:
+        raise ValueError('Runs at scale {0} and {1} cannot be compared'.format(baseline['scale'], current['scale']))
+
+    regressions = []
+    for scenario, stages in baseline['scenarios'].items():
+        current_stages = current['scenarios'].get(scenario, {})
+        for stage, baseline_seconds in stages.items():
+            current_seconds = current_stages.get(stage)
+            if current_seconds is None or max(baseline_seconds, current_seconds) < MIN_COMPARED_SECONDS:
+                continue
+            if current_seconds > baseline_seconds * (1 + threshold):
+                regressions.append((scenario, stage, baseline_seconds, current_seconds))
+
+    return regressions
+
+
+def parse_arguments(argv):
+    """Parse the arguments received from command line.
+
+    :param argv: The list of arguments received from command line.
+    :return: The parsed arguments.
+    :rtype: argparse.Namespace
+    """
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description='Renderer benchmark suite.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='measure every scenario')
+    run_parser.add_argument('--save', metavar='NAME', help='save the results as a baseline')
+
+    compare_parser = subparsers.add_parser('compare', help='compare a run with a baseline')
+    compare_parser.add_argument('baseline', help='name of a saved baseline or path to a json file')
+    compare_parser.add_argument('current', nargs='?', help='baseline to compare, defaults to a new run')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='largest accepted slowdown ratio (default: %(default)s)')
+
+    for subparser in (run_parser, compare_parser):
+        subparser.add_argument('--scale', type=float, default=1.0,
+                               help='multiplier of the size of the documents (default: %(default)s)')
+        subparser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                               help='number of renders of each document (default: %(default)s)')
+
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    """Run the benchmark suite.
+
+    :param argv: The list of arguments received from command line.
+    :return: Exit status, 1 if a regression was found.
+    :rtype: int
+    """
+
+    arguments = parse_arguments(argv)
+    if arguments.command == 'run':
+        results = run_suite(arguments.scale, arguments.repeat)
+        if arguments.save is not None:
+            save_baseline(results, arguments.save)
+        return 0
+
+    baseline = load_baseline(arguments.baseline)
+    if arguments.current is not None:
+        current = load_baseline(arguments.current)
+    else:
+        current = run_suite(baseline['scale'], arguments.repeat)
+
+    regressions = find_regressions(baseline, current, arguments.threshold)
+    for scenario, stage, baseline_seconds, current_seconds in regressions:
+        print('Regression in {0}/{1}: {2:.2f} ms -> {3:.2f} ms ({4:+.0%})'.format(
+            scenario, stage, baseline_seconds * 1000, current_seconds * 1000, current_seconds / baseline_seconds - 1))
+    print('{0} regressions against {1} (revision {2})'.format(len(regressions), arguments.baseline,
+                                                              baseline.get('git_revision')))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -3,5 +3,19 @@ This module contains functions that wrap functionalities
 which will most likely be reused.
 
 helpers/colors: Functions used to manipulate and convert colors from one format to another.
+helpers/color_names: Table of the color keywords supported in svg documents.
 helpers/xml: Functions used to manipulate xml trees.
+helpers/surface_pool: Pool of reusable cairo surfaces and contexts.
+helpers/png: Streaming png encoder writing images row by row.
+helpers/raster: Zero-copy access to the pixels of cairo surfaces and conversion to common layouts.
+helpers/painter: Painter drawing elements with as few cairo calls as possible.
+helpers/quality: Quality profiles trading rendering fidelity for speed.
+helpers/profiling: Profiler measuring the time spent per phase, element tag and element of a render.
+helpers/transform: Functions used to parse and apply transform matrices.
+helpers/references: Elements referenced by <use> elements and the recordings of their drawing.
+helpers/geometry: Functions used to compute and compare bounding boxes.
+helpers/spatial_index: Grid index used to find the elements overlapping a region.
+helpers/path_cache: Cache of parsed path data and of its outline, shared by every document.
+helpers/cost: Estimation of the cost of a render before rendering, and limits on it.
+helpers/render_cache: On-disk cache of rendered images keyed by their content.
 """
@@ -1,12 +1,122 @@
-from matplotlib import colors
+import colorsys
+import functools
+import re
+
+from helpers.color_names import NAMED_COLORS
+
+COLOR_CACHE_SIZE = 1024
+TRANSPARENT = (0.0, 0.0, 0.0, 0.0)
+FUNCTIONAL_NOTATION = re.compile(r'^(rgba?|hsla?)\(([^)]*)\)$')
+ARGUMENT_SEPARATOR = re.compile(r'[\s,/]+')
+HEX_DIGITS = re.compile(r'^[0-9a-fA-F]*$')
+
+
+def parse_hex_color(digits):
+    """Convert the digits of a #rgb, #rgba, #rrggbb or #rrggbbaa color to rgba format.
+
+    :param digits: The hexadecimal digits of the color, without the leading #.
+    :return: A tuple of 4 values between 0 and 1.
+    :rtype: tuple
+    :raise: ValueError if digits is not a valid hex color.
+    """
+
+    if not HEX_DIGITS.match(digits):
+        raise ValueError('Invalid hex color: #' + digits)
+    if len(digits) in (3, 4):
+        digits = ''.join(digit * 2 for digit in digits)
+    if len(digits) == 6:
+        digits += 'ff'
+    if len(digits) != 8:
+        raise ValueError('Invalid hex color: #' + digits)
+
+    value = int(digits, 16)
+    return tuple(((value >> shift) & 0xff) / 255 for shift in (24, 16, 8, 0))
+
+
+def parse_number(argument, percentage_scale):
+    """Convert a number or a percentage to a value between 0 and 1.
+
+    :param argument: A string number (e.g. '128', '0.5') or percentage (e.g. '50%').
+    :param percentage_scale: The value mapped to 1 when argument is not a percentage.
+    :return: The argument as a value between 0 and 1.
+    :rtype: float
+    """
+
+    if argument.endswith('%'):
+        value = float(argument[:-1]) / 100
+    else:
+        value = float(argument) / percentage_scale
+
+    return min(max(value, 0.0), 1.0)
+
+
+def parse_functional_color(function, arguments):
+    """Convert a rgb(), rgba(), hsl() or hsla() color to rgba format.
+
+    :param function: Name of the function (e.g. 'rgb').
+    :param arguments: The string between the parentheses.
+    :return: A tuple of 4 values between 0 and 1.
+    :rtype: tuple
+    :raise: ValueError if the arguments are not valid.
+    """
+
+    arguments = ARGUMENT_SEPARATOR.split(arguments.strip())
+    if len(arguments) not in (3, 4):
+        raise ValueError('Invalid color: {0}({1})'.format(function, ', '.join(arguments)))
+
+    alpha = parse_number(arguments[3], 1) if len(arguments) == 4 else 1.0
+    if function.startswith('rgb'):
+        red, green, blue = (parse_number(argument, 255) for argument in arguments[:3])
+    else:
+        hue = float(arguments[0][:-3] if arguments[0].endswith('deg') else arguments[0]) % 360 / 360
+        saturation, lightness = parse_number(arguments[1], 100), parse_number(arguments[2], 100)
+        red, green, blue = colorsys.hls_to_rgb(hue, lightness, saturation)
+
+    return red, green, blue, alpha
+
+
+@functools.lru_cache(maxsize=COLOR_CACHE_SIZE)
+def parse_color(color):
+    """Convert a svg color to rgba format.
+
+    Results are memoized, so documents that reuse a few colors
+    parse each of them only once.
+
+    :param color: A string color (hex, rgb(), rgba(), hsl(), hsla() or a color keyword).
+    :return: A tuple of 4 values between 0 and 1 (i.e. red, green, blue and alpha).
+    :rtype: tuple
+    :raise: ValueError if color is not a valid svg color.
+
+    :example:
+    >>> from helpers import colors
+    >>> colors.parse_color('rgba(255, 0, 0, 0.5)')
+    (1.0, 0.0, 0.0, 0.5)
+    """
+
+    color = color.strip().lower()
+
+    if color.startswith('#'):
+        return parse_hex_color(color[1:])
+
+    match = FUNCTIONAL_NOTATION.match(color)
+    if match is not None:
+        return parse_functional_color(*match.groups())
+
+    if color == 'transparent':
+        return TRANSPARENT
+
+    if color not in NAMED_COLORS:
+        raise ValueError('Invalid color: ' + color)
+
+    return tuple(value / 255 for value in NAMED_COLORS[color]) + (1.0,)
 
 
 def convert_color_to_rgb(color):
     """ Convert a color in any format to rgb format.
 
-    :param color: A string color in any format (hex, plaintext).
+    :param color: A string color in any format (hex, rgb(), hsl(), plaintext).
     :return: The color received as a parameter converted to rgb format.
-    :rtype: list
+    :rtype: tuple
 
     :example:
     >>> from helpers import colors
@@ -14,8 +124,19 @@ def convert_color_to_rgb(color):
     (0.6745098039215687, 0.8705882352941177, 0.8745098039215686)
     """
 
-    if color.startswith('rgb'):
-        values = color.split('(')[1].split(')')[0].split(',')
-        return [int(number) / 255 for number in values]
+    return parse_color(color)[:3]
+
+
+def cache_info():
+    """Get the hits and misses of the color cache.
+
+    :return: Statistics of the cache (i.e. hits, misses, maxsize, currsize).
+    :rtype: functools._CacheInfo
+    """
+
+    return parse_color.cache_info()
+
 
-    return colors.to_rgb(color)
+def clear_cache():
+    """Remove all colors from the cache and reset its statistics."""
+    parse_color.cache_clear()
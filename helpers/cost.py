@@ -0,0 +1,243 @@
+import math
+import os
+import re
+from xml.parsers import expat
+
+from helpers import quality
+
+PATH_COMMAND = re.compile(r'[MmZzLlHhVvCcSsQqTtAa]')
+NUMBER = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+POINT_ATTRIBUTES = {'path': 'd', 'polyline': 'points', 'polygon': 'points'}
+
+# rough costs of the renderer on one core, of the order of those reported by benchmarks/elements
+# and benchmarks/suite, meant to rank documents and catch outliers rather than to predict exact times
+SURFACE_BYTES_PER_PIXEL = 4  # RGB24
+ELEMENT_BYTES = 320
+POINT_BYTES = 64
+SECONDS_PER_PIXEL = 10e-9  # background fill and png encoding
+SECONDS_PER_ELEMENT = 20e-6
+SECONDS_PER_POINT = 1e-6
+# time per point of each profile, relative to the best profile (see benchmarks/quality for measured times)
+RASTER_COST_FACTORS = {'best': 1.0, 'draft': 0.7, 'fast': 0.5}
+
+LIMIT_NAMES = ('max_pixels', 'max_memory_bytes', 'max_seconds', 'max_elements', 'max_points')
+DEFAULT_LIMITS = {
+    'max_pixels': 100 * 10 ** 6,
+    'max_memory_bytes': 2 ** 30,
+    'max_seconds': 30,
+    'max_elements': 10 ** 6,
+    'max_points': 10 ** 7
+}
+OVER_LIMIT_POLICIES = ('reject', 'downgrade')
+MIN_SCALE = 1  # pixels per svg unit under which a downgraded render is rejected instead
+
+
+class CostLimitExceeded(ValueError):
+    """Raised when the estimated cost of a render exceeds the limits and the render cannot be downgraded."""
+
+    def __init__(self, plan):
+        """Create the error from the plan rejecting the render, as returned by plan_render."""
+        super().__init__('Render too expensive: ' + ', '.join(plan['reasons']))
+        self.plan = plan
+
+
+def scan_document(svg_source):
+    """Read the dimensions and cheap statistics of a svg document, without building its elements.
+
+    The document is only tokenized: elements are counted by tag, and the commands and points of
+    paths, polylines and polygons are counted from their attributes without being converted.
+
+    :param svg_source: A path to a svg file, the content of a svg file as bytes or a binary file object.
+    :return: Dictionary with the width and height of the image, the number of elements
+             (the root excluded), the number of elements per tag, the number of path commands
+             and the number of points of paths, polylines and polygons.
+    :rtype: dict
+    :raise: ValueError if the document is not valid xml or its root has no valid width and height.
+    """
+
+    statistics = {'width': None, 'height': None, 'elements': 0, 'tags': {}, 'path_commands': 0, 'points': 0}
+    tags = statistics['tags']
+
+    def start_element(name, attributes):
+        tag = name.rpartition(':')[2]
+        if statistics['width'] is None:
+            try:
+                statistics['width'], statistics['height'] = int(attributes['width']), int(attributes['height'])
+            except (KeyError, ValueError):
+                raise ValueError('The root element has no valid width and height')
+            return
+
+        statistics['elements'] += 1
+        tags[tag] = tags.get(tag, 0) + 1
+        point_attribute = POINT_ATTRIBUTES.get(tag)
+        if point_attribute is not None and point_attribute in attributes:
+            value = attributes[point_attribute]
+            if tag == 'path':
+                statistics['path_commands'] += len(PATH_COMMAND.findall(value))
+            statistics['points'] += len(NUMBER.findall(value)) // 2
+
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start_element
+    try:
+        if isinstance(svg_source, (bytes, bytearray, memoryview)):
+            parser.Parse(bytes(svg_source), True)
+        elif isinstance(svg_source, (str, os.PathLike)):
+            with open(svg_source, 'rb') as svg_file:
+                parser.ParseFile(svg_file)
+        else:
+            parser.ParseFile(svg_source)
+    except expat.ExpatError as error:
+        raise ValueError('Invalid svg document: {0}'.format(error))
+
+    if statistics['width'] is None:
+        raise ValueError('The document has no root element')
+    return statistics
+
+
+def estimate_cost(statistics, scale, quality_profile=quality.DEFAULT_PROFILE):
+    """Estimate the memory and time a render takes.
+
+    :param statistics: Statistics of the document, as returned by scan_document.
+    :param scale: Number of pixels per svg unit.
+    :param quality_profile: Name of a helpers.quality profile.
+    :return: Dictionary with the scale, the quality profile, the number of pixels of the image,
+             the estimated peak memory in bytes and the estimated time in seconds.
+    :rtype: dict
+    """
+
+    pixels = math.ceil(statistics['width'] * scale) * math.ceil(statistics['height'] * scale)
+    elements, points = statistics['elements'], statistics['points']
+    return {
+        'scale': scale,
+        'quality_profile': quality_profile,
+        'pixels': pixels,
+        'memory_bytes': pixels * SURFACE_BYTES_PER_PIXEL + elements * ELEMENT_BYTES + points * POINT_BYTES,
+        'seconds': (pixels * SECONDS_PER_PIXEL + elements * SECONDS_PER_ELEMENT +
+                    points * SECONDS_PER_POINT * RASTER_COST_FACTORS.get(quality_profile, 1.0))
+    }
+
+
+def check_limits(statistics, estimate, limits):
+    """Compare the statistics and the estimated cost of a render with limits.
+
+    :param statistics: Statistics of the document, as returned by scan_document.
+    :param estimate: Estimated cost of the render, as returned by estimate_cost.
+    :param limits: Dictionary of limits, whose keys are LIMIT_NAMES. Missing or None limits are not checked.
+    :return: List of the exceeded limits, as messages.
+    :rtype: list
+    """
+
+    values = {
+        'max_pixels': estimate['pixels'],
+        'max_memory_bytes': estimate['memory_bytes'],
+        'max_seconds': estimate['seconds'],
+        'max_elements': statistics['elements'],
+        'max_points': statistics['points']
+    }
+    return ['{0} {1:g} > {2:g}'.format(name[4:], values[name], limits[name])
+            for name in LIMIT_NAMES if limits.get(name) is not None and values[name] > limits[name]]
+
+
+def get_max_scale(statistics, limits, quality_profile):
+    """Get the largest scale at which a render stays within the pixel, memory and time limits.
+
+    :param statistics: Statistics of the document, as returned by scan_document.
+    :param limits: Dictionary of limits, whose keys are LIMIT_NAMES.
+    :param quality_profile: Name of a helpers.quality profile.
+    :return: The scale, 0 if no scale fits and None if the limits do not depend on the scale.
+    :rtype: float
+    """
+
+    base = estimate_cost(statistics, 0, quality_profile)
+    pixel_budgets = []
+    if limits.get('max_pixels') is not None:
+        pixel_budgets.append(limits['max_pixels'])
+    if limits.get('max_memory_bytes') is not None:
+        pixel_budgets.append((limits['max_memory_bytes'] - base['memory_bytes']) / SURFACE_BYTES_PER_PIXEL)
+    if limits.get('max_seconds') is not None:
+        pixel_budgets.append((limits['max_seconds'] - base['seconds']) / SECONDS_PER_PIXEL)
+    if not pixel_budgets:
+        return None
+
+    area = statistics['width'] * statistics['height']
+    pixel_budget = min(pixel_budgets)
+    if pixel_budget <= 0 or area <= 0:
+        return 0 if pixel_budget <= 0 else None
+
+    # rounded down to a hundredth, and lowered while rounding the surface size up exceeds the budget
+    scale = math.floor(math.sqrt(pixel_budget / area) * 100) / 100
+    while scale > 0 and estimate_cost(statistics, scale)['pixels'] > pixel_budget:
+        scale = round(scale - 0.01, 2)
+    return max(scale, 0)
+
+
+def plan_render(statistics, limits, scale, quality_profile=quality.DEFAULT_PROFILE, over_limit='downgrade'):
+    """Decide how to render a document within limits.
+
+    A render over the limits is rejected, or with the downgrade policy, rendered with a cheaper
+    quality profile and if that is not enough, at a lower scale. Limits on the number of elements
+    and of points do not depend on the render settings, so exceeding them always rejects the render.
+
+    :param statistics: Statistics of the document, as returned by scan_document.
+    :param limits: Dictionary of limits, whose keys are LIMIT_NAMES. Missing or None limits are not checked.
+    :param scale: Number of pixels per svg unit asked for.
+    :param quality_profile: Name of the helpers.quality profile asked for.
+    :param over_limit: One of OVER_LIMIT_POLICIES.
+    :return: Dictionary with the action ('render', 'downgrade' or 'reject'), the scale and the quality profile
+             to render with, the messages of the limits exceeded by the render asked for, and its estimated cost.
+    :rtype: dict
+    :raise: ValueError if the policy or the quality profile does not exist.
+    """
+
+    if over_limit not in OVER_LIMIT_POLICIES:
+        raise ValueError('Unknown policy: {0}, expected one of {1}'.format(over_limit, ', '.join(OVER_LIMIT_POLICIES)))
+    quality.get_profile(quality_profile)
+
+    estimate = estimate_cost(statistics, scale, quality_profile)
+    reasons = check_limits(statistics, estimate, limits)
+    plan = {'action': 'render', 'scale': scale, 'quality_profile': quality_profile, 'reasons': reasons,
+            'estimate': estimate}
+    if not reasons:
+        return plan
+
+    plan['action'] = 'reject'
+    structural_limits = {name: limits.get(name) for name in ('max_elements', 'max_points')}
+    if over_limit == 'reject' or check_limits(statistics, estimate, structural_limits):
+        return plan
+
+    # cheaper profiles are tried first, so the resolution is only lowered when they are not enough
+    profile_names = sorted(RASTER_COST_FACTORS, key=RASTER_COST_FACTORS.get, reverse=True)
+    candidates = profile_names[profile_names.index(quality_profile) + 1:] if quality_profile in profile_names else []
+    settings = None
+    for profile_name in [quality_profile] + candidates:
+        max_scale = get_max_scale(statistics, limits, profile_name)
+        max_scale = scale if max_scale is None else min(max_scale, scale)
+        if max_scale == scale:
+            settings = (scale, profile_name)
+            break
+        if max_scale >= MIN_SCALE and (settings is None or max_scale > settings[0]):
+            settings = (max_scale, profile_name)
+
+    if settings is not None:
+        plan['action'] = 'downgrade'
+        plan['scale'], plan['quality_profile'] = settings
+    return plan
+
+
+def estimate_document(svg_source, scale, quality_profile=quality.DEFAULT_PROFILE, limits=None, over_limit='downgrade'):
+    """Scan a document and plan its render, for schedulers routing renders by their cost.
+
+    :param svg_source: A path to a svg file, the content of a svg file as bytes or a binary file object.
+    :param scale: Number of pixels per svg unit asked for (e.g. svg.PIXEL_SCALE).
+    :param quality_profile: Name of the helpers.quality profile asked for.
+    :param limits: Dictionary of limits, whose keys are LIMIT_NAMES, None for DEFAULT_LIMITS.
+    :param over_limit: One of OVER_LIMIT_POLICIES.
+    :return: The plan, as returned by plan_render, with the statistics of the document.
+    :rtype: dict
+    :raise: ValueError if the document is not valid or the policy or the quality profile does not exist.
+    """
+
+    statistics = scan_document(svg_source)
+    plan = plan_render(statistics, DEFAULT_LIMITS if limits is None else limits, scale, quality_profile, over_limit)
+    plan['statistics'] = statistics
+    return plan
@@ -0,0 +1,34 @@
+MITER_LIMIT = 10  # default miter limit of cairo
+
+
+def get_stroke_padding(attributes, miter_joins=False):
+    """Get how far the stroke of an element reaches outside its geometry.
+
+    :param attributes: Attributes of an element, a shapes.records.Shape.
+    :param miter_joins: True if the geometry has corners joined by the stroke,
+           which can stick out up to MITER_LIMIT half widths.
+    :return: The distance in svg units.
+    :rtype: float
+    """
+
+    if attributes.stroke_color is None:
+        return 0
+
+    half_width = attributes.stroke_width / 2
+    return half_width * MITER_LIMIT if miter_joins else half_width
+
+
+def pad_box(box, padding):
+    """Grow a bounding box (min x, min y, max x, max y) by padding on every side."""
+    x0, y0, x1, y1 = box
+    return x0 - padding, y0 - padding, x1 + padding, y1 + padding
+
+
+def get_points_box(xs, ys):
+    """Get the bounding box (min x, min y, max x, max y) of points given by their coordinates."""
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def boxes_intersect(box1, box2):
+    """Check if two bounding boxes (min x, min y, max x, max y) overlap."""
+    return box1[0] <= box2[2] and box2[0] <= box1[2] and box1[1] <= box2[3] and box2[1] <= box1[3]
@@ -0,0 +1,136 @@
+MAX_RUN_LENGTH = 4096  # elements merged in one path, so a huge run is not tessellated at once
+
+# shapes whose outline always turns the same way when their size attributes are not negative,
+# so overlapping outlines in one path are filled as their union by the nonzero winding rule
+MERGEABLE_SIZE_ATTRIBUTES = {
+    'shapes.rectangle': ('width', 'height'),
+    'shapes.circle': ('radius',),
+    'shapes.ellipse': ('rx', 'ry')
+}
+# shapes which draw elements of their own, each with its paint, inside a saved context state
+CONTAINER_SHAPES = frozenset(('shapes.group',))
+
+
+def is_mergeable(shape, attributes):
+    """Check if an element can be filled in the same path as other elements of the same color.
+
+    :param shape: The shape module used to draw the element.
+    :param attributes: Attributes of the element.
+    :rtype: bool
+    """
+
+    size_attributes = MERGEABLE_SIZE_ATTRIBUTES.get(shape.__name__)
+    return (size_attributes is not None and attributes.color is not None and attributes.stroke_color is None
+            and all(getattr(attributes, name) >= 0 for name in size_attributes))
+
+
+def get_runs(elements):
+    """Number the runs of elements a Painter fills at once when it draws a list of elements.
+
+    Drawing only some of the elements, as in a region of the image, and flushing the painter
+    whenever the run number changes splits the runs as when all elements are drawn,
+    so the region gets the same pixels.
+
+    :param elements: List of (shape module, attributes) in painting order.
+    :return: List of the run number of each element, elements which are not merged get a number of their own.
+    :rtype: list
+    """
+
+    runs = []
+    run = 0
+    run_color = None
+    run_length = 0
+    for shape, attributes in elements:
+        if is_mergeable(shape, attributes):
+            if attributes.color != run_color or run_length >= MAX_RUN_LENGTH:
+                run += 1
+                run_color = attributes.color
+                run_length = 0
+            run_length += 1
+        else:
+            run += 1
+            run_color = None
+            run_length = 0
+        runs.append(run)
+
+    return runs
+
+
+class Painter:
+    """Draw elements on a cairo context with as few cairo calls as possible.
+
+    The painter remembers the source color and line width it set, and does not set them
+    again while they do not change. Consecutive filled elements without stroke which share
+    a color are added to one path and filled at once.
+    The context must not be drawn on by anything else until flush is called.
+    """
+
+    def __init__(self, context):
+        """Create a painter.
+
+        :param context: The cairo context.
+        """
+
+        self.context = context
+        self.source = None
+        self.line_width = None
+        self.run_color = None
+        self.run_length = 0
+
+    def set_source(self, color):
+        """Set the source color of the context, if it is not already set."""
+        if color != self.source:
+            self.context.set_source_rgb(*color)
+            self.source = color
+
+    def set_line_width(self, line_width):
+        """Set the line width of the context, if it is not already set."""
+        if line_width != self.line_width:
+            self.context.set_line_width(line_width)
+            self.line_width = line_width
+
+    def draw(self, shape, attributes):
+        """Draw an element, or add it to the current run of elements filled at once.
+
+        :param shape: The shape module used to draw the element.
+        :param attributes: Attributes of the element.
+        """
+
+        if is_mergeable(shape, attributes):
+            if attributes.color != self.run_color or self.run_length >= MAX_RUN_LENGTH:
+                self.flush()
+                self.run_color = attributes.color
+            shape.add_path(self.context, attributes)
+            self.run_length += 1
+            return
+
+        self.flush()
+        if shape.__name__ in CONTAINER_SHAPES:
+            shape.draw(self.context, attributes)
+            return
+
+        fill_color = attributes.color
+        stroke_color = attributes.stroke_color
+        if fill_color is None and stroke_color is None:
+            return
+
+        shape.add_path(self.context, attributes)
+        if fill_color is not None:
+            self.set_source(fill_color)
+            if stroke_color is not None:
+                self.context.fill_preserve()
+            else:
+                self.context.fill()
+
+        if stroke_color is not None:
+            self.set_source(stroke_color)
+            self.set_line_width(attributes.stroke_width)
+            self.context.stroke()
+
+    def flush(self):
+        """Fill the current run of elements."""
+        if self.run_length:
+            self.set_source(self.run_color)
+            self.context.fill()
+            self.run_color = None
+            self.run_length = 0
@@ -0,0 +1,219 @@
+import sys
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 32 * 2 ** 20
+MAX_OUTLINES = 4  # transforms per path data for which an outline is built, others draw the commands
+PATH_DATA_BYTES = 16  # size of a cairo_path_data_t, one for each operation of an outline and one for each point
+FLOAT_BYTES = sys.getsizeof(0.0)
+
+
+class PathGeometry:
+    """Parsed commands of a path data string, their bounding box and their resolved outlines.
+
+    An outline is a cairo path where relative coordinates, smooth curves and arcs are
+    already resolved to absolute lines and cubic curves. Outlines are keyed by the
+    transform and the tolerance of the contexts they are drawn on, see get_outline_key.
+    An outline is built the second time the path is drawn with the same key,
+    so path data used once never pays for it, and then appended at once.
+    """
+
+    __slots__ = ('path_data', 'commands', 'box', 'outlines', 'size')
+
+    def __init__(self, path_data, commands, box):
+        """Create the geometry of a path data string, without its outline.
+
+        :param path_data: The path data string (e.g. "M 0 0 L 10 10").
+        :param commands: List of commands parsed from the path data.
+        :param box: Bounding box (min x, min y, max x, max y) of the commands without stroke, None if there are none.
+        """
+
+        self.path_data = path_data
+        self.commands = commands
+        self.box = box
+        self.outlines = {}
+        self.size = (sys.getsizeof(self) + sys.getsizeof(path_data) + sys.getsizeof(commands) +
+                     sum(sys.getsizeof(command) + FLOAT_BYTES * (len(command) - 1) for command in commands))
+
+
+def get_outline_key(context):
+    """Get the key of the outlines which can be appended to a cairo context.
+
+    Cairo stores paths in device space, with 1/256 pixel precision, and splits arcs according
+    to the scale of the transform and to the tolerance. An outline built with the same scale,
+    rotation, tolerance and position within a pixel as the context lands on the same device
+    coordinates as drawing the commands on it, wherever it is translated by whole pixels,
+    as when an image is drawn in tiles or stripes.
+
+    :param context: The cairo context.
+    :return: A tuple (xx, yx, xy, yy, fraction of x0, fraction of y0, tolerance).
+    :rtype: tuple
+    """
+
+    matrix = context.get_matrix()
+    return matrix.xx, matrix.yx, matrix.xy, matrix.yy, matrix.x0 % 1, matrix.y0 % 1, context.get_tolerance()
+
+
+def get_outline_size(outline):
+    """Estimate the number of bytes held by a cairo path."""
+    return PATH_DATA_BYTES * sum(1 + len(points) // 2 for _, points in outline)
+
+
+class PathCache:
+    """Bounded cache of path geometries keyed by path data, shared by every document.
+
+    Icon sets and generated charts repeat the same path data many times, which is then
+    tokenized once and its outline built once, however many elements and documents use it.
+    Path data always starts with an absolute moveto, so an outline does not depend on the
+    current point of the context it is appended to. Commands which would start anywhere
+    else, and paths drawn with more than MAX_OUTLINES different keys, are drawn one by one.
+    The least recently used geometries are evicted once the cache holds more than max_bytes.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """Create an empty cache.
+
+        :param max_bytes: Maximum estimated size of the cached geometries and outlines.
+        """
+
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.outlines = 0
+        self.replays = 0
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def get(self, path_data, parse):
+        """Get the geometry of a path data string, parsing it if it is not in the cache.
+
+        :param path_data: The path data string.
+        :param parse: Function converting path data to its list of commands and their bounding box.
+        :return: The geometry.
+        :rtype: PathGeometry
+        """
+
+        with self.lock:
+            geometry = self.entries.get(path_data)
+            if geometry is not None:
+                self.entries.move_to_end(path_data)
+                self.hits += 1
+                return geometry
+            self.misses += 1
+
+        geometry = PathGeometry(path_data, *parse(path_data))
+        if geometry.size > self.max_bytes:
+            return geometry
+
+        with self.lock:
+            cached_geometry = self.entries.setdefault(path_data, geometry)
+            if cached_geometry is geometry:
+                self.bytes += geometry.size
+                self.evict()
+        return cached_geometry
+
+    def evict(self):
+        """Remove the least recently used geometries until the cache fits in max_bytes. The lock must be held."""
+        while self.bytes > self.max_bytes and self.entries:
+            _, geometry = self.entries.popitem(last=False)
+            self.bytes -= geometry.size
+
+    def get_scratch_context(self):
+        """Get the context of the current thread on which outlines are built."""
+        context = getattr(self.local, 'context', None)
+        if context is None:
+            import cairo
+
+            context = cairo.Context(cairo.ImageSurface(cairo.FORMAT_A8, 1, 1))
+            self.local.context = context
+        return context
+
+    def build_outline(self, geometry, key, add_commands):
+        """Build the outline of a geometry for a key, and account for its size if the geometry is still cached.
+
+        :param geometry: The geometry.
+        :param key: The key of the outline, as returned by get_outline_key.
+        :param add_commands: Function adding a list of commands to the current path of a cairo context.
+        :return: The outline.
+        :rtype: cairo.Path
+        """
+
+        import cairo
+
+        scratch_context = self.get_scratch_context()
+        scratch_context.set_matrix(cairo.Matrix(*key[:6]))
+        scratch_context.set_tolerance(key[6])
+        add_commands(scratch_context, geometry.commands)
+        outline = scratch_context.copy_path()
+        scratch_context.new_path()
+
+        outline_size = get_outline_size(outline)
+        with self.lock:
+            self.outlines += 1
+            if geometry.outlines.get(key) is None:
+                geometry.outlines[key] = outline
+                if self.entries.get(geometry.path_data) is geometry:
+                    geometry.size += outline_size
+                    self.bytes += outline_size
+                    self.evict()
+        return geometry.outlines[key]
+
+    def append_outline(self, context, geometry, add_commands):
+        """Add the outline of a geometry to the current path of a cairo context.
+
+        :param context: The cairo context.
+        :param geometry: The geometry.
+        :param add_commands: Function adding a list of commands to the current path of a cairo context,
+               used to draw the path the first time and to build its outline the second time.
+        """
+
+        commands = geometry.commands
+        if not commands or commands[0][0] != 'M':
+            add_commands(context, commands)
+            return
+
+        key = get_outline_key(context)
+        outlines = geometry.outlines
+        outline = outlines.get(key)
+        if outline is None:
+            if key not in outlines:
+                if len(outlines) < MAX_OUTLINES:
+                    outlines[key] = None
+                add_commands(context, commands)
+                return
+            outline = self.build_outline(geometry, key, add_commands)
+        else:
+            with self.lock:
+                self.replays += 1
+        context.append_path(outline)
+
+    def stats(self):
+        """Get the counters of the cache.
+
+        :return: Dictionary with the number of cached geometries, their estimated size in bytes,
+                 the number of hits and misses of path data, their hit rate, the number of outlines
+                 built and of outlines appended from an existing outline.
+        :rtype: dict
+        """
+
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'outlines': self.outlines,
+                'replays': self.replays
+            }
+
+    def clear(self):
+        """Remove every geometry from the cache and reset its counters."""
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+            self.hits = self.misses = self.outlines = self.replays = 0
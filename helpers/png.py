@@ -0,0 +1,140 @@
+import struct
+import zlib
+
+from helpers import raster
+
+SIGNATURE = b'\x89PNG\r\n\x1a\n'
+BIT_DEPTH = 8
+COLOR_TYPE_RGB = 2
+FILTER_NONE = b'\x00'
+FILTER_UP = b'\x02'
+DEFAULT_COMPRESSION_LEVEL = 6
+IDAT_SIZE = 2 ** 16  # bytes of compressed data gathered before an IDAT chunk is written
+# offsets of the red, green and blue bytes of a RGB24 pixel of cairo in memory
+RGB_OFFSETS = tuple(raster.CHANNEL_ORDER.index(channel) for channel in 'RGB')
+
+
+def write_chunk(stream, chunk_type, data):
+    """Write a png chunk.
+
+    :param stream: A writable binary file object.
+    :param chunk_type: Type of the chunk (e.g. b'IDAT').
+    :param data: Content of the chunk.
+    """
+
+    stream.write(struct.pack('>I', len(data)) + chunk_type)
+    stream.write(data)
+    stream.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(chunk_type))))
+
+
+def subtract_bytes(row, previous_row):
+    """Subtract two rows byte by byte, modulo 256, as the Up filter of png does.
+
+    The rows are handled as two large integers, with the high bit of each byte
+    set in the first and cleared in the second, so no borrow crosses a byte.
+
+    :param row: Bytes of a row.
+    :param previous_row: Bytes of the row above, of the same length.
+    :return: The filtered row.
+    :rtype: bytes
+    """
+
+    length = len(row)
+    high_bits = int.from_bytes(b'\x80' * length, 'big')
+    all_bits = (1 << 8 * length) - 1
+    a = int.from_bytes(row, 'big')
+    b = int.from_bytes(previous_row, 'big')
+    difference = ((a | high_bits) - (b & (all_bits ^ high_bits))) ^ ((a ^ b ^ all_bits) & high_bits)
+    return difference.to_bytes(length, 'big')
+
+
+class PngWriter:
+    """Encode an RGB image to png while its rows are produced, without holding the whole image.
+
+    Rows are compressed as they arrive and written out in IDAT chunks, so the memory used
+    depends on the width of the image, not on its height. Each row but the first is filtered
+    with the Up filter, which turns areas of flat color into runs of zeros.
+    """
+
+    def __init__(self, stream, width, height, compression_level=DEFAULT_COMPRESSION_LEVEL):
+        """Write the header of the image.
+
+        :param stream: A writable binary file object.
+        :param width: Width of the image in pixels.
+        :param height: Height of the image in pixels.
+        :param compression_level: zlib compression level, from 0 (none) to 9 (smallest).
+        """
+
+        self.stream = stream
+        self.width = width
+        self.height = height
+        self.rows = 0
+        self.previous_row = None
+        self.compressor = zlib.compressobj(compression_level)
+        self.pending = []
+        self.pending_bytes = 0
+
+        stream.write(SIGNATURE)
+        write_chunk(stream, b'IHDR', struct.pack('>IIBBBBB', width, height, BIT_DEPTH, COLOR_TYPE_RGB, 0, 0, 0))
+
+    def add_compressed(self, data):
+        """Gather compressed data, writing an IDAT chunk once there is enough of it."""
+        if data:
+            self.pending.append(data)
+            self.pending_bytes += len(data)
+        if self.pending_bytes >= IDAT_SIZE:
+            write_chunk(self.stream, b'IDAT', b''.join(self.pending))
+            self.pending = []
+            self.pending_bytes = 0
+
+    def write_row(self, row):
+        """Add the next row of the image.
+
+        :param row: Bytes of the row, 3 per pixel (red, green, blue).
+        :raise: ValueError if the image already has all its rows.
+        """
+
+        if self.rows >= self.height:
+            raise ValueError('The png image already has its {0} rows'.format(self.height))
+
+        if self.previous_row is None:
+            filtered_row = FILTER_NONE + row
+        else:
+            filtered_row = FILTER_UP + subtract_bytes(row, self.previous_row)
+        self.add_compressed(self.compressor.compress(filtered_row))
+        self.previous_row = row
+        self.rows += 1
+
+    def write_surface_rows(self, surface, number_of_rows):
+        """Add the first rows of a cairo RGB24 surface as the next rows of the image.
+
+        :param surface: A cairo image surface in RGB24 format, as wide as the image.
+        :param number_of_rows: Number of rows of the surface to add.
+        """
+
+        surface.flush()
+        data = surface.get_data()
+        stride = surface.get_stride()
+        row_bytes = self.width * 4
+        red, green, blue = RGB_OFFSETS
+        rgb_row = bytearray(self.width * 3)
+        for row in range(number_of_rows):
+            pixels = bytes(data[row * stride:row * stride + row_bytes])
+            rgb_row[0::3] = pixels[red::4]
+            rgb_row[1::3] = pixels[green::4]
+            rgb_row[2::3] = pixels[blue::4]
+            self.write_row(bytes(rgb_row))
+
+    def close(self):
+        """Write the end of the image.
+
+        :raise: ValueError if rows are missing.
+        """
+
+        if self.rows != self.height:
+            raise ValueError('The png image has {0} of its {1} rows'.format(self.rows, self.height))
+
+        self.pending.append(self.compressor.flush())
+        write_chunk(self.stream, b'IDAT', b''.join(self.pending))
+        self.pending = []
+        write_chunk(self.stream, b'IEND', b'')
@@ -0,0 +1,133 @@
+import contextlib
+import heapq
+import json
+import time
+
+from helpers import xml
+
+DEFAULT_SLOWEST_ELEMENTS = 10
+PHASES = ('parse', 'attributes', 'cull', 'draw', 'encode', 'cache')
+
+
+class Profiler:
+    """Wall time and call counts of a render, per phase and per element tag.
+
+    Phases are xml parsing (parse), attribute conversion (attributes), bounding box
+    checks (cull), cairo drawing (draw), png encoding (encode) and render cache lookups
+    (cache), the only phase of a render found in the cache. The slowest elements
+    are kept with their position among the children of the root element, which is turned
+    into a line number when the report is built. When runs of elements are filled at
+    once, the fill is counted for the element drawn right after the run, whose drawing
+    starts with it, and the fill of the last run for the draw phase only. Counters hold totals
+    reported by the renderer, such as the <use> instances replayed from a recording.
+    """
+
+    def __init__(self, slowest_elements=DEFAULT_SLOWEST_ELEMENTS, callback=None):
+        """Create an empty profile.
+
+        :param slowest_elements: Number of slowest elements kept in the report.
+        :param callback: Optional function called with the report when the render is finished,
+               e.g. to forward it to a metrics system.
+        """
+
+        self.slowest_elements = slowest_elements
+        self.callback = callback
+        self.phases = {phase: [0.0, 0] for phase in PHASES}
+        self.tags = {}
+        self.slowest = []
+        self.counters = {}
+        self.start_time = time.perf_counter()
+
+    def add_time(self, phase, seconds, calls=1):
+        """Add time spent in a phase."""
+        totals = self.phases.setdefault(phase, [0.0, 0])
+        totals[0] += seconds
+        totals[1] += calls
+
+    @contextlib.contextmanager
+    def phase(self, phase):
+        """Measure the time spent in a with block as part of a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.perf_counter() - start)
+
+    def time_iterator(self, phase, iterator):
+        """Yield the items of an iterator, measuring the time spent producing them as part of a phase."""
+        iterator = iter(iterator)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_time(phase, time.perf_counter() - start, 0)
+                return
+            self.add_time(phase, time.perf_counter() - start)
+            yield item
+
+    def add_element(self, index, tag, attributes_seconds, draw_seconds):
+        """Record the times of one element.
+
+        :param index: Position of the element among the children of the root element.
+        :param tag: Tag of the element, without namespace.
+        :param attributes_seconds: Time spent converting the attributes of the element.
+        :param draw_seconds: Time spent drawing the element, 0 if it was not drawn.
+        """
+
+        totals = self.tags.setdefault(tag, {'count': 0, 'attributes_seconds': 0.0, 'draw_seconds': 0.0})
+        totals['count'] += 1
+        totals['attributes_seconds'] += attributes_seconds
+        totals['draw_seconds'] += draw_seconds
+
+        element = (attributes_seconds + draw_seconds, index, tag, attributes_seconds, draw_seconds)
+        if len(self.slowest) < self.slowest_elements:
+            heapq.heappush(self.slowest, element)
+        elif self.slowest and element > self.slowest[0]:
+            heapq.heapreplace(self.slowest, element)
+
+    def report(self, svg_file=None):
+        """Build the report of the render.
+
+        :param svg_file: Optional path to the svg file or seekable file object,
+               read again to find the lines of the slowest elements.
+        :return: The report, made of json compatible values.
+        :rtype: dict
+        """
+
+        total_seconds = time.perf_counter() - self.start_time
+        slowest = sorted(self.slowest, reverse=True)
+        lines = xml.find_child_lines(svg_file, [element[1] for element in slowest]) if svg_file is not None else {}
+        return {
+            'total_seconds': total_seconds,
+            'phases': {phase: {'seconds': seconds, 'calls': calls} for phase, (seconds, calls) in self.phases.items()},
+            'tags': self.tags,
+            'counters': self.counters,
+            'slowest_elements': [{'index': index, 'tag': tag, 'line': lines.get(index), 'seconds': seconds,
+                                  'attributes_seconds': attributes_seconds, 'draw_seconds': draw_seconds}
+                                 for seconds, index, tag, attributes_seconds, draw_seconds in slowest]
+        }
+
+    def finish(self, svg_file=None):
+        """Build the report of the finished render and give it to the callback.
+
+        :param svg_file: Optional path to the svg file or seekable file object.
+        :return: The report.
+        :rtype: dict
+        """
+
+        report = self.report(svg_file)
+        if self.callback is not None:
+            self.callback(report)
+
+        return report
+
+
+def write_report(report, filename):
+    """Write a report as json to a file, or to the standard output if filename is '-'."""
+    if filename == '-':
+        print(json.dumps(report, indent=2))
+        return
+
+    with open(filename, 'w') as report_file:
+        json.dump(report, report_file, indent=2)
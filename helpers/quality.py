@@ -0,0 +1,62 @@
+import math
+
+# tolerance: largest error in device pixels when cairo flattens curves to lines, and when
+#            large polylines are simplified if it is above the default of cairo (see shapes/polyline)
+# antialias: name of the cairo antialiasing mode
+# min_element_size: elements whose bounding box is smaller than this many device pixels are not drawn
+# best keeps the defaults of cairo (i.e. a tolerance of 0.1 and the default antialiasing), so it renders
+# as a context without profile does, and the other profiles trade fidelity for speed from there
+PROFILES = {
+    'best': {'tolerance': 0.1, 'antialias': 'ANTIALIAS_DEFAULT', 'min_element_size': 0},
+    'draft': {'tolerance': 0.5, 'antialias': 'ANTIALIAS_FAST', 'min_element_size': 0.5},
+    'fast': {'tolerance': 1.0, 'antialias': 'ANTIALIAS_NONE', 'min_element_size': 1}
+}
+DEFAULT_PROFILE = 'best'
+
+
+def get_profile(name):
+    """Get the settings of a quality profile.
+
+    :param name: Name of the profile (i.e. one of PROFILES).
+    :return: The settings of the profile.
+    :rtype: dict
+    :raise: ValueError if there is no profile with this name.
+    """
+
+    if name not in PROFILES:
+        raise ValueError('Unknown quality profile: ' + name)
+
+    return PROFILES[name]
+
+
+def apply_profile(context, profile):
+    """Set the curve tolerance and antialiasing mode of a profile on a cairo context.
+
+    :param context: The cairo context.
+    :param profile: The settings of a quality profile.
+    """
+
+    import cairo
+
+    context.set_tolerance(profile['tolerance'])
+    context.set_antialias(getattr(cairo, profile['antialias']))
+
+
+def get_min_element_size(context, profile):
+    """Get the size under which elements are not drawn, in the user units of a cairo context.
+
+    :param context: The cairo context, with its final transform.
+    :param profile: The settings of a quality profile.
+    :return: The size, 0 if no element is skipped.
+    :rtype: float
+    """
+
+    if not profile['min_element_size']:
+        return 0
+
+    return math.hypot(*context.device_to_user_distance(profile['min_element_size'], 0))
+
+
+def is_too_small(box, min_size):
+    """Check if a bounding box (min x, min y, max x, max y) is smaller than a size on both sides."""
+    return box[2] - box[0] < min_size and box[3] - box[1] < min_size
@@ -0,0 +1,122 @@
+import sys
+
+# cairo stores each pixel of these formats as a native endian 32 bit integer 0xAARRGGBB
+# (the alpha byte is unused in RGB24), so the order of the bytes in memory depends on the platform
+CHANNEL_ORDER = 'BGRA' if sys.byteorder == 'little' else 'ARGB'
+BYTES_PER_PIXEL = {'RGB24': 4, 'ARGB32': 4, 'A8': 1}
+CONVERSION_MODES = ('rgba', 'rgba_premultiplied', 'rgb')
+
+
+def get_format_name(surface):
+    """Get the name of the pixel format of a cairo image surface.
+
+    :param surface: The cairo image surface.
+    :return: One of the keys of BYTES_PER_PIXEL.
+    :rtype: str
+    :raise: ValueError if the format is not supported.
+    """
+
+    import cairo
+
+    surface_format = surface.get_format()
+    for name in BYTES_PER_PIXEL:
+        if surface_format == getattr(cairo, 'FORMAT_' + name):
+            return name
+
+    raise ValueError('Unsupported surface format: {0}'.format(surface_format))
+
+
+def get_raster_info(surface):
+    """Get the layout of the pixels of a cairo image surface.
+
+    :param surface: The cairo image surface.
+    :return: Dictionary with the width and height in pixels, the stride (bytes per row, rows may be padded),
+             the format name and the channel order of the bytes of a pixel (None for A8).
+    :rtype: dict
+    """
+
+    format_name = get_format_name(surface)
+    return {
+        'width': surface.get_width(),
+        'height': surface.get_height(),
+        'stride': surface.get_stride(),
+        'format': format_name,
+        'channel_order': CHANNEL_ORDER if BYTES_PER_PIXEL[format_name] == 4 else None
+    }
+
+
+def get_buffer(surface):
+    """Get the pixels of a cairo image surface without copying them.
+
+    The surface must be flushed and must not be drawn on nor given back to a pool while the buffer is used.
+
+    :param surface: The cairo image surface.
+    :return: A tuple (memoryview over the pixel data, raster info as returned by get_raster_info).
+    :rtype: tuple
+    """
+
+    surface.flush()
+    return surface.get_data(), get_raster_info(surface)
+
+
+def get_array(surface):
+    """Get a numpy view on the pixels of a cairo image surface, without copying them.
+
+    Padding at the end of the rows is skipped through the strides of the view.
+    The bytes of each pixel are in the native order of cairo, see CHANNEL_ORDER.
+
+    :param surface: The cairo image surface.
+    :return: Array of uint8 of shape (height, width, 4), or (height, width) for A8 surfaces.
+    :rtype: numpy.ndarray
+    """
+
+    import numpy
+
+    data, info = get_buffer(surface)
+    bytes_per_pixel = BYTES_PER_PIXEL[info['format']]
+    if bytes_per_pixel == 1:
+        shape, strides = (info['height'], info['width']), (info['stride'], 1)
+    else:
+        shape, strides = (info['height'], info['width'], bytes_per_pixel), (info['stride'], bytes_per_pixel, 1)
+
+    return numpy.ndarray(shape, dtype=numpy.uint8, buffer=data, strides=strides)
+
+
+def convert_pixels(surface, mode='rgba'):
+    """Copy the pixels of a RGB24 or ARGB32 cairo image surface to a new array in a common layout.
+
+    Cairo stores ARGB32 colors premultiplied by their alpha: 'rgba_premultiplied' keeps them so,
+    'rgba' divides them back to straight colors. RGB24 pixels are opaque, so both modes give
+    the same result with an alpha of 255.
+
+    :param surface: The cairo image surface.
+    :param mode: One of CONVERSION_MODES.
+    :return: Array of uint8 of shape (height, width, 4) for RGBA modes, (height, width, 3) for 'rgb'.
+    :rtype: numpy.ndarray
+    :raise: ValueError if the mode or the surface format is not supported.
+    """
+
+    import numpy
+
+    if mode not in CONVERSION_MODES:
+        raise ValueError('Unknown conversion mode: ' + mode)
+
+    format_name = get_format_name(surface)
+    if BYTES_PER_PIXEL[format_name] != 4:
+        raise ValueError('Cannot convert {0} pixels to {1}'.format(format_name, mode))
+
+    pixels = get_array(surface)
+    channels = [CHANNEL_ORDER.index(channel) for channel in ('RGB' if mode == 'rgb' else 'RGBA')]
+    converted = pixels[:, :, channels]  # fancy indexing copies the pixels to a contiguous array
+    if mode == 'rgb':
+        return converted
+
+    if format_name == 'RGB24':
+        converted[:, :, 3] = 255
+    elif mode == 'rgba':
+        alpha = converted[:, :, 3:].astype(numpy.uint16)
+        colors = converted[:, :, :3].astype(numpy.uint16)
+        straight = (colors * 255 + alpha // 2) // numpy.maximum(alpha, 1)
+        converted[:, :, :3] = numpy.minimum(straight, 255)
+
+    return converted
@@ -0,0 +1,147 @@
+from collections import OrderedDict
+
+XLINK_HREF = '{http://www.w3.org/1999/xlink}href'
+DEFINITION_TAGS = frozenset(('defs', 'symbol'))
+DEFAULT_MAX_RECENT_ELEMENTS = 1024
+
+
+class Definition:
+    """Parsed content of an element referenced by <use> elements, and the recording of its drawing.
+
+    The content is drawn once into a cairo recording surface, which every <use> replays.
+    A recording holds vector drawing commands, so it is replayed at the resolution of
+    whatever transform a <use> applies and one recording serves every scale.
+    """
+
+    def __init__(self, children, box):
+        """Create a definition.
+
+        :param children: List of (shape module, attributes) of the content.
+        :param box: Bounding box (min x, min y, max x, max y) of the content, None if it draws nothing.
+        """
+
+        self.children = children
+        self.box = box
+        self.recording = None
+        self.instances = 0
+        self.cached_instances = 0
+
+    def __eq__(self, other):
+        return isinstance(other, Definition) and self.children == other.children
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'Definition({0!r})'.format(self.children)
+
+
+class References:
+    """Elements of a document which may be referenced by id, and the definitions parsed from them.
+
+    Elements are registered as the document is streamed, so a <use> can only refer to
+    an element which comes before it in the file, as is the case when shared content
+    is held in a leading <defs>. The same element referenced with different inherited
+    presentation attributes (e.g. fill set on the <use>) gives different definitions.
+
+    To keep the memory of a streamed render flat, only the content of <defs> and <symbol>
+    elements and the elements already referenced by a <use> are kept until the end of the
+    document. Other elements with an id, which some tools put on nearly every group, are only
+    kept while they are among the max_recent_elements last ones registered: a <use> referring
+    to an element drawn further back in the document than that draws nothing.
+    """
+
+    def __init__(self, max_recent_elements=DEFAULT_MAX_RECENT_ELEMENTS):
+        """Create empty references.
+
+        :param max_recent_elements: Number of elements with an id outside <defs> and <symbol>
+               which are kept in case a later <use> refers to them.
+        """
+
+        self.max_recent_elements = max_recent_elements
+        self.elements = {}
+        self.recent_elements = OrderedDict()
+        self.definitions = {}
+        self.resolving = set()
+
+    def register(self, item):
+        """Remember the elements with an id in the subtree of an element."""
+        if 'id' not in item.attrib and not len(item):
+            return
+
+        self.register_subtree(item, False)
+        while len(self.recent_elements) > self.max_recent_elements:
+            self.recent_elements.popitem(last=False)
+
+    def register_subtree(self, element, in_definitions):
+        """Remember the elements with an id in a subtree, keeping those of <defs> and <symbol> for good."""
+        in_definitions = in_definitions or element.tag.rpartition('}')[2] in DEFINITION_TAGS
+        element_id = element.get('id')
+        if element_id is not None:
+            if in_definitions:
+                self.elements[element_id] = element
+            else:
+                self.elements.pop(element_id, None)
+                self.recent_elements[element_id] = element
+                self.recent_elements.move_to_end(element_id)
+
+        for child in element:
+            self.register_subtree(child, in_definitions)
+
+    def get_element(self, element_id):
+        """Get a registered element, keeping it for good once it is referenced."""
+        element = self.elements.get(element_id)
+        if element is None:
+            element = self.recent_elements.pop(element_id, None)
+            if element is not None:
+                self.elements[element_id] = element
+        return element
+
+    def get_definition(self, href, inherited, parse_element):
+        """Get the definition of a referenced element, parsing it on first use.
+
+        :param href: Value of the href attribute (e.g. "#marker").
+        :param inherited: Presentation attributes inherited by the referenced content.
+        :param parse_element: Function converting the referenced element and inherited
+               attributes to a list of (shape module, attributes) and their bounding box.
+        :return: The definition, or None if the reference is not a known element of the document
+                 or refers to one of the elements it is part of.
+        :rtype: Definition
+        """
+
+        if not href or not href.startswith('#'):
+            return None
+
+        element_id = href[1:]
+        key = (element_id, tuple(sorted(inherited.items())))
+        definition = self.definitions.get(key)
+        if definition is not None:
+            return definition
+
+        element = self.get_element(element_id)
+        if element is None or key in self.resolving:
+            return None
+
+        self.resolving.add(key)
+        try:
+            definition = Definition(*parse_element(element, inherited))
+        finally:
+            self.resolving.discard(key)
+
+        self.definitions[key] = definition
+        return definition
+
+    def stats(self):
+        """Get the counters of the definitions.
+
+        :return: Dictionary with the number of definitions, of recordings drawn, of instances
+                 drawn and of instances replayed from an existing recording.
+        :rtype: dict
+        """
+
+        definitions = self.definitions.values()
+        return {
+            'definitions': len(self.definitions),
+            'recordings': sum(definition.recording is not None for definition in definitions),
+            'instances': sum(definition.instances for definition in definitions),
+            'cached_instances': sum(definition.cached_instances for definition in definitions)
+        }
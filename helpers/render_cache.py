@@ -0,0 +1,153 @@
+import hashlib
+import os
+import tempfile
+import threading
+
+DEFAULT_MAX_BYTES = 2 ** 30
+CACHE_VERSION = 1
+EVICTION_SLACK_RATIO = 0.1  # share of max_bytes written between two scans of the cache directory
+
+
+class RenderCache:
+    """Content-addressed cache of rendered images stored in a directory.
+
+    Entries are keyed by a hash of the svg bytes and of the render parameters,
+    written to a temporary file and renamed, so several processes can share the
+    same directory. Reading an entry refreshes its modification time, which is
+    used to evict the least recently used entries once the cache grows past max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        """Open a cache directory, creating it if needed.
+
+        :param directory: Path to the cache directory.
+        :param max_bytes: Maximum size of the cached images.
+        """
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_since_eviction = 0
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def get_key(svg_data, **parameters):
+        """Compute the key of a render.
+
+        :param svg_data: Content of the svg file.
+        :param parameters: Parameters which change the rendered image (e.g. scale, format, region).
+        :return: The key, as a hexadecimal string.
+        :rtype: str
+        """
+
+        digest = hashlib.sha256(svg_data)
+        digest.update(repr((CACHE_VERSION, sorted(parameters.items()))).encode())
+        return digest.hexdigest()
+
+    def get_entry_path(self, key):
+        """Get the path of the file holding a cache entry."""
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        """Read a cached image.
+
+        :param key: Key of the render.
+        :return: The cached image, or None if it is not in the cache.
+        :rtype: bytes
+        """
+
+        entry_path = self.get_entry_path(key)
+        try:
+            with open(entry_path, 'rb') as entry:
+                data = entry.read()
+        except FileNotFoundError:
+            with self.lock:
+                self.misses += 1
+            return None
+
+        # the entry may be evicted by another process once read, it is then only left out of the LRU order
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            pass
+
+        with self.lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """Store an image in the cache.
+
+        :param key: Key of the render.
+        :param data: The rendered image.
+        """
+
+        entry_path = self.get_entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(entry_path), suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as entry:
+                entry.write(data)
+            os.replace(temporary_path, entry_path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+        with self.lock:
+            self.bytes_since_eviction += len(data)
+            if self.bytes_since_eviction < self.max_bytes * EVICTION_SLACK_RATIO:
+                return
+            self.bytes_since_eviction = 0
+        self.evict()
+
+    def list_entries(self):
+        """List the cache entries.
+
+        :return: List of tuples (modification time, size, path) of every entry.
+        :rtype: list
+        """
+
+        entries = []
+        for parent, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename.endswith('.tmp'):
+                    continue
+                entry_path = os.path.join(parent, filename)
+                try:
+                    status = os.stat(entry_path)
+                except FileNotFoundError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, entry_path))
+
+        return entries
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self.list_entries())
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry_path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+    def stats(self):
+        """Get the statistics of the cache.
+
+        :return: Dictionary with the hits and misses of this process,
+                 and the number of entries and bytes in the cache directory.
+        :rtype: dict
+        """
+
+        entries = self.list_entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries)
+        }
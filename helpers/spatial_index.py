@@ -0,0 +1,68 @@
+import collections
+
+from helpers import geometry
+
+DEFAULT_CELLS_PER_SIDE = 64
+
+
+class GridIndex:
+    """Uniform grid of cells over an area, each cell holding the ids of the bounding boxes that overlap it.
+
+    Boxes reaching outside the area are stored in the cells on its border,
+    so queries stay correct anywhere. Ids are the positions at which boxes were
+    inserted and queries return them sorted, so callers get elements back in painting order.
+    """
+
+    def __init__(self, size, cells_per_side=DEFAULT_CELLS_PER_SIDE):
+        """Create an empty index.
+
+        :param size: Size of the indexed area (i.e. width and height), starting at the origin.
+        :param cells_per_side: Number of cells along the longest side of the area.
+        """
+
+        self.cell_size = max(max(size) / cells_per_side, 1)
+        self.last_column = max(int(size[0] / self.cell_size), 0)
+        self.last_row = max(int(size[1] / self.cell_size), 0)
+        self.cells = collections.defaultdict(list)
+        self.boxes = []
+
+    def get_cell_range(self, box):
+        """Get the first and last column and row of the cells overlapping a box."""
+        x0, y0, x1, y1 = box
+        return (min(max(int(x0 // self.cell_size), 0), self.last_column),
+                min(max(int(y0 // self.cell_size), 0), self.last_row),
+                min(max(int(x1 // self.cell_size), 0), self.last_column),
+                min(max(int(y1 // self.cell_size), 0), self.last_row))
+
+    def insert(self, box):
+        """Add a bounding box to the index.
+
+        :param box: The bounding box (min x, min y, max x, max y).
+        :return: The id of the box.
+        :rtype: int
+        """
+
+        box_id = len(self.boxes)
+        self.boxes.append(box)
+        first_column, first_row, last_column, last_row = self.get_cell_range(box)
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                self.cells[column, row].append(box_id)
+
+        return box_id
+
+    def query(self, box):
+        """Find the boxes that overlap a region.
+
+        :param box: The region (min x, min y, max x, max y).
+        :return: Sorted list of ids of the boxes overlapping the region.
+        :rtype: list
+        """
+
+        first_column, first_row, last_column, last_row = self.get_cell_range(box)
+        candidates = set()
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                candidates.update(self.cells.get((column, row), ()))
+
+        return sorted(box_id for box_id in candidates if geometry.boxes_intersect(self.boxes[box_id], box))
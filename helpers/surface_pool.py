@@ -0,0 +1,150 @@
+import collections
+import contextlib
+import threading
+
+import cairo
+
+DEFAULT_MAX_BYTES = 256 * 2 ** 20
+
+
+def get_surface_bytes(surface):
+    """Get the size in bytes of the pixel buffer of an image surface."""
+    return surface.get_stride() * surface.get_height()
+
+
+class SurfacePool:
+    """Reusable cairo image surfaces and their contexts, grouped by size and format.
+
+    A context is handed out with its state saved, and the state is restored
+    when it comes back, so the transform, clip, source and line settings
+    of one render never leak into the next. A surface whose render failed
+    may come back with unbalanced saves, so it is dropped instead.
+    Idle surfaces are evicted, least recently used first, when they take
+    more than max_bytes.
+    The pool may be shared by renders running in several threads: its
+    bookkeeping is only changed with its lock held, and a surface and its
+    context belong to a single render between acquire and release.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """Create an empty pool.
+
+        :param max_bytes: Maximum size of the idle surfaces kept in the pool.
+        """
+
+        self.max_bytes = max_bytes
+        self.pooled_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.idle = collections.OrderedDict()
+        self.contexts = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, width, height, surface_format=cairo.FORMAT_RGB24, clear=True):
+        """Get a surface and a context to draw on it.
+
+        :param width: Width of the surface in pixels.
+        :param height: Height of the surface in pixels.
+        :param surface_format: Pixel format of the surface.
+        :param clear: If False, a reused surface keeps the pixels of its previous render,
+               which is only fine for callers that set every pixel of the surface themselves.
+               Otherwise a reused surface is reset to zeros, as a new surface is.
+        :return: A tuple (surface, context).
+        :rtype: tuple
+        """
+
+        key = (surface_format, width, height)
+        with self.lock:
+            entries = self.idle.get(key)
+            if entries:
+                surface = entries.pop()
+                if not entries:
+                    del self.idle[key]
+                self.pooled_bytes -= get_surface_bytes(surface)
+                self.hits += 1
+                context = self.contexts[surface]
+            else:
+                surface = None
+                self.misses += 1
+
+        if surface is None:
+            surface = cairo.ImageSurface(surface_format, width, height)
+            context = cairo.Context(surface)
+            with self.lock:
+                self.contexts[surface] = context
+        else:
+            if clear:
+                context.save()
+                context.identity_matrix()
+                context.reset_clip()
+                context.set_operator(cairo.OPERATOR_SOURCE)
+                context.set_source_rgba(0, 0, 0, 0)
+                context.paint()
+                context.restore()
+
+        context.save()
+        return surface, context
+
+    def release(self, surface, discard=False):
+        """Give back a surface obtained with acquire.
+
+        :param surface: The surface, which must not be used after this call.
+        :param discard: If True, the surface is dropped instead of being reused,
+               e.g. because the render drawing on it failed in the middle of a save and restore pair.
+        """
+
+        with self.lock:
+            if discard:
+                del self.contexts[surface]
+                return
+            context = self.contexts[surface]
+        context.restore()
+        context.new_path()
+
+        surface_bytes = get_surface_bytes(surface)
+        with self.lock:
+            if surface_bytes > self.max_bytes:
+                del self.contexts[surface]
+                return
+
+            key = (surface.get_format(), surface.get_width(), surface.get_height())
+            self.idle.setdefault(key, []).append(surface)
+            self.idle.move_to_end(key)
+            self.pooled_bytes += surface_bytes
+
+            while self.pooled_bytes > self.max_bytes:
+                oldest_key, entries = next(iter(self.idle.items()))
+                evicted_surface = entries.pop(0)
+                if not entries:
+                    del self.idle[oldest_key]
+                self.pooled_bytes -= get_surface_bytes(evicted_surface)
+                del self.contexts[evicted_surface]
+
+    @contextlib.contextmanager
+    def surface(self, width, height, surface_format=cairo.FORMAT_RGB24, clear=True):
+        """Borrow a surface and its context for the duration of a with block.
+
+        :example:
+        >>> pool = SurfacePool()
+        >>> with pool.surface(100, 100) as (surface, context):
+        ...     context.rectangle(10, 10, 50, 50)
+        ...     context.fill()
+        ...     surface.write_to_png('image.png')
+        """
+
+        surface, context = self.acquire(width, height, surface_format, clear)
+        try:
+            yield surface, context
+        except BaseException:
+            self.release(surface, discard=True)
+            raise
+        self.release(surface)
+
+    def clear(self):
+        """Drop all idle surfaces."""
+        with self.lock:
+            for entries in self.idle.values():
+                for surface in entries:
+                    del self.contexts[surface]
+            self.idle.clear()
+            self.pooled_bytes = 0
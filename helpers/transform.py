@@ -0,0 +1,103 @@
+import math
+import re
+
+# matrices are tuples (xx, yx, xy, yy, x0, y0) in the order of cairo.Matrix,
+# mapping a point (x, y) to (xx * x + xy * y + x0, yx * x + yy * y + y0)
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+TRANSFORM_FUNCTION = re.compile(r'\s*(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)\s*,?')
+NUMBER = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+NUMBER_OF_ARGUMENTS = {
+    'matrix': (6,),
+    'translate': (1, 2),
+    'scale': (1, 2),
+    'rotate': (1, 3),
+    'skewX': (1,),
+    'skewY': (1,)
+}
+
+
+def multiply(outer, inner):
+    """Combine two matrices into the matrix which applies inner, then outer."""
+    a1, b1, c1, d1, e1, f1 = outer
+    a2, b2, c2, d2, e2, f2 = inner
+    return (a1 * a2 + c1 * b2, b1 * a2 + d1 * b2,
+            a1 * c2 + c1 * d2, b1 * c2 + d1 * d2,
+            a1 * e2 + c1 * f2 + e1, b1 * e2 + d1 * f2 + f1)
+
+
+def get_function_matrix(name, arguments):
+    """Get the matrix of one transform function.
+
+    :param name: Name of the function (e.g. rotate).
+    :param arguments: Its numeric arguments.
+    :return: The matrix.
+    :rtype: tuple
+    """
+
+    if name == 'matrix':
+        return tuple(arguments)
+    if name == 'translate':
+        return 1.0, 0.0, 0.0, 1.0, arguments[0], arguments[1] if len(arguments) > 1 else 0.0
+    if name == 'scale':
+        return arguments[0], 0.0, 0.0, arguments[-1], 0.0, 0.0
+    if name == 'skewX':
+        return 1.0, 0.0, math.tan(math.radians(arguments[0])), 1.0, 0.0, 0.0
+    if name == 'skewY':
+        return 1.0, math.tan(math.radians(arguments[0])), 0.0, 1.0, 0.0, 0.0
+
+    angle = math.radians(arguments[0])
+    cos, sin = math.cos(angle), math.sin(angle)
+    rotation = (cos, sin, -sin, cos, 0.0, 0.0)
+    if len(arguments) == 1:
+        return rotation
+
+    cx, cy = arguments[1], arguments[2]
+    return multiply(multiply((1.0, 0.0, 0.0, 1.0, cx, cy), rotation), (1.0, 0.0, 0.0, 1.0, -cx, -cy))
+
+
+def parse_transform(transform):
+    """Convert the transform attribute of an element to a matrix.
+
+    :param transform: A list of transform functions (e.g. "translate(10 20) rotate(45)"), applied right to left.
+    :return: The matrix, or None if there is no transform.
+    :rtype: tuple
+    :raise: ValueError if the transform is not valid.
+    """
+
+    if not transform or transform.isspace():
+        return None
+
+    matrix = IDENTITY
+    position = 0
+    while position < len(transform):
+        match = TRANSFORM_FUNCTION.match(transform, position)
+        if match is None:
+            raise ValueError('Invalid transform: ' + transform)
+
+        name, arguments = match.group(1), [float(number) for number in NUMBER.findall(match.group(2))]
+        if len(arguments) not in NUMBER_OF_ARGUMENTS[name]:
+            raise ValueError('Invalid transform: ' + transform)
+        matrix = multiply(matrix, get_function_matrix(name, arguments))
+        position = match.end()
+
+    return matrix
+
+
+def transform_box(box, matrix):
+    """Get the bounding box (min x, min y, max x, max y) of a transformed box."""
+    if matrix is None:
+        return box
+
+    a, b, c, d, e, f = matrix
+    x0, y0, x1, y1 = box
+    xs = [a * x + c * y + e for x, y in ((x0, y0), (x1, y0), (x0, y1), (x1, y1))]
+    ys = [b * x + d * y + f for x, y in ((x0, y0), (x1, y0), (x0, y1), (x1, y1))]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def get_scale_factor(matrix):
+    """Get how much a matrix scales areas, as a length ratio (exact for uniform scales)."""
+    if matrix is None:
+        return 1.0
+
+    return math.sqrt(abs(matrix[0] * matrix[3] - matrix[1] * matrix[2]))
@@ -1,15 +1,140 @@
+import contextlib
+import io
+import os
+import re
+import sys
 import xml.etree.ElementTree as element_tree
+from xml.parsers import expat
 
+SNIFF_BYTES = 4096
+STDIO_NAME = '-'
+ROOT_TAG_PATTERN = re.compile(rb'<(?:[A-Za-z_][\w.-]*:)?svg[\s/>]')
 
-def check_if_file_is_svg(filename):
-    """Check if a file has a svg extension.
 
-    :param filename: A path to a svg file.
-    :raise: ValueError if filename has not .svg extension.
+class PrefixedFile:
+    """Binary file object reading some bytes already taken from a stream, then the rest of the stream."""
+
+    def __init__(self, prefix, stream):
+        self.prefix = prefix
+        self.stream = stream
+
+    def read(self, size=-1):
+        """Read at most size bytes, or everything left if size is negative."""
+        if not self.prefix:
+            return self.stream.read(size)
+
+        if size is None or size < 0:
+            data, self.prefix = self.prefix + self.stream.read(), b''
+        else:
+            data, self.prefix = self.prefix[:size], self.prefix[size:]
+        return data
+
+    def seekable(self):
+        return False
+
+
+def skip_prolog(head):
+    """Get the position of the root element in the first bytes of a xml document.
+
+    The byte order mark, whitespace, xml declaration, processing instructions,
+    comments and document type declaration before the root element are skipped.
+
+    :param head: First bytes of the document.
+    :return: Position of the root element, or None if it does not start in head.
+    :rtype: int
+    """
+
+    position = 3 if head.startswith(b'\xef\xbb\xbf') else 0
+    while True:
+        while position < len(head) and head[position:position + 1].isspace():
+            position += 1
+
+        if head.startswith(b'<?', position):
+            end, closing = head.find(b'?>', position), b'?>'
+        elif head.startswith(b'<!--', position):
+            end, closing = head.find(b'-->', position), b'-->'
+        elif head.startswith(b'<!DOCTYPE', position):
+            subset, end = head.find(b'[', position), head.find(b'>', position)
+            closing = b'>'
+            if subset != -1 and subset < end:
+                end, closing = head.find(b']', subset), b']'
+                end = head.find(b'>', end) if end != -1 else -1
+        else:
+            return position if position < len(head) else None
+
+        if end == -1:
+            return None
+        position = end + len(closing)
+
+
+def check_svg_content(head):
+    """Check if a document is a svg document from its first bytes, whatever its name.
+
+    :param head: First bytes of the document, SNIFF_BYTES are enough.
+    :raise: ValueError if the root element is not a svg element.
+    """
+
+    position = skip_prolog(head)
+    if position is None or not ROOT_TAG_PATTERN.match(head, position):
+        raise ValueError('Not a svg document')
+
+
+@contextlib.contextmanager
+def open_svg(source):
+    """Open a svg document from a path, the standard input, bytes or a file object, and check its content.
+
+    :param source: A path to a svg file, STDIO_NAME for the standard input,
+           the content of a svg file as bytes or a binary file object.
+    :return: A context manager giving a binary file object, positioned at the start of the document.
+             Only files and bytes give seekable file objects.
+    :raise: ValueError if the content is not a svg document.
+    :raise: FileNotFoundError if the path does not exist.
+    """
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    elif source == STDIO_NAME:
+        source = sys.stdin.buffer
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as svg_file:
+            check_svg_content(svg_file.read(SNIFF_BYTES))
+            svg_file.seek(0)
+            yield svg_file
+        return
+
+    if source.seekable():
+        start = source.tell()
+        check_svg_content(source.read(SNIFF_BYTES))
+        source.seek(start)
+        yield source
+    else:
+        head = source.read(SNIFF_BYTES)
+        check_svg_content(head)
+        yield PrefixedFile(head, source)
+
+
+@contextlib.contextmanager
+def open_output(target):
+    """Open an output for writing bytes to it piece by piece.
+
+    :param target: A path, STDIO_NAME for the standard output or a writable binary file object.
+    :return: A context manager giving a writable binary file object. Only files opened from a path are closed.
     """
 
-    if not filename.lower().endswith('.svg'):
-        raise ValueError
+    if target == STDIO_NAME:
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+    elif hasattr(target, 'write'):
+        yield target
+    else:
+        with open(target, 'wb') as output_file:
+            yield output_file
+
+
+def write_output(target, data):
+    """Write bytes to a path, the standard output if target is STDIO_NAME, or a writable binary file object."""
+    with open_output(target) as output_file:
+        output_file.write(data)
 
 
 def get_items_from_svg_root(svg_filename):
@@ -20,8 +145,8 @@ def get_items_from_svg_root(svg_filename):
 
 
 def remove_namespace(element_tag):
-    """Remove namespace from an element tag of a svg file."""
-    return element_tag.split('}')[1]
+    """Remove namespace from an element tag of a svg file, if it has one."""
+    return element_tag.rpartition('}')[2]
 
 
 def get_svg_dimensions(svg_filename):
@@ -29,3 +154,82 @@ def get_svg_dimensions(svg_filename):
     xml_tree = element_tree.parse(svg_filename)
     root = xml_tree.getroot()
     return int(root.attrib['width']), int(root.attrib['height'])
+
+
+def stream_svg(svg_file):
+    """Parse a svg file incrementally.
+
+    The dimensions are read from the root element as soon as it is opened,
+    then the children of the root element are yielded one by one while the
+    rest of the file is still being parsed. Each child is discarded after it
+    has been consumed, so memory usage does not depend on the document size.
+
+    :param svg_file: A path to a svg file or a binary file object.
+    :return: A tuple with svg dimensions (i.e. width and height)
+             and a generator over the children of the root element.
+    :rtype: tuple
+    """
+
+    events = element_tree.iterparse(svg_file, events=('start', 'end'))
+    _, root = next(events)
+    size = int(root.attrib['width']), int(root.attrib['height'])
+    return size, iterate_root_children(events, root)
+
+
+def iterate_root_children(events, root):
+    """Yield the children of the root element from a stream of parse events.
+
+    :param events: Iterator over ('start', element) and ('end', element) parse events.
+    :param root: The root element, already opened.
+    :return: A generator of fully parsed children of the root element.
+    """
+
+    depth = 1
+    for event, element in events:
+        if event == 'start':
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth == 1:
+            yield element
+            root.clear()
+
+
+def find_child_lines(svg_file, indexes):
+    """Find where children of the root element start in a svg file.
+
+    ElementTree does not keep line numbers, so the file is scanned again with expat,
+    which is fast as nothing is built.
+
+    :param svg_file: A path to a svg file or a seekable binary file object.
+    :param indexes: Positions of children of the root element.
+    :return: Dictionary mapping each position to the line number where the child starts.
+    :rtype: dict
+    """
+
+    wanted_indexes = set(indexes)
+    lines = {}
+    state = {'depth': 0, 'index': 0}
+
+    def start_element(name, attributes):
+        state['depth'] += 1
+        if state['depth'] == 2:
+            if state['index'] in wanted_indexes:
+                lines[state['index']] = parser.CurrentLineNumber
+            state['index'] += 1
+
+    def end_element(name):
+        state['depth'] -= 1
+
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    if isinstance(svg_file, str):
+        with open(svg_file, 'rb') as file:
+            parser.ParseFile(file)
+    else:
+        svg_file.seek(0)
+        parser.ParseFile(svg_file)
+
+    return lines
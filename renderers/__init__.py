@@ -0,0 +1,10 @@
+"""
+This module contains functions used to render svg documents in other ways than the default single pass.
+
+renderers/display_list: Display lists of pre-parsed draw operations which can be replayed at any scale.
+renderers/document: Parsed svg documents with a spatial index over their elements.
+renderers/incremental: Functions used to repaint only the regions of an image changed by a new version of a document.
+renderers/region: Functions used to render a region of a document.
+renderers/striped: Functions used to render images in horizontal stripes streamed to a png file.
+renderers/tiled: Functions used to render large images as tiles on several processes.
+"""
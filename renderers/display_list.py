@@ -0,0 +1,158 @@
+import math
+from array import array
+
+import cairo
+
+from helpers import transform
+from helpers.painter import CONTAINER_SHAPES
+
+COMPILE_SCALE = 100  # pixels per svg unit of the largest scale a display list is replayed at without visible error
+
+MOVE_TO = 0
+LINE_TO = 1
+CURVE_TO = 2
+CLOSE_PATH = 3
+FILL = 4
+FILL_PRESERVE = 5
+STROKE = 6
+NUMBER_OF_OPERANDS = (2, 2, 6, 0, 3, 3, 4)
+PATH_OPS = {
+    cairo.PATH_MOVE_TO: MOVE_TO,
+    cairo.PATH_LINE_TO: LINE_TO,
+    cairo.PATH_CURVE_TO: CURVE_TO,
+    cairo.PATH_CLOSE_PATH: CLOSE_PATH
+}
+
+
+class DisplayList:
+    """Flat list of draw operations of a document, with every coordinate and color already parsed.
+
+    Operations are stored as one byte each in ops, and their operands follow each other in operands:
+    MOVE_TO x y, LINE_TO x y, CURVE_TO x1 y1 x2 y2 x3 y3, CLOSE_PATH,
+    FILL r g b, FILL_PRESERVE r g b and STROKE r g b width.
+    Coordinates are in svg units, so a display list can be replayed at any scale.
+    """
+
+    def __init__(self, size):
+        """Create an empty display list.
+
+        :param size: Size of the image (i.e. width and height).
+        """
+
+        self.size = size
+        self.ops = array('B')
+        self.operands = array('d')
+
+    def append(self, op, *operands):
+        """Add an operation and its operands at the end of the list."""
+        self.ops.append(op)
+        self.operands.extend(operands)
+
+    def add_element(self, scratch_context, shape, attributes, matrix=None):
+        """Compile the drawing of an element.
+
+        The outline of the element is built on a scratch context, so circles,
+        arcs and smooth curves are reduced to lines and cubic curves once.
+        Groups and <use> instances are expanded to their elements, with their
+        transforms applied to the outlines and to the stroke widths.
+
+        :param scratch_context: A cairo context scaled by COMPILE_SCALE.
+        :param shape: The shape module used to draw the element.
+        :param attributes: Attributes of the element.
+        :param matrix: Transform of the groups holding the element, None for no transform.
+        """
+
+        if shape.__name__ in CONTAINER_SHAPES:
+            if attributes.matrix is not None:
+                matrix = transform.multiply(matrix, attributes.matrix) if matrix is not None else attributes.matrix
+            for child_shape, child_attributes in shape.get_children(attributes):
+                self.add_element(scratch_context, child_shape, child_attributes, matrix)
+            return
+
+        fill_color = attributes.color
+        stroke_color = attributes.stroke_color
+        if fill_color is None and stroke_color is None:
+            return
+
+        # the path is kept in device space by cairo, so it is read back in svg units once the transform is undone
+        scratch_context.save()
+        if matrix is not None:
+            scratch_context.transform(cairo.Matrix(*matrix))
+        shape.add_path(scratch_context, attributes)
+        scratch_context.restore()
+        for path_type, points in scratch_context.copy_path():
+            self.append(PATH_OPS[path_type], *points)
+        scratch_context.new_path()
+
+        if fill_color is not None:
+            self.append(FILL_PRESERVE if stroke_color is not None else FILL, *fill_color)
+        if stroke_color is not None:
+            self.append(STROKE, *stroke_color, attributes.stroke_width * transform.get_scale_factor(matrix))
+
+    def replay(self, context):
+        """Draw all operations on a cairo context.
+
+        :param context: A cairo context scaled to svg units.
+        """
+
+        operands = self.operands
+        move_to, line_to, curve_to, close_path = context.move_to, context.line_to, context.curve_to, context.close_path
+        i = 0
+        for op in self.ops:
+            if op == LINE_TO:
+                line_to(operands[i], operands[i + 1])
+            elif op == MOVE_TO:
+                move_to(operands[i], operands[i + 1])
+            elif op == CURVE_TO:
+                curve_to(*operands[i:i + 6])
+            elif op == CLOSE_PATH:
+                close_path()
+            elif op == STROKE:
+                context.set_source_rgb(operands[i], operands[i + 1], operands[i + 2])
+                context.set_line_width(operands[i + 3])
+                context.stroke()
+            else:
+                context.set_source_rgb(operands[i], operands[i + 1], operands[i + 2])
+                if op == FILL:
+                    context.fill()
+                else:
+                    context.fill_preserve()
+            i += NUMBER_OF_OPERANDS[op]
+
+
+def compile_document(document):
+    """Compile the elements of a document to a display list.
+
+    :param document: A renderers.document.Document.
+    :return: The display list.
+    :rtype: DisplayList
+    """
+
+    display_list = DisplayList(document.size)
+    scratch_context = cairo.Context(cairo.ImageSurface(cairo.FORMAT_A8, 1, 1))
+    # outlines are flattened as finely as if they were drawn at COMPILE_SCALE
+    scratch_context.scale(COMPILE_SCALE, COMPILE_SCALE)
+    for shape, attributes in document.elements:
+        display_list.add_element(scratch_context, shape, attributes)
+
+    return display_list
+
+
+def render_display_list(display_list, scale):
+    """Render a display list on a new surface.
+
+    :param display_list: The display list.
+    :param scale: Number of pixels per svg unit.
+    :return: A cairo surface of the whole image.
+    :rtype: cairo.ImageSurface
+    """
+
+    width, height = display_list.size
+    surface = cairo.ImageSurface(cairo.FORMAT_RGB24, math.ceil(width * scale), math.ceil(height * scale))
+    context = cairo.Context(surface)
+    context.scale(scale, scale)
+    context.rectangle(0, 0, width, height)
+    context.fill()
+    display_list.replay(context)
+
+    return surface
@@ -0,0 +1,87 @@
+import svg
+from helpers import xml
+from helpers.painter import Painter
+from helpers.references import References
+from helpers.spatial_index import GridIndex
+
+
+class Document:
+    """Drawable elements of a svg document, indexed by their bounding boxes."""
+
+    def __init__(self, size):
+        """Create an empty document.
+
+        :param size: Size of the image (i.e. width and height).
+        """
+
+        self.size = size
+        self.elements = []
+        self.index = GridIndex(size)
+
+    def add(self, shape, attributes):
+        """Add an element on top of the others.
+
+        :param shape: The shape module used to draw the element.
+        :param attributes: Attributes of the element.
+        """
+
+        box = shape.get_bounding_box(attributes)
+        if box is not None:
+            self.elements.append((shape, attributes))
+            self.index.insert(box)
+
+    def get_box(self, element_id):
+        """Get the bounding box of the element added in position element_id."""
+        return self.index.boxes[element_id]
+
+    def query(self, region):
+        """Find the elements which may draw inside a region.
+
+        :param region: The region (min x, min y, max x, max y) in svg units.
+        :return: List of (shape module, attributes) in painting order.
+        :rtype: list
+        """
+
+        return [self.elements[element_id] for element_id in self.index.query(region)]
+
+    def draw_region(self, context, region):
+        """Repaint a region of the image, drawing only the elements that overlap it.
+
+        :param context: A cairo context scaled to svg units.
+        :param region: The region (min x, min y, max x, max y) in svg units.
+        """
+
+        x0, y0, x1, y1 = region
+        width, height = self.size
+
+        context.save()
+        context.rectangle(x0, y0, x1 - x0, y1 - y0)
+        context.clip()
+        context.set_source_rgb(0, 0, 0)
+        context.rectangle(0, 0, width, height)
+        context.fill()
+        painter = Painter(context)
+        for shape, attributes in self.query(region):
+            painter.draw(shape, attributes)
+        painter.flush()
+        context.restore()
+
+
+def load_document(svg_file):
+    """Parse all elements of a svg file and index them.
+
+    :param svg_file: A path to a svg file or a binary file object.
+    :return: The parsed document.
+    :rtype: Document
+    """
+
+    size, items = xml.stream_svg(svg_file)
+    document = Document(size)
+    references = References()
+    for item in items:
+        references.register(item)
+        parsed_item = svg.parse_item(item, size, references)
+        if parsed_item is not None:
+            document.add(*parsed_item)
+
+    return document
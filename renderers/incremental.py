@@ -0,0 +1,147 @@
+import difflib
+import math
+
+import svg
+from helpers import geometry
+
+
+def get_signature(element):
+    """Get a hashable value which two elements share only if they draw the same thing.
+
+    :param element: A tuple (shape module, attributes) of a renderers.document.Document.
+    :rtype: tuple
+    """
+
+    shape, attributes = element
+    return shape.__name__, repr(attributes)
+
+
+def find_changed_boxes(old_document, new_document):
+    """Compare two versions of a document element by element.
+
+    The elements the two versions start and end with are skipped, then the elements in
+    between are matched by difflib in painting order. Elements which are only in one
+    version, or which moved relative to the others, are reported, while unchanged elements
+    between them are not, so edits at both ends of a file only damage the edited elements.
+
+    :param old_document: The previous renderers.document.Document.
+    :param new_document: The new renderers.document.Document.
+    :return: List of the bounding boxes of changed elements, both where they were and where they are now.
+    :rtype: list
+    """
+
+    old_elements, new_elements = old_document.elements, new_document.elements
+    head = 0
+    while head < min(len(old_elements), len(new_elements)) and old_elements[head] == new_elements[head]:
+        head += 1
+
+    tail = 0
+    while (tail < min(len(old_elements), len(new_elements)) - head
+           and old_elements[-1 - tail] == new_elements[-1 - tail]):
+        tail += 1
+
+    old_signatures = [get_signature(element) for element in old_elements[head:len(old_elements) - tail]]
+    new_signatures = [get_signature(element) for element in new_elements[head:len(new_elements) - tail]]
+    # repeated elements are common in generated documents, so they must not be ignored as junk
+    matcher = difflib.SequenceMatcher(None, old_signatures, new_signatures, autojunk=False)
+    boxes = []
+    for operation, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if operation != 'equal':
+            boxes.extend(old_document.get_box(head + element_id) for element_id in range(old_start, old_end))
+            boxes.extend(new_document.get_box(head + element_id) for element_id in range(new_start, new_end))
+
+    return boxes
+
+
+def snap_to_pixels(box, size):
+    """Grow a box to whole pixels and clip it to the image.
+
+    Antialiased edges spill into the pixels around a shape, and a clip that
+    does not follow pixel boundaries would blend new pixels with old ones,
+    so damaged regions are padded by one pixel and aligned to the pixel grid.
+
+    :param box: A bounding box (min x, min y, max x, max y) in svg units.
+    :param size: Size of the image (i.e. width and height).
+    :return: The snapped box, or None if it is outside of the image.
+    :rtype: tuple
+    """
+
+    width, height = size
+    x0, y0, x1, y1 = geometry.pad_box(box, 1 / svg.PIXEL_SCALE)
+    x0 = max(math.floor(x0 * svg.PIXEL_SCALE) / svg.PIXEL_SCALE, 0)
+    y0 = max(math.floor(y0 * svg.PIXEL_SCALE) / svg.PIXEL_SCALE, 0)
+    x1 = min(math.ceil(x1 * svg.PIXEL_SCALE) / svg.PIXEL_SCALE, width)
+    y1 = min(math.ceil(y1 * svg.PIXEL_SCALE) / svg.PIXEL_SCALE, height)
+    if x0 >= x1 or y0 >= y1:
+        return None
+
+    return x0, y0, x1, y1
+
+
+def merge_boxes(boxes):
+    """Merge overlapping boxes until none of them overlap.
+
+    :param boxes: List of bounding boxes (min x, min y, max x, max y).
+    :return: List of disjoint boxes covering all the given boxes.
+    :rtype: list
+    """
+
+    merged_boxes = []
+    for box in boxes:
+        while True:
+            overlapping = [merged_box for merged_box in merged_boxes if geometry.boxes_intersect(box, merged_box)]
+            if not overlapping:
+                break
+            for merged_box in overlapping:
+                merged_boxes.remove(merged_box)
+                box = (min(box[0], merged_box[0]), min(box[1], merged_box[1]),
+                       max(box[2], merged_box[2]), max(box[3], merged_box[3]))
+        merged_boxes.append(box)
+
+    return merged_boxes
+
+
+def find_damaged_regions(old_document, new_document):
+    """Find the regions of the image which must be repainted to go from a version of a document to another.
+
+    :param old_document: The previous renderers.document.Document, or None for a first render.
+    :param new_document: The new renderers.document.Document.
+    :return: List of disjoint regions (min x, min y, max x, max y) in svg units.
+    :rtype: list
+    """
+
+    width, height = new_document.size
+    if old_document is None or old_document.size != new_document.size:
+        return [(0, 0, width, height)]
+
+    snapped_boxes = (snap_to_pixels(box, new_document.size)
+                     for box in find_changed_boxes(old_document, new_document))
+    return merge_boxes([box for box in snapped_boxes if box is not None])
+
+
+class IncrementalRenderer:
+    """Image of a document kept in memory and repainted only where the document changes."""
+
+    def __init__(self):
+        self.document = None
+        self.surface = None
+        self.context = None
+
+    def update(self, document):
+        """Repaint the image for a new version of the document.
+
+        :param document: The new renderers.document.Document.
+        :return: List of the repainted regions (min x, min y, max x, max y) in svg units.
+        :rtype: list
+        """
+
+        regions = find_damaged_regions(self.document, document)
+        if self.document is None or self.document.size != document.size:
+            self.surface = svg.init_surface(document.size)
+            self.context = svg.init_cairo_context(self.surface, document.size)
+
+        for region in regions:
+            document.draw_region(self.context, region)
+        self.document = document
+
+        return regions
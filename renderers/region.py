@@ -0,0 +1,28 @@
+import math
+
+import cairo
+
+import svg
+
+
+def render_region(document, x, y, width, height, scale=None):
+    """Render a region of a document, touching only the elements that overlap it.
+
+    :param document: A renderers.document.Document.
+    :param x: Left side of the region in svg units.
+    :param y: Top side of the region in svg units.
+    :param width: Width of the region in svg units.
+    :param height: Height of the region in svg units.
+    :param scale: Number of pixels per svg unit, defaults to svg.PIXEL_SCALE.
+    :return: A cairo surface of the region.
+    :rtype: cairo.ImageSurface
+    """
+
+    scale = svg.PIXEL_SCALE if scale is None else scale
+    surface = cairo.ImageSurface(cairo.FORMAT_RGB24, math.ceil(width * scale), math.ceil(height * scale))
+    context = cairo.Context(surface)
+    context.scale(scale, scale)
+    context.translate(-x, -y)
+    document.draw_region(context, (x, y, x + width, y + height))
+
+    return surface
@@ -0,0 +1,123 @@
+import cairo
+
+import svg
+from helpers import quality, xml
+from helpers.painter import Painter, get_runs
+from helpers.png import DEFAULT_COMPRESSION_LEVEL, PngWriter
+from helpers.references import References
+from renderers.document import Document
+
+DEFAULT_STRIPE_HEIGHT = 256
+
+
+def load_visible_elements(size, items, min_element_size=0):
+    """Parse the elements of a svg document which are drawn on the image, and index them.
+
+    Elements are kept as a single pass render draws them: only those overlapping the image
+    and not smaller than min_element_size, in painting order.
+
+    :param size: Size of the image (i.e. width and height).
+    :param items: Iterable over the children of the root element in the svg file.
+    :param min_element_size: Elements smaller than this size in svg units are not kept.
+    :return: The document of the visible elements.
+    :rtype: renderers.document.Document
+    """
+
+    document = Document(size)
+    canvas = (0, 0, size[0], size[1])
+    references = References()
+    for item in items:
+        references.register(item)
+        parsed_item = svg.parse_item(item, size, references)
+        if parsed_item is not None and svg.is_visible(*parsed_item, canvas, min_element_size):
+            document.add(*parsed_item)
+
+    return document
+
+
+def draw_stripe(context, document, runs, region):
+    """Draw the elements of a document which overlap a region.
+
+    The painter is flushed where it would be if it drew every element, so the region
+    gets the same pixels as the same rows of the whole image.
+
+    :param context: A cairo context scaled to svg units.
+    :param document: The document of the visible elements.
+    :param runs: Run number of each element of the document, as returned by helpers.painter.get_runs.
+    :param region: The region (min x, min y, max x, max y) in svg units.
+    """
+
+    painter = Painter(context)
+    run = None
+    for element_id in document.index.query(region):
+        if runs[element_id] != run:
+            painter.flush()
+            run = runs[element_id]
+        painter.draw(*document.elements[element_id])
+    painter.flush()
+
+
+def render_striped(svg_source, png_target, stripe_height=DEFAULT_STRIPE_HEIGHT,
+                   quality_profile=quality.DEFAULT_PROFILE, compression_level=DEFAULT_COMPRESSION_LEVEL,
+                   scale=svg.PIXEL_SCALE, profiler=None):
+    """Render a svg document in horizontal stripes, streaming each stripe to a png file.
+
+    Only one stripe of pixels is held in memory, so the memory used depends on the width
+    of the image and on stripe_height, not on the height of the image. The elements of
+    the document are parsed once and each stripe draws those which overlap it, on a
+    context translated by whole pixels, so the pixels are the same as a single pass render.
+
+    :param svg_source: A path to a svg file, '-' for the standard input, the content of a svg file as bytes
+           or a binary file object.
+    :param png_target: A path to the png file, '-' for the standard output or a writable binary file object.
+    :param stripe_height: Number of rows of pixels rendered at once.
+    :param quality_profile: Name of a helpers.quality profile.
+    :param compression_level: zlib compression level of the png file, from 0 (none) to 9 (smallest).
+    :param scale: Number of pixels per svg unit.
+    :param profiler: Optional helpers.profiling.Profiler, finished once the png is written. Loading the
+           elements is measured as the parse phase, drawing the stripes as the draw phase
+           and writing them as the encode phase, without times per element.
+    :raise: ValueError if svg_source is not a svg document, the quality profile does not exist
+            or stripe_height is not positive.
+    :raise: FileNotFoundError if svg_source does not exist.
+    """
+
+    if stripe_height < 1:
+        raise ValueError('Stripe height must be at least 1')
+    profile = quality.get_profile(quality_profile)
+
+    with xml.open_svg(svg_source) as svg_file:
+        size, items = xml.stream_svg(svg_file)
+        width, height = svg.get_surface_size(size, scale)
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, width, min(stripe_height, height))
+        context = cairo.Context(surface)
+        svg.prepare_cairo_context(context, size, scale)
+        quality.apply_profile(context, profile)
+        if profiler is not None:
+            with profiler.phase('parse'):
+                document = load_visible_elements(size, items, quality.get_min_element_size(context, profile))
+        else:
+            document = load_visible_elements(size, items, quality.get_min_element_size(context, profile))
+    runs = get_runs(document.elements)
+
+    with xml.open_output(png_target) as png_file:
+        writer = PngWriter(png_file, width, height, compression_level)
+        for y in range(0, height, stripe_height):
+            rows = min(stripe_height, height - y)
+            context = cairo.Context(surface)
+            context.translate(0, -y)
+            svg.prepare_cairo_context(context, size, scale)
+            quality.apply_profile(context, profile)
+            region = (0, y / scale, size[0], (y + rows) / scale)
+            if profiler is not None:
+                with profiler.phase('draw'):
+                    draw_stripe(context, document, runs, region)
+                with profiler.phase('encode'):
+                    writer.write_surface_rows(surface, rows)
+            else:
+                draw_stripe(context, document, runs, region)
+                writer.write_surface_rows(surface, rows)
+        writer.close()
+
+    if profiler is not None:
+        profiler.finish()
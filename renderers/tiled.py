@@ -0,0 +1,210 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cairo
+
+import svg
+from helpers import quality, xml
+from helpers.painter import get_runs
+from renderers.striped import draw_stripe, load_visible_elements
+
+DEFAULT_TILE_SIZE = 1024
+worker_tiled_document = None
+
+
+def load_tiled_document(svg_file, quality_profile=quality.DEFAULT_PROFILE, scale=svg.PIXEL_SCALE):
+    """Parse the elements of a svg file drawn on the image, as a single pass render keeps them.
+
+    :param svg_file: A path to a svg file.
+    :param quality_profile: Name of a helpers.quality profile.
+    :param scale: Number of pixels per svg unit.
+    :return: A tuple (document of the visible elements, run numbers of its elements, quality profile settings,
+             scale), as taken by render_tile.
+    :rtype: tuple
+    :raise: ValueError if the file is not a svg document or the quality profile does not exist.
+    """
+
+    profile = quality.get_profile(quality_profile)
+    with xml.open_svg(svg_file) as opened_file:
+        size, items = xml.stream_svg(opened_file)
+        # the smallest drawn element depends on the final transform, as in svg.render
+        context = cairo.Context(cairo.ImageSurface(cairo.FORMAT_RGB24, 1, 1))
+        context.scale(scale, scale)
+        document = load_visible_elements(size, items, quality.get_min_element_size(context, profile))
+
+    return document, get_runs(document.elements), profile, scale
+
+
+def init_worker(svg_file, quality_profile=quality.DEFAULT_PROFILE, scale=svg.PIXEL_SCALE):
+    """Parse the document once in each worker process.
+
+    :param svg_file: A path to a svg file.
+    :param quality_profile: Name of the helpers.quality profile of the tiles.
+    :param scale: Number of pixels per svg unit.
+    """
+
+    global worker_tiled_document
+    worker_tiled_document = load_tiled_document(svg_file, quality_profile, scale)
+
+
+def split_in_tiles(surface_size, tile_size):
+    """Split a surface in tiles.
+
+    :param surface_size: Width and height of the surface in pixels.
+    :param tile_size: Largest width and height of a tile in pixels.
+    :return: List of tiles (x, y, width, height) in pixels.
+    :rtype: list
+    """
+
+    surface_width, surface_height = surface_size
+    return [(x, y, min(tile_size, surface_width - x), min(tile_size, surface_height - y))
+            for y in range(0, surface_height, tile_size)
+            for x in range(0, surface_width, tile_size)]
+
+
+def render_tile(tile, tiled_document=None):
+    """Render one tile of the document.
+
+    The context is translated by whole pixels so that the top left corner of the tile
+    becomes the origin, and only the elements that overlap the tile are drawn. Runs of
+    elements are flushed where a single pass render flushes them, so elements crossing
+    the border of a tile get the same pixels on both sides.
+
+    :param tile: A tuple (x, y, width, height) in pixels.
+    :param tiled_document: The document as returned by load_tiled_document, defaults to the one loaded by the worker.
+    :return: A tuple (tile, stride, pixels of the tile).
+    :rtype: tuple
+    """
+
+    document, runs, profile, scale = tiled_document or worker_tiled_document
+    x, y, width, height = tile
+
+    surface = cairo.ImageSurface(cairo.FORMAT_RGB24, width, height)
+    context = cairo.Context(surface)
+    context.translate(-x, -y)
+    svg.prepare_cairo_context(context, document.size, scale)
+    quality.apply_profile(context, profile)
+    region = tuple(coordinate / scale for coordinate in (x, y, x + width, y + height))
+    draw_stripe(context, document, runs, region)
+
+    surface.flush()
+    return tile, surface.get_stride(), bytes(surface.get_data())
+
+
+def paste_tile(surface, tile, tile_stride, tile_data):
+    """Copy the pixels of a tile into the final surface.
+
+    :param surface: The final cairo surface.
+    :param tile: A tuple (x, y, width, height) in pixels.
+    :param tile_stride: Number of bytes of a row of the tile.
+    :param tile_data: Pixels of the tile.
+    """
+
+    x, y, width, height = tile
+    stride = surface.get_stride()
+    data = surface.get_data()
+    row_bytes = width * 4
+    for row in range(height):
+        start = (y + row) * stride + x * 4
+        tile_start = row * tile_stride
+        data[start:start + row_bytes] = tile_data[tile_start:tile_start + row_bytes]
+
+
+def render_tiled(svg_file, tile_size=DEFAULT_TILE_SIZE, workers=None, quality_profile=quality.DEFAULT_PROFILE,
+                 scale=svg.PIXEL_SCALE, profiler=None):
+    """Render a svg file tile by tile on several processes and stitch the tiles together.
+
+    The pixels are the same as those of svg.render with the same quality profile and scale.
+
+    :param svg_file: A path to a svg file.
+    :param tile_size: Largest width and height of a tile in pixels.
+    :param workers: Number of worker processes, defaults to the number of processors.
+           With 1 worker the tiles are rendered in this process.
+    :param quality_profile: Name of a helpers.quality profile.
+    :param scale: Number of pixels per svg unit.
+    :param profiler: Optional helpers.profiling.Profiler measuring the parse and draw phases.
+           Elements are not measured one by one, and with several workers, the draw phase
+           includes the parsing done by each worker.
+    :return: The cairo surface holding the drawing.
+    :rtype: cairo.ImageSurface
+    :raise: ValueError if the file is not a svg document or the quality profile does not exist.
+    :raise: FileNotFoundError if the file does not exist.
+    """
+
+    quality.get_profile(quality_profile)
+    workers = workers or os.cpu_count() or 1
+    with xml.open_svg(svg_file) as opened_file:
+        size, _ = xml.stream_svg(opened_file)
+    surface = svg.init_surface(size, scale)
+    tiles = split_in_tiles(svg.get_surface_size(size, scale), tile_size)
+
+    surface.flush()
+    if workers == 1:
+        if profiler is not None:
+            with profiler.phase('parse'):
+                tiled_document = load_tiled_document(svg_file, quality_profile, scale)
+        else:
+            tiled_document = load_tiled_document(svg_file, quality_profile, scale)
+        rendered_tiles = (render_tile(tile, tiled_document) for tile in tiles)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                       initargs=(svg_file, quality_profile, scale))
+        rendered_tiles = executor.map(render_tile, tiles)
+
+    try:
+        if profiler is not None:
+            rendered_tiles = profiler.time_iterator('draw', rendered_tiles)
+        for rendered_tile in rendered_tiles:
+            paste_tile(surface, *rendered_tile)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    surface.mark_dirty()
+
+    return surface
+
+
+def convert_tiled(svg_file, png_target, tile_size=DEFAULT_TILE_SIZE, workers=None, cache=None,
+                  quality_profile=quality.DEFAULT_PROFILE, profiler=None, scale=svg.PIXEL_SCALE):
+    """Convert a svg file to a png image rendered in tiles, as svg.convert does in a single pass.
+
+    :param svg_file: A path to a svg file.
+    :param png_target: A path to the png file, '-' for the standard output or a writable binary file object.
+    :param tile_size: Largest width and height of a tile in pixels.
+    :param workers: Number of worker processes, defaults to the number of processors.
+    :param cache: Optional helpers.render_cache.RenderCache holding previous renders. Tiled and single
+           pass renders give the same pixels, so they share their entries.
+    :param quality_profile: Name of a helpers.quality profile.
+    :param profiler: Optional helpers.profiling.Profiler, finished once the png is written.
+           A render found in the cache only has its cache phase.
+    :param scale: Number of pixels per svg unit.
+    :raise: ValueError if the file is not a svg document or the quality profile does not exist.
+    :raise: FileNotFoundError if the file does not exist.
+    """
+
+    key = None
+    if cache is not None:
+        with xml.open_svg(svg_file) as opened_file:
+            key = svg.get_cache_key(cache, opened_file.read(), quality_profile, scale)
+        if profiler is not None:
+            with profiler.phase('cache'):
+                png_data = cache.get(key)
+        else:
+            png_data = cache.get(key)
+        if png_data is not None:
+            xml.write_output(png_target, png_data)
+            if profiler is not None:
+                profiler.finish()
+            return
+
+    surface = render_tiled(svg_file, tile_size, workers, quality_profile, scale, profiler)
+    png_file = io.BytesIO()
+    svg.draw_image(png_file, surface, profiler)
+    xml.write_output(png_target, png_file.getvalue())
+    if cache is not None:
+        cache.put(key, png_file.getvalue())
+
+    if profiler is not None:
+        profiler.finish(svg_file)
@@ -0,0 +1,349 @@
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import svg
+from helpers import cost, quality, xml
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_MAX_REQUEST_BYTES = 10 * 2 ** 20
+DEFAULT_TIMEOUT = 30
+RENDER_PATH = '/render'
+HEALTH_PATH = '/health'
+STATS_PATH = '/stats'
+worker_pool = None
+
+
+def warm_up_worker():
+    """Import cairo and every shape module, so the first request of a worker does not pay for it,
+    and create the pool of surfaces reused by the requests of the worker.
+    """
+
+    global worker_pool
+    from helpers.surface_pool import SurfacePool
+
+    for item_tag in svg.SHAPE_MODULES:
+        svg.get_shape_module(item_tag)
+    if worker_pool is None:
+        worker_pool = SurfacePool()
+
+
+class Deadline:
+    """Event set once a point in time is reached, checked by svg.render before each element like a cancel event."""
+
+    def __init__(self, end_time):
+        """Create a deadline.
+
+        :param end_time: The point in time, as returned by time.time, which is shared by all processes.
+        """
+
+        self.end_time = end_time
+
+    def is_set(self):
+        return time.time() >= self.end_time
+
+
+def render_svg_data(svg_data, quality_profile=quality.DEFAULT_PROFILE, scale=svg.PIXEL_SCALE, end_time=None):
+    """Convert svg bytes to png bytes.
+
+    :param svg_data: Content of a svg file.
+    :param quality_profile: Name of a helpers.quality profile.
+    :param scale: Number of pixels per svg unit.
+    :param end_time: Optional point in time, as returned by time.time, after which no more element is drawn,
+           so the worker is freed soon after the client stops waiting.
+    :return: Content of the png file.
+    :rtype: bytes
+    :raise: TimeoutError if the render is stopped at end_time.
+    """
+
+    cancel_event = Deadline(end_time) if end_time is not None else None
+    try:
+        return svg.render_png(svg_data, worker_pool, quality_profile, cancel_event=cancel_event, scale=scale)
+    except CancelledError:
+        raise TimeoutError('Render timed out') from None
+
+
+class RenderService:
+    """Pool of warm worker processes with a bounded queue of pending renders."""
+
+    def __init__(self, workers, queue_size=DEFAULT_QUEUE_SIZE, timeout=DEFAULT_TIMEOUT, cache=None, limits=None,
+                 over_limit='downgrade'):
+        """Start the worker processes.
+
+        :param workers: Number of worker processes.
+        :param queue_size: Number of renders which can wait for a free worker.
+        :param timeout: Number of seconds a client waits for its render.
+        :param cache: Optional helpers.render_cache.RenderCache, checked before sending a render to a worker.
+        :param limits: Optional dictionary of helpers.cost limits, checked before sending a render to a worker.
+        :param over_limit: One of helpers.cost.OVER_LIMIT_POLICIES, for renders over the limits.
+        """
+
+        self.workers = workers
+        self.timeout = timeout
+        self.cache = cache
+        self.limits = limits
+        self.over_limit = over_limit
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.executor_lock = threading.Lock()
+        self.executor = self.start_executor()
+
+    def start_executor(self):
+        """Start warm worker processes.
+
+        :return: The executor running renders on the worker processes.
+        :rtype: concurrent.futures.ProcessPoolExecutor
+        """
+
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_up_worker)
+        executor.submit(warm_up_worker).result()
+        return executor
+
+    def replace_executor(self, broken_executor):
+        """Start new worker processes once a worker of an executor died, which breaks the whole executor.
+
+        Every render running on the broken executor fails, so only the first one to notice replaces it.
+
+        :param broken_executor: The executor whose worker died.
+        :return: The executor which replaces it.
+        :rtype: concurrent.futures.ProcessPoolExecutor
+        """
+
+        with self.executor_lock:
+            if self.executor is broken_executor:
+                self.executor = self.start_executor()
+                broken_executor.shutdown(wait=False)
+            return self.executor
+
+    def submit(self, svg_data, quality_profile, scale):
+        """Send a render to a worker process, on new worker processes if a worker died since the last render.
+
+        :param svg_data: Content of a svg file.
+        :param quality_profile: Name of a helpers.quality profile.
+        :param scale: Number of pixels per svg unit.
+        :return: A tuple (executor running the render, future of the render).
+        :rtype: tuple
+        """
+
+        # the worker stops drawing when the client stops waiting, as it may have waited in the queue
+        arguments = (render_svg_data, svg_data, quality_profile, scale, time.time() + self.timeout)
+        executor = self.executor
+        try:
+            return executor, executor.submit(*arguments)
+        except BrokenProcessPool:
+            executor = self.replace_executor(executor)
+            return executor, executor.submit(*arguments)
+
+    def render(self, svg_data):
+        """Render svg bytes on a worker process.
+
+        :param svg_data: Content of a svg file.
+        :return: Content of the png file, or None if all workers and queue slots are taken.
+        :rtype: bytes
+        :raise: TimeoutError if the render takes longer than the timeout, the worker then stops drawing.
+        :raise: concurrent.futures.process.BrokenProcessPool if the worker died during the render,
+                it is replaced for the next renders.
+        :raise: helpers.cost.CostLimitExceeded if the estimated cost of the render exceeds the limits.
+        :raise: ValueError if the content is not a svg document.
+        """
+
+        xml.check_svg_content(svg_data[:xml.SNIFF_BYTES])
+        scale, quality_profile = svg.PIXEL_SCALE, quality.DEFAULT_PROFILE
+        if self.limits is not None:
+            # the document is only tokenized here, so expensive renders are refused before taking a worker
+            plan = cost.plan_render(cost.scan_document(svg_data), self.limits, scale, quality_profile, self.over_limit)
+            if plan['action'] == 'reject':
+                raise cost.CostLimitExceeded(plan)
+            scale, quality_profile = plan['scale'], plan['quality_profile']
+
+        if self.cache is not None:
+            key = svg.get_cache_key(self.cache, svg_data, quality_profile, scale)
+            png_data = self.cache.get(key)
+            if png_data is not None:
+                return png_data
+
+        if not self.slots.acquire(blocking=False):
+            return None
+
+        # the slot is freed when the render ends, even if the client stopped waiting for it
+        try:
+            executor, future = self.submit(svg_data, quality_profile, scale)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        try:
+            png_data = future.result(timeout=self.timeout)
+        except BrokenProcessPool:
+            self.replace_executor(executor)
+            raise
+
+        if self.cache is not None:
+            self.cache.put(key, png_data)
+        return png_data
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        self.executor.shutdown(cancel_futures=True)
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """Handle POST /render requests, whose body is a svg file and whose response is a png file."""
+
+    def do_GET(self):
+        if self.path == HEALTH_PATH:
+            self.send_body(200, b'ok', 'text/plain')
+        elif self.path == STATS_PATH and self.server.service.cache is not None:
+            self.send_body(200, json.dumps(self.server.service.cache.stats()).encode(), 'application/json')
+        else:
+            self.send_body(404, b'Not found', 'text/plain')
+
+    def do_POST(self):
+        if self.path != RENDER_PATH:
+            self.send_body(404, b'Not found', 'text/plain')
+            return
+
+        length = self.headers.get('Content-Length')
+        if length is None or not length.isdigit():
+            self.send_body(411, b'Content-Length required', 'text/plain')
+            return
+        if int(length) > self.server.max_request_bytes:
+            self.send_body(413, b'Svg file too large', 'text/plain')
+            return
+
+        svg_data = self.rfile.read(int(length))
+        try:
+            png_data = self.server.service.render(svg_data)
+        except TimeoutError:
+            self.send_body(504, b'Render timed out', 'text/plain')
+        except BrokenProcessPool:
+            self.send_body(500, b'Render worker stopped', 'text/plain')
+        except cost.CostLimitExceeded as error:
+            self.send_body(413, str(error).encode(), 'text/plain')
+        except (ValueError, KeyError, SyntaxError):
+            self.send_body(400, b'Invalid file. Should be a svg', 'text/plain')
+        except Exception as error:
+            self.send_body(500, str(error).encode(), 'text/plain')
+        else:
+            if png_data is None:
+                self.send_body(503, b'Server busy', 'text/plain', {'Retry-After': '1'})
+            else:
+                self.send_body(200, png_data, 'image/png')
+
+    def send_body(self, status, body, content_type, headers=None):
+        """Send a complete response.
+
+        :param status: HTTP status code.
+        :param body: Content of the response.
+        :param content_type: Media type of body.
+        :param headers: Optional dictionary of extra headers.
+        """
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # clients of a unix socket have no address
+        return self.client_address[0] if self.client_address else 'unix'
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server listening on a unix socket."""
+
+    daemon_threads = True
+
+
+def create_server(arguments, service):
+    """Create the HTTP server described by the command line arguments.
+
+    :param arguments: The parsed command line arguments.
+    :param service: The render service used by request handlers.
+    :return: The HTTP server.
+    :rtype: socketserver.BaseServer
+    """
+
+    if arguments.socket is not None:
+        if os.path.exists(arguments.socket):
+            os.remove(arguments.socket)
+        http_server = UnixHTTPServer(arguments.socket, RenderRequestHandler)
+    else:
+        http_server = ThreadingHTTPServer((arguments.host, arguments.port), RenderRequestHandler)
+
+    http_server.service = service
+    http_server.max_request_bytes = arguments.max_request_bytes
+    return http_server
+
+
+def parse_arguments(argv):
+    """Parse the arguments received from command line.
+
+    :param argv: The list of arguments received from command line.
+    :return: The parsed arguments.
+    :rtype: argparse.Namespace
+    """
+
+    parser = argparse.ArgumentParser(prog='server.py', description='Serve svg to png conversions over HTTP.')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='port to listen on (default: %(default)s)')
+    parser.add_argument('--socket', help='listen on this unix socket instead of a TCP port')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='number of worker processes (default: %(default)s)')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help='number of requests waiting for a worker before new ones are refused '
+                             '(default: %(default)s)')
+    parser.add_argument('--max-request-bytes', type=int, default=DEFAULT_MAX_REQUEST_BYTES,
+                        help='largest accepted svg file (default: %(default)s)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help='seconds before a render request times out (default: %(default)s)')
+    parser.add_argument('--cache-dir', help='directory of a cache of previous renders')
+    parser.add_argument('--cache-size', type=int, help='maximum size of the cache in bytes (default: 1 GiB)')
+    parser.add_argument('--max-pixels', type=int, help='largest number of pixels of an image')
+    parser.add_argument('--max-memory', type=int, metavar='BYTES', help='largest estimated memory of a render')
+    parser.add_argument('--max-seconds', type=float, help='largest estimated time of a render')
+    parser.add_argument('--over-limit', choices=cost.OVER_LIMIT_POLICIES, default='downgrade',
+                        help='refuse renders over the limits, or render them at a lower quality or scale '
+                             '(default: %(default)s)')
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    """Run the render server until it is interrupted.
+
+    :param argv: The list of arguments received from command line.
+    """
+
+    arguments = parse_arguments(argv)
+    cache = None
+    if arguments.cache_dir is not None:
+        from helpers import render_cache
+
+        cache = render_cache.RenderCache(arguments.cache_dir, arguments.cache_size or render_cache.DEFAULT_MAX_BYTES)
+
+    limits = svg.get_limits(arguments)
+    service = RenderService(arguments.workers, arguments.queue_size, arguments.timeout, cache, limits or None,
+                            arguments.over_limit)
+    http_server = create_server(arguments, service)
+    try:
+        http_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http_server.server_close()
+        service.shutdown()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
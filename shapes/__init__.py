@@ -7,4 +7,6 @@ shapes/ellipse: Functions used to draw svg ellipses.
 shapes/line: Functions used to draw svg lines.
 shapes/polyline: Functions used to draw svg polyline.
 shapes/path: Functions used to draw svg paths.
+shapes/group: Functions used to draw svg groups and <use> instances.
+shapes/records: Slotted records holding the attributes needed to draw each shape.
 """
@@ -1,54 +1,79 @@
 import math
 
-from helpers import colors
+from helpers import colors, geometry
+from shapes import records
 
 DEFAULT_COLOR = (0, 0, 0)  # black
 
 
-def get_attributes(svg_attributes):
+def get_attributes(svg_attributes, size):
     """Update the circle element attributes in order to draw it.
 
     :param svg_attributes: Attributes of a circle svg item.
+    :param size: Size of image, only needed by rectangles.
     :return: Attributes of circle element.
-    :rtype: dict
+    :rtype: shapes.records.Circle
     """
 
-    attributes = {
-        'cx': float(svg_attributes['cx']) if 'cx' in svg_attributes else 0,
-        'cy': float(svg_attributes['cy']) if 'cy' in svg_attributes else 0,
-        'radius': float(svg_attributes['r'])
-    }
+    cx = float(svg_attributes['cx']) if 'cx' in svg_attributes else 0
+    cy = float(svg_attributes['cy']) if 'cy' in svg_attributes else 0
+    radius = float(svg_attributes['r'])
 
+    color = DEFAULT_COLOR
     if 'fill' in svg_attributes:
-        if svg_attributes['fill'] != 'none':
-            attributes['color'] = colors.convert_color_to_rgb(svg_attributes['fill'])
-    else:
-        attributes['color'] = DEFAULT_COLOR
+        color = colors.convert_color_to_rgb(svg_attributes['fill']) if svg_attributes['fill'] != 'none' else None
 
+    stroke_color, stroke_width = None, 1
     if 'stroke' in svg_attributes and svg_attributes['stroke'] != 'none':
-        attributes['stroke_color'] = colors.convert_color_to_rgb(svg_attributes['stroke'])
-        attributes['stroke_width'] = float(svg_attributes['stroke-width']) if 'stroke-width' in svg_attributes else 1
+        stroke_color = colors.convert_color_to_rgb(svg_attributes['stroke'])
+        stroke_width = float(svg_attributes['stroke-width']) if 'stroke-width' in svg_attributes else 1
 
-    return attributes
+    return records.Circle(cx, cy, radius, color, stroke_color, stroke_width)
+
+
+def get_bounding_box(attributes):
+    """Get the bounding box of a circle, including its stroke.
+
+    :param attributes: A shapes.records.Circle with the attributes of the circle (e.g. center point, radius).
+    :return: The bounding box (min x, min y, max x, max y).
+    :rtype: tuple
+    """
+
+    radius = attributes.radius + geometry.get_stroke_padding(attributes)
+    return attributes.cx - radius, attributes.cy - radius, attributes.cx + radius, attributes.cy + radius
+
+
+def add_path(context, attributes):
+    """Add the outline of a circle to the current path of cairo context.
+
+    :param context: The cairo context.
+    :param attributes: A shapes.records.Circle with the attributes of the circle (e.g. center point, radius).
+    """
+
+    context.new_sub_path()
+    context.arc(attributes.cx, attributes.cy, attributes.radius, 0, 2 * math.pi)
 
 
 def draw(context, attributes):
     """Draw a circle on cairo context.
 
     :param context: The cairo context.
-    :param attributes: A dictionary which contains specific attributes of circle (e.g. center point, radius).
+    :param attributes: A shapes.records.Circle with the attributes of the circle (e.g. center point, radius).
     """
 
-    context.arc(attributes['cx'], attributes['cy'], attributes['radius'], 0, 2 * math.pi)
+    add_path(context, attributes)
 
-    if 'color' in attributes:
-        context.set_source_rgb(*attributes['color'])
-        if 'stroke_color' in attributes:
+    if attributes.color is not None:
+        context.set_source_rgb(*attributes.color)
+        if attributes.stroke_color is not None:
             context.fill_preserve()
         else:
             context.fill()
 
-    if 'stroke_color' in attributes:
-        context.set_source_rgb(*attributes['stroke_color'])
-        context.set_line_width(attributes['stroke_width'])
+    if attributes.stroke_color is not None:
+        context.set_source_rgb(*attributes.stroke_color)
+        context.set_line_width(attributes.stroke_width)
         context.stroke()
+
+    if attributes.color is None and attributes.stroke_color is None:
+        context.new_path()
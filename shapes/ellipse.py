@@ -1,60 +1,85 @@
 import math
 
-from helpers import colors
+from helpers import colors, geometry
+from shapes import records
 
 DEFAULT_COLOR = (0, 0, 0)  # black
 
 
-def get_attributes(svg_attributes):
+def get_attributes(svg_attributes, size):
     """Update the ellipse element attributes in order to draw it.
 
     :param svg_attributes: Attributes of an ellipse svg item.
+    :param size: Size of image, only needed by rectangles.
     :return: Attributes of ellipse element.
-    :rtype: dict
+    :rtype: shapes.records.Ellipse
     """
 
-    attributes = {
-        'cx': float(svg_attributes['cx']) if 'cx' in svg_attributes else 0,
-        'cy': float(svg_attributes['cy']) if 'cy' in svg_attributes else 0,
-        'rx': float(svg_attributes['rx']),
-        'ry': float(svg_attributes['ry'])
-    }
+    cx = float(svg_attributes['cx']) if 'cx' in svg_attributes else 0
+    cy = float(svg_attributes['cy']) if 'cy' in svg_attributes else 0
+    rx = float(svg_attributes['rx'])
+    ry = float(svg_attributes['ry'])
 
+    color = DEFAULT_COLOR
     if 'fill' in svg_attributes:
-        if svg_attributes['fill'] != 'none':
-            attributes['color'] = colors.convert_color_to_rgb(svg_attributes['fill'])
-    else:
-        attributes['color'] = DEFAULT_COLOR
+        color = colors.convert_color_to_rgb(svg_attributes['fill']) if svg_attributes['fill'] != 'none' else None
 
+    stroke_color, stroke_width = None, 1
     if 'stroke' in svg_attributes and svg_attributes['stroke'] != 'none':
-        attributes['stroke_color'] = colors.convert_color_to_rgb(svg_attributes['stroke'])
-        attributes['stroke_width'] = float(svg_attributes['stroke-width']) if 'stroke-width' in svg_attributes else 1
+        stroke_color = colors.convert_color_to_rgb(svg_attributes['stroke'])
+        stroke_width = float(svg_attributes['stroke-width']) if 'stroke-width' in svg_attributes else 1
 
-    return attributes
+    return records.Ellipse(cx, cy, rx, ry, color, stroke_color, stroke_width)
 
 
-def draw(context, attributes):
-    """Draw an ellipse on cairo context.
+def get_bounding_box(attributes):
+    """Get the bounding box of an ellipse, including its stroke.
+
+    :param attributes: A shapes.records.Ellipse with the attributes of the ellipse (e.g. center point, radius).
+    :return: The bounding box (min x, min y, max x, max y).
+    :rtype: tuple
+    """
+
+    box = (attributes.cx - attributes.rx, attributes.cy - attributes.ry,
+           attributes.cx + attributes.rx, attributes.cy + attributes.ry)
+    return geometry.pad_box(box, geometry.get_stroke_padding(attributes))
+
+
+def add_path(context, attributes):
+    """Add the outline of an ellipse to the current path of cairo context.
 
     :param context: The cairo context.
-    :param attributes: A dictionary which contains specific attributes of ellipse (e.g. center point, radius).
+    :param attributes: A shapes.records.Ellipse with the attributes of the ellipse (e.g. center point, radius).
     """
 
     context.save()
-    context.translate(attributes['cx'], attributes['cy'])
-    context.scale(attributes['rx'], attributes['ry'])
+    context.translate(attributes.cx, attributes.cy)
+    context.scale(attributes.rx, attributes.ry)
+    context.new_sub_path()
     context.arc(0.0, 0.0, 1.0, 0.0, 2 * math.pi)
+    context.restore()
 
-    if 'color' in attributes:
-        context.set_source_rgb(*attributes['color'])
-        if 'stroke_color' in attributes:
+
+def draw(context, attributes):
+    """Draw an ellipse on cairo context.
+
+    :param context: The cairo context.
+    :param attributes: A shapes.records.Ellipse with the attributes of the ellipse (e.g. center point, radius).
+    """
+
+    add_path(context, attributes)
+
+    if attributes.color is not None:
+        context.set_source_rgb(*attributes.color)
+        if attributes.stroke_color is not None:
             context.fill_preserve()
         else:
             context.fill()
 
-    context.restore()
-
-    if 'stroke_color' in attributes:
-        context.set_source_rgb(*attributes['stroke_color'])
-        context.set_line_width(attributes['stroke_width'])
+    if attributes.stroke_color is not None:
+        context.set_source_rgb(*attributes.stroke_color)
+        context.set_line_width(attributes.stroke_width)
         context.stroke()
+
+    if attributes.color is None and attributes.stroke_color is None:
+        context.new_path()
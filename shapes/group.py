@@ -0,0 +1,143 @@
+import math
+
+from helpers import geometry, transform
+from helpers.painter import Painter
+from shapes import records
+
+
+def get_children_box(children):
+    """Get the bounding box of a list of elements.
+
+    :param children: List of (shape module, attributes).
+    :return: The bounding box (min x, min y, max x, max y), or None if no element draws anything.
+    :rtype: tuple
+    """
+
+    boxes = [box for box in (shape.get_bounding_box(attributes) for shape, attributes in children) if box is not None]
+    if not boxes:
+        return None
+
+    return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes))
+
+
+def get_group_attributes(children, matrix):
+    """Build the attributes of a group.
+
+    :param children: List of (shape module, attributes) of the children of the group.
+    :param matrix: The transform of the group, None for no transform.
+    :rtype: shapes.records.Group
+    """
+
+    box = get_children_box(children)
+    return records.Group(children, matrix, transform.transform_box(box, matrix) if box is not None else None)
+
+
+def get_use_attributes(definition, matrix):
+    """Build the attributes of an instance of a definition.
+
+    :param definition: A helpers.references.Definition.
+    :param matrix: The transform of the <use> element, including its x and y offset.
+    :rtype: shapes.records.Use
+    """
+
+    box = definition.box
+    return records.Use(definition, matrix, transform.transform_box(box, matrix) if box is not None else None)
+
+
+def get_children(attributes):
+    """Get the elements drawn by a group or an instance, as a list of (shape module, attributes)."""
+    if isinstance(attributes, records.Use):
+        return attributes.definition.children
+
+    return attributes.children
+
+
+def get_bounding_box(attributes):
+    """Get the bounding box of a group or an instance, including the strokes of its elements.
+
+    :param attributes: A shapes.records.Group or shapes.records.Use.
+    :return: The bounding box (min x, min y, max x, max y) or None if nothing is drawn.
+    :rtype: tuple
+    """
+
+    return attributes.box
+
+
+def add_path(context, attributes):
+    """Add the outlines of the elements of a group or an instance to the current path of cairo context.
+
+    :param context: The cairo context.
+    :param attributes: A shapes.records.Group or shapes.records.Use.
+    """
+
+    import cairo
+
+    context.save()
+    if attributes.matrix is not None:
+        context.transform(cairo.Matrix(*attributes.matrix))
+    for shape, child_attributes in get_children(attributes):
+        shape.add_path(context, child_attributes)
+    context.restore()
+
+
+def draw_children(context, children):
+    """Draw a list of (shape module, attributes) with a helpers.painter.Painter."""
+    painter = Painter(context)
+    for shape, attributes in children:
+        painter.draw(shape, attributes)
+    painter.flush()
+
+
+def get_recording(context, definition):
+    """Get the recording of the drawing of a definition, drawing it on first use.
+
+    :param context: The cairo context the definition will be replayed on,
+           whose tolerance and antialiasing mode are used for the recording.
+    :param definition: A helpers.references.Definition.
+    :return: The recording surface.
+    :rtype: cairo.RecordingSurface
+    """
+
+    if definition.recording is not None:
+        definition.cached_instances += 1
+        return definition.recording
+
+    import cairo
+
+    recording = cairo.RecordingSurface(cairo.CONTENT_COLOR_ALPHA, None)
+    recording_context = cairo.Context(recording)
+    recording_context.set_tolerance(context.get_tolerance())
+    recording_context.set_antialias(context.get_antialias())
+    draw_children(recording_context, definition.children)
+    definition.recording = recording
+    return recording
+
+
+def draw(context, attributes):
+    """Draw a group or an instance on cairo context.
+
+    The elements of a group are drawn one by one, an instance replays the recording of its definition.
+
+    :param context: The cairo context.
+    :param attributes: A shapes.records.Group or shapes.records.Use.
+    """
+
+    import cairo
+
+    context.save()
+    if attributes.matrix is not None:
+        context.transform(cairo.Matrix(*attributes.matrix))
+    if isinstance(attributes, records.Use):
+        definition = attributes.definition
+        definition.instances += 1
+        # the fill is limited to the content, so the unbounded recording is not composited on the whole surface,
+        # and padded by a pixel so antialiased edges of the content are not faded again by the edges of the fill
+        padding = math.hypot(*context.device_to_user_distance(1, 1))
+        x0, y0, x1, y1 = geometry.pad_box(definition.box, padding)
+        context.set_source_surface(get_recording(context, definition), 0, 0)
+        context.rectangle(x0, y0, x1 - x0, y1 - y0)
+        context.fill()
+    else:
+        draw_children(context, attributes.children)
+    context.restore()
@@ -1,41 +1,66 @@
-from helpers import colors
+from helpers import colors, geometry
+from shapes import records
 
 DEFAULT_COLOR = (0, 0, 0)  # black
 
 
-def get_attributes(svg_attributes):
+def get_attributes(svg_attributes, size):
     """Update the line element attributes in order to draw it.
 
     :param svg_attributes: Attributes of a line svg item.
+    :param size: Size of image, only needed by rectangles.
     :return: Attributes of line element.
-    :rtype: dict
+    :rtype: shapes.records.Line
     """
 
-    attributes = {
-        'x1': float(svg_attributes['x1']) if 'x1' in svg_attributes else 0,
-        'y1': float(svg_attributes['y1']) if 'y1' in svg_attributes else 0,
-        'x2': float(svg_attributes['x2']) if 'x2' in svg_attributes else 0,
-        'y2': float(svg_attributes['y2']) if 'y2' in svg_attributes else 0
-    }
+    x1 = float(svg_attributes['x1']) if 'x1' in svg_attributes else 0
+    y1 = float(svg_attributes['y1']) if 'y1' in svg_attributes else 0
+    x2 = float(svg_attributes['x2']) if 'x2' in svg_attributes else 0
+    y2 = float(svg_attributes['y2']) if 'y2' in svg_attributes else 0
 
+    stroke_color, stroke_width = None, 1
     if 'stroke' in svg_attributes and svg_attributes['stroke'] != 'none':
-        attributes['stroke_color'] = colors.convert_color_to_rgb(svg_attributes['stroke'])
-        attributes['stroke_width'] = float(svg_attributes['stroke-width']) if 'stroke-width' in svg_attributes else 1
+        stroke_color = colors.convert_color_to_rgb(svg_attributes['stroke'])
+        stroke_width = float(svg_attributes['stroke-width']) if 'stroke-width' in svg_attributes else 1
 
-    return attributes
+    return records.Line(x1, y1, x2, y2, None, stroke_color, stroke_width)
+
+
+def get_bounding_box(attributes):
+    """Get the bounding box of a line, including its stroke.
+
+    :param attributes: A shapes.records.Line with the attributes of the line (e.g. start, end).
+    :return: The bounding box (min x, min y, max x, max y).
+    :rtype: tuple
+    """
+
+    box = geometry.get_points_box((attributes.x1, attributes.x2), (attributes.y1, attributes.y2))
+    return geometry.pad_box(box, geometry.get_stroke_padding(attributes))
+
+
+def add_path(context, attributes):
+    """Add a line to the current path of cairo context.
+
+    :param context: The cairo context.
+    :param attributes: A shapes.records.Line with the attributes of the line (e.g. start, end).
+    """
+
+    context.move_to(attributes.x1, attributes.y1)
+    context.line_to(attributes.x2, attributes.y2)
 
 
 def draw(context, attributes):
     """Draw a line on cairo context.
 
     :param context: The cairo context.
-    :param attributes: A dictionary which contains specific attributes of line (e.g. start, end).
+    :param attributes: A shapes.records.Line with the attributes of the line (e.g. start, end).
     """
 
-    context.move_to(attributes['x1'], attributes['y1'])
-    context.line_to(attributes['x2'], attributes['y2'])
+    add_path(context, attributes)
 
-    if 'stroke_color' in attributes:
-        context.set_source_rgb(*attributes['stroke_color'])
-        context.set_line_width(attributes['stroke_width'])
+    if attributes.stroke_color is not None:
+        context.set_source_rgb(*attributes.stroke_color)
+        context.set_line_width(attributes.stroke_width)
         context.stroke()
+    else:
+        context.new_path()
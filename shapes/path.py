@@ -1,139 +1,168 @@
 import math
+import re
 
-from helpers import colors
+from helpers import colors, geometry
+from helpers.path_cache import PathCache
+from shapes import records
 
 DEFAULT_COLOR = (0, 0, 0)  # black
 LINE_COMMANDS = ('m', 'M', 'l', 'L', 'h', 'H', 'v', 'V', 'z', 'Z')
 CURVE_COMMANDS = ('c', 'C', 's', 'S', 'q', 'Q', 't', 'T')
 ARC_COMMANDS = ('a', 'A')
-last_t_control_point = ()
-
-
-def insert_space_between_command_and_args(commands):
-    """Insert spaces between commands and arguments.
-
-    :param commands: A string of available commands for a path svg element.
-    :return: The same string with spaces between command name and args.
-    :rtype: string
-    """
-
-    formatted_commands = ''
-    length_of_commands = len(commands)
-    for i in range(length_of_commands):
-        if i > 0 and (commands[i].isdigit() or commands[i] == '-') and commands[i - 1].isalpha():
-            formatted_commands += ' '
-        formatted_commands += commands[i]
-
-    return formatted_commands
-
-
-def separate_commands(commands):
-    """Separate string of path commands into a list.
-
-    :param commands: A string of path commands.
-    :return: A list where each element is a string with a specific path command.
-    :rtype: list
-    """
-
-    start_index = 0
-    length_of_commands = len(commands)
-    separated_commands = []
-    for i in range(length_of_commands):
-        if i > 0 and commands[i].isalpha():
-            separated_commands.append(commands[start_index:(i - 1)])
-            start_index = i
-
-    separated_commands.append(commands[start_index:])
-    separated_commands = [command.split() for command in separated_commands]
-    return separated_commands
-
-
-def parse_curve_command(command):
-    """Parse a curve string command.
-
-    :param command: A string with a curve command for a path.
-    :return: A list with parsed command.
-    :rtype: list
+COMMAND_NAMES = frozenset(LINE_COMMANDS + CURVE_COMMANDS + ARC_COMMANDS)
+NUMBER_OF_ARGUMENTS = {'m': 2, 'l': 2, 'h': 1, 'v': 1, 'z': 0, 'c': 6, 's': 4, 'q': 4, 't': 2, 'a': 7}
+ARC_FLAG_INDEXES = (3, 4)
+ARC_FLAGS = ('0', '1')
+# a command or a number, after the whitespace and commas separating it from the previous token
+PATH_TOKEN = re.compile(r'[\s,]*([MmZzLlHhVvCcSsQqTtAa]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)')
+geometry_cache = PathCache()  # shared by every document, None to parse and draw every path on its own
+
+
+def parse_arc_arguments(tokens, start):
+    """Parse the arguments of an arc command.
+
+    The large-arc and sweep flags are single 0 or 1 digits that may be written
+    without separators (e.g. "a10 10 0 0150 50"), so the first character of
+    a flag token is the flag and the rest of the token is the next argument.
+
+    :param tokens: Tokens of the path data.
+    :param start: Index of the first argument in tokens.
+    :return: A tuple with the list of 7 arc arguments (or None if the
+             path data ends before the arc) and the index of the next token.
+    :rtype: tuple
+    :raise: ValueError if a command is found among the arguments or a flag is not 0 or 1.
     """
 
-    result = []
-    for i in range(len(command)):
-        command[i] = command[i].replace(',', '').replace(' ', '')
+    arguments = []
+    pending = ''
+    i = start
+    while len(arguments) < NUMBER_OF_ARGUMENTS['a']:
+        if pending:
+            token, pending = pending, ''
+        elif i < len(tokens):
+            token = tokens[i]
+            i += 1
+        else:
+            return None, i
 
-    command = list(filter(lambda x: x != '', command))
+        if len(arguments) in ARC_FLAG_INDEXES:
+            token, pending = token[0], token[1:]
+            if token not in ARC_FLAGS:
+                raise ValueError('Invalid arc flag: ' + token)
+        arguments.append(float(token))
 
-    result.append(command[0])
-    for i in range(1, len(command[1:]), 2):
-        result.append((float(command[i]), float(command[i + 1])))
+    return arguments, i
 
-    return result
 
+def tokenize_path_data(path_data):
+    """Split path data into commands and numbers, up to the first character which starts neither.
 
-def parse_arc_command(command):
-    """Parse a arc string command.
+    Each token is matched where the previous one ends, so anything but whitespace
+    and commas between tokens ends the tokens, as it ends the path data.
 
-    :param command: A string with a arc command for a path.
-    :return: A list with parsed command.
+    :param path_data: A string of available commands for a path svg element.
+    :return: List of tokens (e.g. ['M', '10', '10', 'L', '20', '20']).
     :rtype: list
     """
 
-    result = []
-    for element in command:
-        element = element.replace(',', '').replace(' ', '')
-        if element[0].isalpha():
-            result.append(element)
-        else:
-            result.append(float(element))
+    tokens = []
+    match_token = PATH_TOKEN.match
+    token_match = match_token(path_data)
+    while token_match is not None:
+        tokens.append(token_match.group(1))
+        token_match = match_token(path_data, token_match.end())
 
-    return result
+    return tokens
 
 
 def parse_commands_to_list(commands):
-    """Convert list of path commands to a more convenient format.
+    """Convert path data to a list of command records in a single pass.
+
+    Each record is a tuple with the command name followed by its numeric
+    arguments (e.g. ('C', x1, y1, x2, y2, x, y)). Implicitly repeated
+    commands get their own record, coordinates following a moveto become
+    lineto records and a leading relative moveto is made absolute.
+    As required by the svg specification, parsing stops at the first error
+    and the commands parsed so far are kept.
 
     :param commands: A string of available commands for a path svg element.
     :return: List of commands in a more convenient and easy to work with format.
     :rtype: list
     """
 
-    commands = insert_space_between_command_and_args(commands)
-    commands = separate_commands(commands)
-
+    tokens = tokenize_path_data(commands)
+    number_of_tokens = len(tokens)
     result = []
-    for command in commands:
-        if command[0] in LINE_COMMANDS:
-            result.append([element if element[0].isalpha() else float(element) for element in command])
-        elif command[0] in CURVE_COMMANDS:
-            result.append(parse_curve_command(command))
-        elif command[0] in ARC_COMMANDS:
-            result.append(parse_arc_command(command))
+    command = None
+    i = 0
+    while i < number_of_tokens:
+        token = tokens[i]
+        if token in COMMAND_NAMES:
+            command = token
+            i += 1
+            if command in ('z', 'Z'):
+                if not result:
+                    break
+                result.append((command,))
+                continue
+        elif command is None or command in ('z', 'Z'):
+            break
+
+        try:
+            if command in ARC_COMMANDS:
+                arguments, i = parse_arc_arguments(tokens, i)
+                if arguments is None:
+                    break
+            else:
+                end = i + NUMBER_OF_ARGUMENTS[command.lower()]
+                if end > number_of_tokens:
+                    break
+                arguments = [float(argument) for argument in tokens[i:end]]
+                i = end
+        except ValueError:
+            break
+
+        if not result:
+            if command not in ('m', 'M'):
+                break
+            result.append(('M', *arguments))
+        else:
+            result.append((command, *arguments))
+
+        if command == 'M':
+            command = 'L'
+        elif command == 'm':
+            command = 'l'
 
     return result
 
 
-def get_attributes(svg_attributes):
+def get_attributes(svg_attributes, size):
     """Update the path element attributes in order to draw it.
 
     :param svg_attributes: Attributes of a path svg item.
+    :param size: Size of image, only needed by rectangles.
     :return: Attributes of path element.
-    :rtype: dict
+    :rtype: shapes.records.Path
     """
 
-    attributes = {
-        'commands': parse_commands_to_list(svg_attributes['d'])
-    }
+    if geometry_cache is not None:
+        path_geometry = geometry_cache.get(svg_attributes['d'], parse_path_data)
+        commands = path_geometry.commands
+    else:
+        path_geometry = None
+        commands = parse_commands_to_list(svg_attributes['d'])
 
+    color = DEFAULT_COLOR
     if 'fill' in svg_attributes:
-        if svg_attributes['fill'] != 'none':
-            attributes['color'] = colors.convert_color_to_rgb(svg_attributes['fill'])
-    else:
-        attributes['color'] = DEFAULT_COLOR
+        color = colors.convert_color_to_rgb(svg_attributes['fill']) if svg_attributes['fill'] != 'none' else None
 
-    if 'stroke' in svg_attributes:
-        attributes['stroke_color'] = colors.convert_color_to_rgb(svg_attributes['stroke'])
-        attributes['stroke_width'] = float(svg_attributes['stroke-width']) if 'stroke-width' in svg_attributes else 1
+    stroke_color, stroke_width = None, 1
+    if 'stroke' in svg_attributes and svg_attributes['stroke'] != 'none':
+        stroke_color = colors.convert_color_to_rgb(svg_attributes['stroke'])
+        stroke_width = float(svg_attributes['stroke-width']) if 'stroke-width' in svg_attributes else 1
 
-    return attributes
+    return records.Path(commands, color, stroke_color, stroke_width, path_geometry)
 
 
 def get_reflection_point(point1, point2):
@@ -148,80 +177,78 @@ def get_reflection_point(point1, point2):
     return point2[0] - x, point2[1] - y
 
 
-def draw_smooth_curveto(context, command, previous_command):
+def get_second_control_point(previous_command, previous_point):
+    """Return the absolute position of the last control point of a C/c/S/s/Q/q path command.
+
+    :param previous_command: A C/c/S/s/Q/q path command.
+    :param previous_point: The current point before previous_command was executed.
+    :return: The last control point of previous_command.
+    """
+
+    x, y = previous_command[-4], previous_command[-3]
+    if previous_command[0].islower():
+        x, y = x + previous_point[0], y + previous_point[1]
+    return x, y
+
+
+def draw_smooth_curveto(context, command, previous_command, previous_point):
     """Draw a smooth curveto on cairo context.
 
     :param context: The cairo context
     :param command: A S/s path command.
     :param previous_command: The previous path command.
+    :param previous_point: The current point before previous_command was executed.
     """
 
     current_point = context.get_current_point()
-    first_control_point = ()
     if previous_command == () or previous_command[0] not in ('s', 'S', 'c', 'C'):
         first_control_point = current_point
     else:
-        operation = previous_command[0]
-        if operation.isupper():
-            if operation == 'C':
-                first_control_point = get_reflection_point(previous_command[2], current_point)
-            else:
-                first_control_point = get_reflection_point(previous_command[1], current_point)
-        else:
-            if operation == 'c':
-                x, y = previous_command[4][0] + previous_command[2][0], previous_command[4][1] + previous_command[2][1]
-                first_control_point = get_reflection_point((x, y), current_point)
-            else:
-                x, y = previous_command[3][0] + previous_command[1][0], previous_command[3][1] + previous_command[1][1]
-                first_control_point = get_reflection_point((x, y), current_point)
+        first_control_point = get_reflection_point(get_second_control_point(previous_command, previous_point),
+                                                    current_point)
 
     if command[0].isupper():
-        context.curve_to(*first_control_point, *command[1], *command[2])
+        context.curve_to(*first_control_point, *command[1:5])
     else:
         first_control_point = first_control_point[0] - current_point[0], first_control_point[1] - current_point[1]
-        context.rel_curve_to(*first_control_point, *command[1], *command[2])
+        context.rel_curve_to(*first_control_point, *command[1:5])
 
 
-def draw_smooth_quadratic_curveto(context, command, previous_command):
+def draw_smooth_quadratic_curveto(context, command, previous_command, previous_point, last_t_control_point=()):
     """Draw a smooth quadratic curveto on cairo context.
 
     :param context: The cairo context
     :param command: A T/t path command.
     :param previous_command: The previous path command.
+    :param previous_point: The current point before previous_command was executed.
+    :param last_t_control_point: The control point returned for previous_command if it is a T/t path command.
+    :return: The absolute position of the control point of the curve, reflected by a following T/t command.
+    :rtype: tuple
     """
 
-    global last_t_control_point
     current_point = context.get_current_point()
 
     if previous_command == () or previous_command[0] not in ('t', 'T', 'q', 'Q'):
-        last_t_control_point = current_point
+        control_point = current_point
 
         if command[0] == 't':
-            context.rel_line_to(*command[1])
+            context.rel_line_to(command[1], command[2])
         else:
-            context.line_to(*command[1])
+            context.line_to(command[1], command[2])
     else:
-        control_point = ()
-        operation = previous_command[0]
-        if operation.isupper():
-            if operation == 'Q':
-                control_point = get_reflection_point(previous_command[1], current_point)
-            else:
-                control_point = get_reflection_point(last_t_control_point, current_point)
+        if previous_command[0] in ('q', 'Q'):
+            control_point = get_reflection_point(get_second_control_point(previous_command, previous_point),
+                                                 current_point)
         else:
-            if operation == 'q':
-                x, y = previous_command[3][0] + previous_command[1][0], previous_command[3][1] + previous_command[1][1]
-                control_point = get_reflection_point((x, y), current_point)
-            else:
-                control_point = get_reflection_point(last_t_control_point, current_point)
-
-        last_t_control_point = control_point
+            control_point = get_reflection_point(last_t_control_point, current_point)
 
         if command[0].isupper():
-            context.curve_to(*control_point, *command[1], *command[1])
+            context.curve_to(*control_point, *command[1:3], *command[1:3])
         else:
-            control_point = control_point[0] - current_point[0], control_point[1] - current_point[1]
-            context.rel_curve_to(*control_point, *command[1], *command[1])
+            relative_control_point = control_point[0] - current_point[0], control_point[1] - current_point[1]
+            context.rel_curve_to(*relative_control_point, *command[1:3], *command[1:3])
+
+    return control_point
 
 
 def rotate(x, y, angle):
@@ -249,7 +276,7 @@ def draw_arc(context, command):
 
     rx, ry = command[1], command[2]
     if rx == 0 or ry == 0:
-        context.line_to(*end_point)
+        context.rel_line_to(*end_point)
         return
 
     rotation = math.radians(command[3])
@@ -283,97 +310,262 @@ def draw_arc(context, command):
     context.restore()
 
 
-def execute_command_with_absolute_coordinates(context, command, previous_command):
-    """Execute a path command with absolute coordinates.
+# Every command handler takes the cairo context, the command, the previous command
+# and the current point before the previous command was executed. T/t commands also need
+# the control point of the previous T/t command, so add_commands calls draw_smooth_quadratic_curveto
+# itself and keeps that point in a local, never shared between renders running in other threads.
+def move_to(context, command, previous_command, previous_point):
+    """Execute a M path command."""
+    context.move_to(command[1], command[2])
 
-    :param context: The cairo context.
-    :param command: The current path command.
-    :param previous_command: The previous path command.
+
+def rel_move_to(context, command, previous_command, previous_point):
+    """Execute a m path command."""
+    context.rel_move_to(command[1], command[2])
+
+
+def line_to(context, command, previous_command, previous_point):
+    """Execute a L path command."""
+    context.line_to(command[1], command[2])
+
+
+def rel_line_to(context, command, previous_command, previous_point):
+    """Execute a l path command."""
+    context.rel_line_to(command[1], command[2])
+
+
+def horizontal_line_to(context, command, previous_command, previous_point):
+    """Execute a H path command."""
+    context.line_to(command[1], context.get_current_point()[1])
+
+
+def rel_horizontal_line_to(context, command, previous_command, previous_point):
+    """Execute a h path command."""
+    context.rel_line_to(command[1], 0)
+
+
+def vertical_line_to(context, command, previous_command, previous_point):
+    """Execute a V path command."""
+    context.line_to(context.get_current_point()[0], command[1])
+
+
+def rel_vertical_line_to(context, command, previous_command, previous_point):
+    """Execute a v path command."""
+    context.rel_line_to(0, command[1])
+
+
+def close_path(context, command, previous_command, previous_point):
+    """Execute a Z/z path command."""
+    context.close_path()
+
+
+def curve_to(context, command, previous_command, previous_point):
+    """Execute a C path command."""
+    context.curve_to(*command[1:7])
+
+
+def rel_curve_to(context, command, previous_command, previous_point):
+    """Execute a c path command."""
+    context.rel_curve_to(*command[1:7])
+
+
+def quadratic_curve_to(context, command, previous_command, previous_point):
+    """Execute a Q path command."""
+    context.curve_to(*command[1:5], *command[3:5])
+
+
+def rel_quadratic_curve_to(context, command, previous_command, previous_point):
+    """Execute a q path command."""
+    context.rel_curve_to(*command[1:5], *command[3:5])
+
+
+def arc_to(context, command, previous_command, previous_point):
+    """Execute an A/a path command."""
+    draw_arc(context, command)
+
+
+COMMAND_HANDLERS = {
+    'M': move_to, 'm': rel_move_to,
+    'L': line_to, 'l': rel_line_to,
+    'H': horizontal_line_to, 'h': rel_horizontal_line_to,
+    'V': vertical_line_to, 'v': rel_vertical_line_to,
+    'Z': close_path, 'z': close_path,
+    'C': curve_to, 'c': rel_curve_to,
+    'Q': quadratic_curve_to, 'q': rel_quadratic_curve_to,
+    'S': draw_smooth_curveto, 's': draw_smooth_curveto,
+    'A': arc_to, 'a': arc_to
+}
+# commands whose start point is needed to find the control point reflected by a following S/s or T/t
+RELATIVE_CONTROL_POINT_COMMANDS = frozenset(('c', 's', 'q'))
+SMOOTH_QUADRATIC_COMMANDS = frozenset(('t', 'T'))
+
+
+def get_arc_reach(command, start_point):
+    """Get a distance from the start point of an arc that no point of the arc exceeds.
+
+    Radii too small to join both ends of the arc are scaled up as in draw_arc,
+    and every point of the ellipse is at most its major diameter away from the start point.
+
+    :param command: An A/a path command.
+    :param start_point: The current point before the arc.
+    :return: The distance.
+    :rtype: float
     """
 
-    action = command[0]
-
-    if action == 'M':
-        context.move_to(command[1], command[2])
-    elif action == 'L':
-        context.line_to(command[1], command[2])
-    elif action == 'H':
-        context.line_to(command[1], context.get_current_point()[1])
-    elif action == 'V':
-        context.line_to(context.get_current_point()[0], command[1])
-    elif action == 'Z':
-        context.close_path()
-    elif action == 'C':
-        context.curve_to(*command[1], *command[2], *command[3])
-    elif action == 'Q':
-        context.curve_to(*command[1], *command[2], *command[2])
-    elif action == 'S':
-        draw_smooth_curveto(context, command, previous_command)
-    elif action == 'T':
-        draw_smooth_quadratic_curveto(context, command, previous_command)
-    elif action == 'A':
-        draw_arc(context, command)
-
-
-def execute_command_with_relative_coordinates(context, command, previous_command):
-    """Execute a path command with relative coordinates.
+    end_x, end_y = command[6], command[7]
+    if command[0].isupper():
+        end_x, end_y = end_x - start_point[0], end_y - start_point[1]
 
-    :param context: The cairo context.
-    :param command: A path command.
-    :param previous_command: The previous path command.
+    rx, ry = abs(command[1]), abs(command[2])
+    half_chord = math.hypot(end_x, end_y) / 2
+    return 2 * max(rx, ry) * max(1, half_chord / min(rx, ry))
+
+
+def get_commands_box(commands):
+    """Get a conservative bounding box of path commands, without stroke.
+
+    Lines are bounded by their end points, curves by their control points
+    and arcs by a square around their start point which holds the whole ellipse.
+
+    :param commands: List of path commands.
+    :return: The bounding box (min x, min y, max x, max y) or None if there are no commands.
+    :rtype: tuple
     """
 
-    action = command[0]
-
-    if action == 'm':
-        context.rel_move_to(command[1], command[2])
-    elif action == 'l':
-        context.rel_line_to(command[1], command[2])
-    elif action == 'h':
-        context.rel_line_to(command[1], 0)
-    elif action == 'v':
-        context.rel_line_to(0, command[1])
-    elif action == 'z':
-        context.close_path()
-    elif action == 'c':
-        context.rel_curve_to(*command[1], *command[2], *command[3])
-    elif action == 'q':
-        context.rel_curve_to(*command[1], *command[2], *command[2])
-    elif action == 's':
-        draw_smooth_curveto(context, command, previous_command)
-    elif action == 't':
-        draw_smooth_quadratic_curveto(context, command, previous_command)
-    elif action == 'a':
-        draw_arc(context, command)
+    if not commands:
+        return None
 
+    xs, ys = [], []
+    x = y = start_x = start_y = 0.0
+    control_x = control_y = 0.0
+    previous_action = ''
+    for command in commands:
+        action = command[0].upper()
+        dx, dy = (x, y) if command[0].islower() else (0.0, 0.0)
+
+        if action == 'Z':
+            x, y = start_x, start_y
+        elif action == 'H':
+            x = command[1] + dx
+        elif action == 'V':
+            y = command[1] + dy
+        elif action == 'A':
+            if command[4] not in (0, 1) or command[5] not in (0, 1):
+                continue
+            if command[1] != 0 and command[2] != 0:
+                reach = get_arc_reach(command, (x, y))
+                xs.extend((x - reach, x + reach))
+                ys.extend((y - reach, y + reach))
+            x, y = command[6] + dx, command[7] + dy
+        else:
+            if action in ('S', 'T'):
+                if previous_action in (('C', 'S') if action == 'S' else ('Q', 'T')):
+                    control_x, control_y = 2 * x - control_x, 2 * y - control_y
+                else:
+                    control_x, control_y = x, y
+                xs.append(control_x)
+                ys.append(control_y)
+
+            coordinates = command[1:]
+            for i in range(0, len(coordinates) - 2, 2):
+                xs.append(coordinates[i] + dx)
+                ys.append(coordinates[i + 1] + dy)
+            if action in ('C', 'S', 'Q'):
+                control_x, control_y = xs[-1], ys[-1]
+            x, y = coordinates[-2] + dx, coordinates[-1] + dy
+            if action == 'M':
+                start_x, start_y = x, y
+
+        xs.append(x)
+        ys.append(y)
+        previous_action = action
+
+    return geometry.get_points_box(xs, ys)
+
+
+def parse_path_data(path_data):
+    """Parse path data to its list of commands and their bounding box, as cached by helpers.path_cache."""
+    commands = parse_commands_to_list(path_data)
+    return commands, get_commands_box(commands)
+
+
+def get_bounding_box(attributes):
+    """Get a conservative bounding box of a path, including its stroke.
+
+    :param attributes: A shapes.records.Path with the attributes of the path (e.g. commands, color, stroke).
+    :return: The bounding box (min x, min y, max x, max y) or None if the path is empty.
+    :rtype: tuple
+    """
 
-def draw(context, attributes):
-    """Draw a path on cairo context.
+    if attributes.geometry is not None:
+        box = attributes.geometry.box
+    else:
+        box = get_commands_box(attributes.commands)
+    if box is None:
+        return None
+
+    return geometry.pad_box(box, geometry.get_stroke_padding(attributes, True))
+
+
+def add_commands(context, commands):
+    """Add path commands one by one to the current path of cairo context.
 
     :param context: The cairo context.
-    :param attributes: A dictionary which contains specific attributes of path (e.g. commands, color, stroke).
+    :param commands: List of path commands.
     """
 
     previous_command = ()
+    previous_point = ()
+    t_control_point = ()
+    get_current_point = context.get_current_point
 
-    for command in attributes['commands']:
-        current_endpoint = context.get_current_point()
+    for command in commands:
         action = command[0]
-        if action.isupper():
-            execute_command_with_absolute_coordinates(context, command, previous_command)
+        current_point = get_current_point() if action in RELATIVE_CONTROL_POINT_COMMANDS else None
+        if action in SMOOTH_QUADRATIC_COMMANDS:
+            t_control_point = draw_smooth_quadratic_curveto(context, command, previous_command, previous_point,
+                                                            t_control_point)
         else:
-            execute_command_with_relative_coordinates(context, command, previous_command)
+            COMMAND_HANDLERS[action](context, command, previous_command, previous_point)
         previous_command = command
-        previous_command.append(current_endpoint)
+        previous_point = current_point
+
+
+def add_path(context, attributes):
+    """Add a path to the current path of cairo context.
+
+    Paths from the cache append their outline at once when they were drawn before with the same transform.
 
-    if 'color' in attributes:
-        context.set_source_rgb(*attributes['color'])
-        if 'stroke_color' in attributes:
+    :param context: The cairo context.
+    :param attributes: A shapes.records.Path with the attributes of the path (e.g. commands, color, stroke).
+    """
+
+    if attributes.geometry is not None and geometry_cache is not None:
+        geometry_cache.append_outline(context, attributes.geometry, add_commands)
+    else:
+        add_commands(context, attributes.commands)
+
+
+def draw(context, attributes):
+    """Draw a path on cairo context.
+
+    :param context: The cairo context.
+    :param attributes: A shapes.records.Path with the attributes of the path (e.g. commands, color, stroke).
+    """
+
+    add_path(context, attributes)
+
+    if attributes.color is not None:
+        context.set_source_rgb(*attributes.color)
+        if attributes.stroke_color is not None:
             context.fill_preserve()
         else:
             context.fill()
 
-    if 'stroke_color' in attributes:
-        context.set_source_rgb(*attributes['stroke_color'])
-        context.set_line_width(attributes['stroke_width'])
+    if attributes.stroke_color is not None:
+        context.set_source_rgb(*attributes.stroke_color)
+        context.set_line_width(attributes.stroke_width)
         context.stroke()
+
+    if attributes.color is None and attributes.stroke_color is None:
+        context.new_path()
@@ -1,72 +1,193 @@
-from helpers import colors
+import math
+from array import array
+
+from helpers import colors, geometry
+from shapes import records
 
 DEFAULT_COLOR = (0, 0, 0)  # black
+VECTORIZE_MIN_LENGTH = 100000  # characters of points data parsed with numpy instead of python
+VECTORIZE_MIN_COORDINATES = 20000  # coordinates of a polyline bounded with numpy instead of python
+# curve tolerance of cairo contexts, in device pixels. Polylines drawn on a context with a larger one,
+# as set by the draft and fast quality profiles, are simplified so a removed point moves them by as much
+DEFAULT_TOLERANCE = 0.1
+SIMPLIFY_MIN_POINTS = 64
+
 
+def parse_points(string_points):
+    """Transform the points of a polyline to a flat array of coordinates.
 
-def parse_string_points_to_list(string_points):
-    """Transform string list of points to list of points.
+    Large point lists are parsed by numpy, which is only imported when one is found,
+    so small documents do not pay for the import. As required by the svg specification,
+    an odd coordinate at the end of the list is ignored.
 
-    :param string_points: A string list of 2D points separated by spaces.
-    :return: A list of tuples of 2D points.
-    :rtype: list
+    :param string_points: A string list of coordinates separated by spaces or commas.
+    :return: The coordinates x0, y0, x1, y1, ... of the points.
+    :rtype: array.array
+    :raise: ValueError if a coordinate is not a number.
     """
 
-    points = []
-    for point in string_points.split():
-        x, y = point.split(',')
-        points.append((float(x), float(y)))
+    string_points = string_points.replace(',', ' ')
+    coordinates = array('d')
+    if len(string_points) >= VECTORIZE_MIN_LENGTH:
+        import numpy
+
+        coordinates.frombytes(numpy.fromstring(string_points, sep=' ').tobytes())
+    else:
+        coordinates.extend(map(float, string_points.split()))
+
+    if len(coordinates) % 2:
+        coordinates.pop()
+
+    return coordinates
+
+
+def get_coordinates_view(coordinates):
+    """Get a numpy view of shape (number of points, 2) on an array of coordinates, without copying it."""
+    import numpy
 
-    return points
+    return numpy.frombuffer(coordinates, dtype=numpy.float64).reshape(-1, 2)
 
 
-def get_attributes(svg_attributes):
+def simplify_points(coordinates, tolerance):
+    """Remove the points whose removal moves the polyline by less than a tolerance (Douglas-Peucker).
+
+    All segments of the simplified polyline are refined at once: each pass measures the distance
+    from every remaining point to the segment which replaces it, and keeps the farthest point
+    of every segment whose farthest point is beyond the tolerance.
+
+    :param coordinates: The coordinates x0, y0, x1, y1, ... of the points.
+    :param tolerance: Largest distance between a removed point and the simplified polyline.
+    :return: The coordinates of the kept points, which always include the first and the last one.
+    :rtype: array.array
+    """
+
+    import numpy
+
+    points = get_coordinates_view(coordinates)
+    xs, ys = points[:, 0].copy(), points[:, 1].copy()
+    keep = numpy.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    candidates = numpy.arange(1, len(points) - 1)
+    while len(candidates):
+        # distance from each candidate to the segment joining the kept points around it
+        kept_indexes = numpy.flatnonzero(keep)
+        segment_ids = numpy.searchsorted(kept_indexes, candidates) - 1
+        starts, ends = kept_indexes[segment_ids], kept_indexes[segment_ids + 1]
+        start_xs, start_ys = xs[starts], ys[starts]
+        segment_xs, segment_ys = xs[ends] - start_xs, ys[ends] - start_ys
+        offset_xs, offset_ys = xs[candidates] - start_xs, ys[candidates] - start_ys
+        squared_lengths = segment_xs * segment_xs + segment_ys * segment_ys
+        squared_lengths[squared_lengths == 0] = 1
+        projections = numpy.clip((offset_xs * segment_xs + offset_ys * segment_ys) / squared_lengths, 0, 1)
+        distances = numpy.hypot(offset_xs - projections * segment_xs, offset_ys - projections * segment_ys)
+
+        # candidates are sorted, so the candidates of a segment are contiguous
+        group_starts = numpy.flatnonzero(numpy.diff(segment_ids, prepend=-1))
+        group_sizes = numpy.diff(group_starts, append=len(candidates))
+        group_maxima = numpy.repeat(numpy.maximum.reduceat(distances, group_starts), group_sizes)
+        farthest = numpy.flatnonzero((distances == group_maxima) & (distances > tolerance))
+        _, first_farthest = numpy.unique(segment_ids[farthest], return_index=True)
+
+        split_points = candidates[farthest[first_farthest]]
+        keep[split_points] = True
+        # points of segments within the tolerance are dropped, the others are measured again
+        candidates = candidates[(group_maxima > tolerance) & ~keep[candidates]]
+
+    simplified_coordinates = array('d')
+    simplified_coordinates.frombytes(points[keep].tobytes())
+    return simplified_coordinates
+
+
+def get_attributes(svg_attributes, size):
     """Update the polyline element attributes in order to draw it.
 
     :param svg_attributes: Attributes of a polyline svg item.
+    :param size: Size of image, only needed by rectangles.
     :return: Attributes of polyline element.
-    :rtype: dict
+    :rtype: shapes.records.Polyline
     """
 
-    attributes = {
-        'points': parse_string_points_to_list(svg_attributes['points'])
-    }
+    points = parse_points(svg_attributes['points'])
 
+    color = DEFAULT_COLOR
     if 'fill' in svg_attributes:
-        if svg_attributes['fill'] != 'none':
-            attributes['color'] = colors.convert_color_to_rgb(svg_attributes['fill'])
-    else:
-        attributes['color'] = DEFAULT_COLOR
+        color = colors.convert_color_to_rgb(svg_attributes['fill']) if svg_attributes['fill'] != 'none' else None
 
+    stroke_color, stroke_width = None, 1
     if 'stroke' in svg_attributes and svg_attributes['stroke'] != 'none':
-        attributes['stroke_color'] = colors.convert_color_to_rgb(svg_attributes['stroke'])
-        attributes['stroke_width'] = float(svg_attributes['stroke-width']) if 'stroke-width' in svg_attributes else 1
+        stroke_color = colors.convert_color_to_rgb(svg_attributes['stroke'])
+        stroke_width = float(svg_attributes['stroke-width']) if 'stroke-width' in svg_attributes else 1
+
+    return records.Polyline(points, color, stroke_color, stroke_width)
+
+
+def get_bounding_box(attributes):
+    """Get the bounding box of a polyline, including its stroke.
 
-    return attributes
+    :param attributes: A shapes.records.Polyline with the attributes of the polyline (e.g. points).
+    :return: The bounding box (min x, min y, max x, max y) or None if the polyline has no points.
+    :rtype: tuple
+    """
+
+    coordinates = attributes.points
+    if not coordinates:
+        return None
+
+    if len(coordinates) >= VECTORIZE_MIN_COORDINATES:
+        points = get_coordinates_view(coordinates)
+        box = (*points.min(axis=0).tolist(), *points.max(axis=0).tolist())
+    else:
+        box = geometry.get_points_box(coordinates[0::2], coordinates[1::2])
+
+    return geometry.pad_box(box, geometry.get_stroke_padding(attributes, True))
+
+
+def add_path(context, attributes):
+    """Add a polyline to the current path of cairo context.
+
+    Large polylines are simplified when the curve tolerance of the context is above DEFAULT_TOLERANCE,
+    so each render gets the simplification of its quality profile.
+
+    :param context: The cairo context.
+    :param attributes: A shapes.records.Polyline with the attributes of the polyline (e.g. points).
+    """
+
+    coordinates = attributes.points
+    if not coordinates:
+        return
+
+    if len(coordinates) >= SIMPLIFY_MIN_POINTS * 2:
+        tolerance = context.get_tolerance()
+        if tolerance > DEFAULT_TOLERANCE:
+            coordinates = simplify_points(coordinates, math.hypot(*context.device_to_user_distance(tolerance, 0)))
+
+    context.move_to(coordinates[0], coordinates[1])
+    line_to = context.line_to
+    remaining_coordinates = iter(coordinates[2:])
+    for x, y in zip(remaining_coordinates, remaining_coordinates):
+        line_to(x, y)
 
 
 def draw(context, attributes):
     """Draw a polyline on cairo context.
 
     :param context: The cairo context.
-    :param attributes: A dictionary which contains specific attributes of polyline (e.g. points).
+    :param attributes: A shapes.records.Polyline with the attributes of the polyline (e.g. points).
     """
 
-    points = attributes['points']
-    number_of_points = len(points)
+    add_path(context, attributes)
 
-    if number_of_points > 0:
-        context.move_to(points[0][0], points[0][1])
-        for i in range(1, number_of_points):
-            context.line_to(points[i][0], points[i][1])
-
-    if 'color' in attributes:
-        context.set_source_rgb(*attributes['color'])
-        if 'stroke_color' in attributes:
+    if attributes.color is not None:
+        context.set_source_rgb(*attributes.color)
+        if attributes.stroke_color is not None:
             context.fill_preserve()
         else:
             context.fill()
 
-    if 'stroke_color' in attributes:
-        context.set_source_rgb(*attributes['stroke_color'])
-        context.set_line_width(attributes['stroke_width'])
+    if attributes.stroke_color is not None:
+        context.set_source_rgb(*attributes.stroke_color)
+        context.set_line_width(attributes.stroke_width)
         context.stroke()
+
+    if attributes.color is None and attributes.stroke_color is None:
+        context.new_path()
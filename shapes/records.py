@@ -0,0 +1,141 @@
+class Shape:
+    """Attributes needed to draw an element, in slots rather than in a dictionary.
+
+    Slots take less memory than a dictionary per element and are read without
+    hashing a key. Paint attributes are None when the element is not filled or
+    not stroked, and stroke_width is only meaningful when stroke_color is set.
+    """
+
+    __slots__ = ('color', 'stroke_color', 'stroke_width')
+    FIELDS = ()
+
+    def __init__(self, color=None, stroke_color=None, stroke_width=1):
+        self.color = color
+        self.stroke_color = stroke_color
+        self.stroke_width = stroke_width
+
+    def get_values(self):
+        """Get the values of the geometry and paint attributes, in FIELDS order."""
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.get_values() == other.get_values()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{0}({1})'.format(type(self).__name__, ', '.join(
+            '{0}={1!r}'.format(name, getattr(self, name)) for name in self.FIELDS))
+
+
+class Rectangle(Shape):
+    __slots__ = ('x', 'y', 'width', 'height')
+    FIELDS = __slots__ + Shape.__slots__
+
+    def __init__(self, x, y, width, height, color=None, stroke_color=None, stroke_width=1):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.color = color
+        self.stroke_color = stroke_color
+        self.stroke_width = stroke_width
+
+
+class Circle(Shape):
+    __slots__ = ('cx', 'cy', 'radius')
+    FIELDS = __slots__ + Shape.__slots__
+
+    def __init__(self, cx, cy, radius, color=None, stroke_color=None, stroke_width=1):
+        self.cx = cx
+        self.cy = cy
+        self.radius = radius
+        self.color = color
+        self.stroke_color = stroke_color
+        self.stroke_width = stroke_width
+
+
+class Ellipse(Shape):
+    __slots__ = ('cx', 'cy', 'rx', 'ry')
+    FIELDS = __slots__ + Shape.__slots__
+
+    def __init__(self, cx, cy, rx, ry, color=None, stroke_color=None, stroke_width=1):
+        self.cx = cx
+        self.cy = cy
+        self.rx = rx
+        self.ry = ry
+        self.color = color
+        self.stroke_color = stroke_color
+        self.stroke_width = stroke_width
+
+
+class Line(Shape):
+    __slots__ = ('x1', 'y1', 'x2', 'y2')
+    FIELDS = __slots__ + Shape.__slots__
+
+    def __init__(self, x1, y1, x2, y2, color=None, stroke_color=None, stroke_width=1):
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+        self.color = color
+        self.stroke_color = stroke_color
+        self.stroke_width = stroke_width
+
+
+class Polyline(Shape):
+    __slots__ = ('points',)
+    FIELDS = __slots__ + Shape.__slots__
+
+    def __init__(self, points, color=None, stroke_color=None, stroke_width=1):
+        self.points = points
+        self.color = color
+        self.stroke_color = stroke_color
+        self.stroke_width = stroke_width
+
+
+class Path(Shape):
+    """Commands of a path, and their helpers.path_cache.PathGeometry when they come from the cache.
+
+    The geometry is shared by every path with the same path data, and is not compared.
+    """
+
+    __slots__ = ('commands', 'geometry')
+    FIELDS = ('commands',) + Shape.__slots__
+
+    def __init__(self, commands, color=None, stroke_color=None, stroke_width=1, geometry=None):
+        self.commands = commands
+        self.color = color
+        self.stroke_color = stroke_color
+        self.stroke_width = stroke_width
+        self.geometry = geometry
+
+
+class Group(Shape):
+    """Children of a <g> element, drawn with its transform. Groups have no paint of their own."""
+
+    __slots__ = ('children', 'matrix', 'box')
+    FIELDS = __slots__
+
+    def __init__(self, children, matrix, box):
+        self.children = children
+        self.matrix = matrix
+        self.box = box
+        self.color = None
+        self.stroke_color = None
+        self.stroke_width = 1
+
+
+class Use(Shape):
+    """Instance of a helpers.references.Definition, drawn with the transform of a <use> element."""
+
+    __slots__ = ('definition', 'matrix', 'box')
+    FIELDS = __slots__
+
+    def __init__(self, definition, matrix, box):
+        self.definition = definition
+        self.matrix = matrix
+        self.box = box
+        self.color = None
+        self.stroke_color = None
+        self.stroke_width = 1
@@ -1,4 +1,5 @@
-from helpers import colors
+from helpers import colors, geometry
+from shapes import records
 
 DEFAULT_COLOR = (0, 0, 0)  # black
 
@@ -9,49 +10,72 @@ def get_attributes(svg_attributes, size):
     :param svg_attributes: Attributes of a rect svg item.
     :param size: Size of image.
     :return: Attributes of rectangle element.
-    :rtype: dict
+    :rtype: shapes.records.Rectangle
     """
 
-    width, height = size
-    attributes = {
-        'x': float(svg_attributes['x']) if 'x' in svg_attributes else 0,
-        'y': float(svg_attributes['y']) if 'y' in svg_attributes else 0,
-        'width': float(svg_attributes['width']) if not svg_attributes['width'].endswith('%') else
-        float(svg_attributes['width'][:-1]) / 100 * width,
-        'height': float(svg_attributes['height']) if not svg_attributes['height'].endswith('%') else
-        float(svg_attributes['height'][:-1]) / 100 * height
-    }
+    image_width, image_height = size
+    x = float(svg_attributes['x']) if 'x' in svg_attributes else 0
+    y = float(svg_attributes['y']) if 'y' in svg_attributes else 0
+    width = float(svg_attributes['width']) if not svg_attributes['width'].endswith('%') else \
+        float(svg_attributes['width'][:-1]) / 100 * image_width
+    height = float(svg_attributes['height']) if not svg_attributes['height'].endswith('%') else \
+        float(svg_attributes['height'][:-1]) / 100 * image_height
 
+    color = DEFAULT_COLOR
     if 'fill' in svg_attributes:
-        if svg_attributes['fill'] != 'none':
-            attributes['color'] = colors.convert_color_to_rgb(svg_attributes['fill'])
-    else:
-        attributes['color'] = DEFAULT_COLOR
+        color = colors.convert_color_to_rgb(svg_attributes['fill']) if svg_attributes['fill'] != 'none' else None
 
+    stroke_color, stroke_width = None, 1
     if 'stroke' in svg_attributes and svg_attributes['stroke'] != 'none':
-        attributes['stroke_color'] = colors.convert_color_to_rgb(svg_attributes['stroke'])
-        attributes['stroke_width'] = float(svg_attributes['stroke-width']) if 'stroke-width' in svg_attributes else 1
+        stroke_color = colors.convert_color_to_rgb(svg_attributes['stroke'])
+        stroke_width = float(svg_attributes['stroke-width']) if 'stroke-width' in svg_attributes else 1
 
-    return attributes
+    return records.Rectangle(x, y, width, height, color, stroke_color, stroke_width)
+
+
+def get_bounding_box(attributes):
+    """Get the bounding box of a rectangle, including its stroke.
+
+    :param attributes: A shapes.records.Rectangle with the attributes of the rectangle (e.g. width, height, color).
+    :return: The bounding box (min x, min y, max x, max y).
+    :rtype: tuple
+    """
+
+    box = (attributes.x, attributes.y,
+           attributes.x + attributes.width, attributes.y + attributes.height)
+    return geometry.pad_box(box, geometry.get_stroke_padding(attributes))
+
+
+def add_path(context, attributes):
+    """Add the outline of a rectangle to the current path of cairo context.
+
+    :param context: The cairo context.
+    :param attributes: A shapes.records.Rectangle with the attributes of the rectangle (e.g. width, height, color).
+    """
+
+    context.rectangle(attributes.x, attributes.y, attributes.width, attributes.height)
 
 
 def draw(context, attributes):
     """Draw a rectangle on cairo context.
 
     :param context: The cairo context.
-    :param attributes: A dictionary which contains specific attributes of rectangle (e.g. width, height, color).
+    :param attributes: A shapes.records.Rectangle with the attributes of the rectangle (e.g. width, height, color).
     """
 
-    context.rectangle(attributes['x'], attributes['y'], attributes['width'], attributes['height'])
+    add_path(context, attributes)
 
-    if 'color' in attributes:
-        context.set_source_rgb(*attributes['color'])
-        if 'stroke_color' in attributes:
+    if attributes.color is not None:
+        context.set_source_rgb(*attributes.color)
+        if attributes.stroke_color is not None:
             context.fill_preserve()
         else:
             context.fill()
 
-    if 'stroke_color' in attributes:
-        context.set_source_rgb(*attributes['stroke_color'])
-        context.set_line_width(attributes['stroke_width'])
+    if attributes.stroke_color is not None:
+        context.set_source_rgb(*attributes.stroke_color)
+        context.set_line_width(attributes.stroke_width)
         context.stroke()
+
+    if attributes.color is None and attributes.stroke_color is None:
+        context.new_path()
@@ -1,68 +1,264 @@
-import cairo
+import importlib
+import io
+import json
+import math
 import sys
-from helpers import xml
-from shapes import rectangle, circle, ellipse, line, polyline, path
+import time
+from helpers import cost, geometry, quality, transform, xml
+from helpers.painter import Painter
+from helpers.references import XLINK_HREF, References
 
 PIXEL_SCALE = 10
 PNG_FILENAME = 'outputs/image.png'
+SHAPE_MODULES = {
+    'rect': 'shapes.rectangle',
+    'circle': 'shapes.circle',
+    'ellipse': 'shapes.ellipse',
+    'line': 'shapes.line',
+    'polyline': 'shapes.polyline',
+    'path': 'shapes.path',
+    'g': 'shapes.group',
+    'use': 'shapes.group'
+}
+# presentation attributes passed on by groups and <use> elements to the elements they draw
+INHERITED_ATTRIBUTES = ('fill', 'stroke', 'stroke-width')
+loaded_shape_modules = {}
 
 
-def init_surface(size):
+def get_surface_size(size, scale=PIXEL_SCALE):
+    """Get the size in pixels of the surface holding an image.
+
+    :param size: Size of the image (i.e. width and height).
+    :param scale: Number of pixels per svg unit.
+    :return: Width and height of the surface.
+    :rtype: tuple
+    """
+
+    width, height = size
+    return math.ceil(width * scale), math.ceil(height * scale)
+
+
+def init_surface(size, scale=PIXEL_SCALE):
     """Initialize the cairo surface to hold drawing.
 
     :param size: Size of the image (i.e. width and height).
+    :param scale: Number of pixels per svg unit.
     :return: The initialized cairo surface.
     :rtype: cairo.ImageSurface
     """
 
-    width, height = size
+    import cairo
 
-    return cairo.ImageSurface(cairo.FORMAT_RGB24,
-                              width * PIXEL_SCALE,
-                              height * PIXEL_SCALE)
+    return cairo.ImageSurface(cairo.FORMAT_RGB24, *get_surface_size(size, scale))
 
 
-def init_cairo_context(surface, size):
+def init_cairo_context(surface, size, scale=PIXEL_SCALE):
     """Initialize cairo context used to draw with.
 
     :param surface: The cairo surface.
     :param size: Size of the image (i.e. width and height).
+    :param scale: Number of pixels per svg unit.
     :return: The initialized cairo context.
     :rtype: cairo.Context
     """
 
-    width, height = size
+    import cairo
 
     context = cairo.Context(surface)
-    context.scale(PIXEL_SCALE, PIXEL_SCALE)
+    prepare_cairo_context(context, size, scale)
+
+    return context
+
+
+def prepare_cairo_context(context, size, scale=PIXEL_SCALE):
+    """Scale a cairo context to svg units and paint the image background.
+
+    :param context: A cairo context with its default state.
+    :param size: Size of the image (i.e. width and height).
+    :param scale: Number of pixels per svg unit.
+    """
+
+    width, height = size
+
+    context.scale(scale, scale)
     context.rectangle(0, 0, width, height)
     context.fill()
 
-    return context
 
+def get_shape_module(item_tag):
+    """Get the module used to draw an element, importing it on first use.
+
+    :param item_tag: Tag of a svg element, without namespace.
+    :return: The shape module or None if the element is not supported.
+    :rtype: module
+    """
+
+    if item_tag not in loaded_shape_modules:
+        module_name = SHAPE_MODULES.get(item_tag)
+        loaded_shape_modules[item_tag] = importlib.import_module(module_name) if module_name else None
+
+    return loaded_shape_modules[item_tag]
+
+
+def get_inherited_attributes(svg_attributes):
+    """Get the presentation attributes a group or a <use> element passes on to the elements it draws."""
+    return {name: svg_attributes[name] for name in INHERITED_ATTRIBUTES if name in svg_attributes}
+
+
+def parse_children(items, size, references, inherited):
+    """Get the shape modules and the attributes needed to draw the children of a svg item.
+
+    :param items: The children.
+    :param size: Size of the image (i.e. width and height).
+    :param references: The helpers.references.References of the document.
+    :param inherited: Presentation attributes inherited by the children.
+    :return: List of (shape module, attributes) of the supported children.
+    :rtype: list
+    """
+
+    children = []
+    for item in items:
+        parsed_item = parse_item(item, size, references, inherited)
+        if parsed_item is not None:
+            children.append(parsed_item)
+
+    return children
 
-def fill_context(context, size, items):
+
+def parse_referenced_element(element, inherited, size, references):
+    """Get the elements drawn by an element referenced by a <use> element, and their bounding box."""
+    if xml.remove_namespace(element.tag) == 'symbol':
+        children = parse_children(element, size, references, {**inherited, **get_inherited_attributes(element.attrib)})
+    else:
+        parsed_item = parse_item(element, size, references, inherited)
+        children = [parsed_item] if parsed_item is not None else []
+
+    group = get_shape_module('g')
+    return children, group.get_children_box(children)
+
+
+def parse_container(item, svg_attributes, size, references):
+    """Get the attributes needed to draw a group or a <use> element.
+
+    :param item: A g or use svg element.
+    :param svg_attributes: Attributes of the element, including the inherited ones.
+    :param size: Size of the image (i.e. width and height).
+    :param references: The helpers.references.References of the document.
+    :return: A tuple (shape module, attributes) or None if a <use> refers to an unknown element.
+    :rtype: tuple
+    :raise: ValueError if the transform of the element is not valid.
+    """
+
+    group = get_shape_module('g')
+    matrix = transform.parse_transform(svg_attributes.get('transform'))
+    inherited = get_inherited_attributes(svg_attributes)
+    if xml.remove_namespace(item.tag) == 'g':
+        return group, group.get_group_attributes(parse_children(item, size, references, inherited), matrix)
+
+    if references is None:
+        return None
+    definition = references.get_definition(
+        svg_attributes.get('href', svg_attributes.get(XLINK_HREF)), inherited,
+        lambda element, element_inherited: parse_referenced_element(element, element_inherited, size, references))
+    if definition is None:
+        return None
+
+    x, y = float(svg_attributes.get('x', 0)), float(svg_attributes.get('y', 0))
+    if x or y:
+        matrix = transform.multiply(matrix or transform.IDENTITY, (1.0, 0.0, 0.0, 1.0, x, y))
+    return group, group.get_use_attributes(definition, matrix)
+
+
+def parse_item(item, size, references=None, inherited=None):
+    """Get the shape module and the attributes needed to draw a svg item.
+
+    :param item: A svg element.
+    :param size: Size of the image (i.e. width and height).
+    :param references: Optional helpers.references.References of the document, needed to draw <use> elements.
+    :param inherited: Optional presentation attributes inherited from the groups holding the element.
+    :return: A tuple (shape module, attributes) or None if the element is not supported.
+    :rtype: tuple
+    """
+
+    shape = get_shape_module(xml.remove_namespace(item.tag))
+    if shape is None:
+        return None
+
+    svg_attributes = {**inherited, **item.attrib} if inherited else item.attrib
+    if shape.__name__ == 'shapes.group':
+        return parse_container(item, svg_attributes, size, references)
+
+    return shape, shape.get_attributes(svg_attributes, size)
+
+
+def is_visible(shape, attributes, region, min_size=0):
+    """Check if an element may draw inside a region.
+
+    :param shape: The shape module used to draw the element.
+    :param attributes: Attributes of the element.
+    :param region: The region (min x, min y, max x, max y) in svg units.
+    :param min_size: Elements smaller than this size in svg units are considered invisible.
+    :rtype: bool
+    """
+
+    box = shape.get_bounding_box(attributes)
+    return (box is not None and geometry.boxes_intersect(box, region)
+            and not (min_size and quality.is_too_small(box, min_size)))
+
+
+def fill_context(context, size, items, batched=True, min_element_size=0, profiler=None):
     """Fill cairo context with elements from svg items.
 
     :param context: The cairo context.
     :param size: Size of the image (i.e. width and height).
-    :param items: Children of the root element in the input svg file.
+    :param items: Iterable over the children of the root element in the input svg file.
+    :param batched: If True, elements are drawn by a helpers.painter.Painter, which skips
+           redundant state changes and fills runs of elements of the same color at once.
+    :param min_element_size: Elements whose bounding box is smaller than this size in svg units are not drawn.
+    :param profiler: Optional helpers.profiling.Profiler measuring the time spent in each phase and element.
     """
 
-    for item in items:
-        item_tag = xml.remove_namespace(item.tag)
-        if item_tag == 'rect':
-            rectangle.draw(context, rectangle.get_attributes(item.attrib, size))
-        elif item_tag == 'circle':
-            circle.draw(context, circle.get_attributes(item.attrib))
-        elif item_tag == 'ellipse':
-            ellipse.draw(context, ellipse.get_attributes(item.attrib))
-        elif item_tag == 'line':
-            line.draw(context, line.get_attributes(item.attrib))
-        elif item_tag == 'polyline':
-            polyline.draw(context, polyline.get_attributes(item.attrib))
-        elif item_tag == 'path':
-            path.draw(context, path.get_attributes(item.attrib))
+    canvas = (0, 0, size[0], size[1])
+    painter = Painter(context) if batched else None
+    references = References()
+    if profiler is not None:
+        items = profiler.time_iterator('parse', items)
+        clock = time.perf_counter
+
+    for index, item in enumerate(items):
+        if profiler is not None:
+            start = clock()
+        references.register(item)
+        parsed_item = parse_item(item, size, references)
+        if profiler is not None:
+            attributes_end = clock()
+            profiler.add_time('attributes', attributes_end - start)
+        if parsed_item is None:
+            continue
+
+        shape, attributes = parsed_item
+        visible = is_visible(shape, attributes, canvas, min_element_size)
+        if profiler is not None:
+            draw_start = clock()
+            profiler.add_time('cull', draw_start - attributes_end)
+        if visible:
+            if painter is not None:
+                painter.draw(shape, attributes)
+            else:
+                shape.draw(context, attributes)
+        if profiler is not None:
+            draw_seconds = clock() - draw_start if visible else 0
+            profiler.add_time('draw', draw_seconds, int(visible))
+            profiler.add_element(index, xml.remove_namespace(item.tag), attributes_end - start, draw_seconds)
+
+    if painter is not None:
+        if profiler is not None:
+            with profiler.phase('draw'):
+                painter.flush()
+        else:
+            painter.flush()
+    if profiler is not None:
+        profiler.counters.update(references.stats())
 
 
 def build_cairo_context(size, items, surface):
@@ -81,39 +277,350 @@ def build_cairo_context(size, items, surface):
     return context
 
 
-def draw_image(png_filename, surface):
+def stop_when_set(items, cancel_event):
+    """Yield the items of a document until an event is set.
+
+    :param items: Iterator over the elements of a document.
+    :param cancel_event: A threading.Event set to stop the render.
+    :raise: concurrent.futures.CancelledError once the event is set.
+    """
+
+    for item in items:
+        if cancel_event.is_set():
+            from concurrent.futures import CancelledError
+            raise CancelledError()
+        yield item
+
+
+def render(svg_file, pool=None, quality_profile=quality.DEFAULT_PROFILE, profiler=None, cancel_event=None,
+           scale=PIXEL_SCALE):
+    """Render a svg file on a cairo surface.
+
+    Elements are drawn while the file is still being parsed,
+    so the whole document is never held in memory.
+
+    :param svg_file: A path to a svg file or a binary file object.
+    :param pool: Optional helpers.surface_pool.SurfacePool to take the surface from.
+           The caller must give the surface back with pool.release once done with it.
+    :param quality_profile: Name of a helpers.quality profile, trading fidelity for speed.
+    :param profiler: Optional helpers.profiling.Profiler measuring the render.
+    :param cancel_event: Optional threading.Event, or any object with an is_set method,
+           checked before each element is drawn so another thread can stop the render.
+    :param scale: Number of pixels per svg unit.
+    :return: The cairo surface holding the drawing.
+    :rtype: cairo.ImageSurface
+    :raise: ValueError if the quality profile does not exist,
+            concurrent.futures.CancelledError if the render is stopped by cancel_event.
+    """
+
+    profile = quality.get_profile(quality_profile)
+    if profiler is not None:
+        with profiler.phase('parse'):
+            size, items = xml.stream_svg(svg_file)
+    else:
+        size, items = xml.stream_svg(svg_file)
+    if cancel_event is not None:
+        items = stop_when_set(items, cancel_event)
+    if pool is None:
+        surface = init_surface(size, scale)
+        context = init_cairo_context(surface, size, scale)
+    else:
+        surface, context = pool.acquire(*get_surface_size(size, scale))
+
+    try:
+        if pool is not None:
+            prepare_cairo_context(context, size, scale)
+        quality.apply_profile(context, profile)
+        fill_context(context, size, items, min_element_size=quality.get_min_element_size(context, profile),
+                     profiler=profiler)
+    except BaseException:
+        if pool is not None:
+            pool.release(surface, discard=True)
+        raise
+
+    return surface
+
+
+def draw_image(png_filename, surface, profiler=None):
     """Translate the cairo surface into a png file.
 
     :param png_filename: Path to png file (result for svg to png conversion).
     :param surface: The cairo surface.
+    :param profiler: Optional helpers.profiling.Profiler measuring the encoding.
+    """
+
+    if profiler is not None:
+        with profiler.phase('encode'):
+            surface.write_to_png(png_filename)
+    else:
+        surface.write_to_png(png_filename)
+
+
+def render_png(svg_data, pool=None, quality_profile=quality.DEFAULT_PROFILE, profiler=None, cancel_event=None,
+               scale=PIXEL_SCALE):
+    """Convert svg bytes to png bytes.
+
+    :param svg_data: Content of a svg file.
+    :param pool: Optional helpers.surface_pool.SurfacePool to take the surface from.
+    :param quality_profile: Name of a helpers.quality profile.
+    :param profiler: Optional helpers.profiling.Profiler, finished once the png is encoded.
+    :param cancel_event: Optional threading.Event stopping the render once set.
+    :param scale: Number of pixels per svg unit.
+    :return: Content of the png file.
+    :rtype: bytes
     """
 
-    surface.write_to_png(png_filename)
+    svg_file = io.BytesIO(svg_data)
+    surface = render(svg_file, pool, quality_profile, profiler, cancel_event, scale)
+    try:
+        png_file = io.BytesIO()
+        draw_image(png_file, surface, profiler)
+    finally:
+        if pool is not None:
+            pool.release(surface)
+
+    if profiler is not None:
+        profiler.finish(svg_file)
+    return png_file.getvalue()
+
+
+def render_pixels(svg_data, quality_profile=quality.DEFAULT_PROFILE, mode=None, cancel_event=None,
+                  scale=PIXEL_SCALE):
+    """Convert svg bytes to pixels, without encoding them to png.
+
+    :param svg_data: Content of a svg file.
+    :param quality_profile: Name of a helpers.quality profile.
+    :param mode: None to get a numpy view on the pixels of the surface without copying them,
+           or one of helpers.raster.CONVERSION_MODES to get them in a new array of this layout.
+    :param cancel_event: Optional threading.Event stopping the render once set.
+    :param scale: Number of pixels per svg unit.
+    :return: A tuple (numpy array of the pixels, raster info as returned by helpers.raster.get_raster_info).
+    :rtype: tuple
+    :raise: ValueError if the quality profile or the conversion mode does not exist.
+    """
+
+    from helpers import raster
+
+    surface = render(io.BytesIO(svg_data), quality_profile=quality_profile, cancel_event=cancel_event, scale=scale)
+    info = raster.get_raster_info(surface)
+    if mode is None:
+        return raster.get_array(surface), info
+
+    return raster.convert_pixels(surface, mode), info
+
+
+def get_cache_key(cache, svg_data, quality_profile=quality.DEFAULT_PROFILE, scale=PIXEL_SCALE):
+    """Get the key of a png render of svg bytes in a helpers.render_cache.RenderCache."""
+    return cache.get_key(svg_data, scale=scale, image_format='png', region=None,
+                         quality=quality.get_profile(quality_profile))
+
+
+def render_png_with_cache(svg_data, cache, pool=None, quality_profile=quality.DEFAULT_PROFILE, scale=PIXEL_SCALE,
+                          profiler=None):
+    """Convert svg bytes to png bytes, reusing a previous render of the same content if there is one.
+
+    :param svg_data: Content of a svg file.
+    :param cache: A helpers.render_cache.RenderCache.
+    :param pool: Optional helpers.surface_pool.SurfacePool to take the surface from.
+    :param quality_profile: Name of a helpers.quality profile.
+    :param scale: Number of pixels per svg unit.
+    :param profiler: Optional helpers.profiling.Profiler, finished once the png is found in the cache
+           or rendered. The cache lookup is measured as the cache phase.
+    :return: Content of the png file.
+    :rtype: bytes
+    """
+
+    key = get_cache_key(cache, svg_data, quality_profile, scale)
+    if profiler is not None:
+        with profiler.phase('cache'):
+            png_data = cache.get(key)
+    else:
+        png_data = cache.get(key)
+
+    if png_data is None:
+        png_data = render_png(svg_data, pool, quality_profile, profiler, scale=scale)
+        cache.put(key, png_data)
+    elif profiler is not None:
+        profiler.finish()
+
+    return png_data
+
+
+def convert(svg_source, png_target, pool=None, cache=None, quality_profile=quality.DEFAULT_PROFILE, profiler=None,
+            scale=PIXEL_SCALE):
+    """Convert a svg document to a png image.
+
+    :param svg_source: A path to a svg file, '-' for the standard input, the content of a svg file as bytes
+           or a binary file object.
+    :param png_target: A path to the png file, '-' for the standard output or a writable binary file object.
+    :param pool: Optional helpers.surface_pool.SurfacePool to take the surface from.
+    :param cache: Optional helpers.render_cache.RenderCache holding previous renders.
+    :param quality_profile: Name of a helpers.quality profile.
+    :param profiler: Optional helpers.profiling.Profiler, finished once the png is written.
+           A render found in the cache only has its cache phase, and lines of the slowest elements
+           are only found for seekable sources or with a cache.
+    :param scale: Number of pixels per svg unit.
+    :raise: ValueError if svg_source is not a svg document.
+    :raise: FileNotFoundError if svg_source does not exist.
+    """
+
+    with xml.open_svg(svg_source) as svg_file:
+        if cache is not None:
+            xml.write_output(png_target, render_png_with_cache(svg_file.read(), cache, pool, quality_profile, scale,
+                                                               profiler))
+            return
+
+        surface = render(svg_file, pool, quality_profile, profiler, scale=scale)
+        try:
+            draw_image(sys.stdout.buffer if png_target == xml.STDIO_NAME else png_target, surface, profiler)
+        finally:
+            if pool is not None:
+                pool.release(surface)
+
+        if profiler is not None:
+            profiler.finish(svg_file if svg_file.seekable() else None)
+
+
+def parse_arguments(argv):
+    """Parse the arguments received from command line.
+
+    :param argv: The list of arguments received from command line.
+    :return: The parsed arguments.
+    :rtype: argparse.Namespace
+    """
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='svg.py', description='Convert a svg file to png format.')
+    parser.add_argument('svg_file', help='path to a svg file, - for stdin')
+    parser.add_argument('-o', '--output', default=PNG_FILENAME,
+                        help='path to the png file, - for stdout (default: %(default)s)')
+    parser.add_argument('--tile-size', type=int,
+                        help='render the image in square tiles of this many pixels on several processes')
+    parser.add_argument('-j', '--workers', type=int,
+                        help='number of processes used to render tiles (default: number of processors)')
+    parser.add_argument('--stripe-height', type=int,
+                        help='render the image in stripes of this many rows streamed to the png file, '
+                             'so memory does not grow with the height of the image')
+    parser.add_argument('--cache-dir', help='directory of a cache of previous renders')
+    parser.add_argument('--cache-size', type=int,
+                        help='maximum size of the cache in bytes (default: 1 GiB)')
+    parser.add_argument('--cache-stats', action='store_true', help='print the statistics of the cache')
+    parser.add_argument('-q', '--quality', choices=sorted(quality.PROFILES), default=quality.DEFAULT_PROFILE,
+                        help='quality profile, draft and fast trade fidelity for speed (default: %(default)s)')
+    parser.add_argument('--profile', metavar='REPORT_FILE',
+                        help='write a json report of the time spent per phase, tag and element, - for stdout')
+    parser.add_argument('--max-pixels', type=int, help='largest number of pixels of the image')
+    parser.add_argument('--max-memory', type=int, metavar='BYTES', help='largest estimated memory of the render')
+    parser.add_argument('--max-seconds', type=float, help='largest estimated time of the render')
+    parser.add_argument('--over-limit', choices=cost.OVER_LIMIT_POLICIES, default='downgrade',
+                        help='refuse renders over the limits, or render them at a lower quality or scale '
+                             '(default: %(default)s)')
+    parser.add_argument('--estimate', action='store_true',
+                        help='print the statistics, the estimated cost and the render plan as json, without rendering')
+    arguments = parser.parse_args(argv)
+    if arguments.output == xml.STDIO_NAME and arguments.profile == xml.STDIO_NAME:
+        parser.error('the png file and the profiling report cannot both be written to stdout')
+    if arguments.tile_size and arguments.svg_file == xml.STDIO_NAME:
+        parser.error('tiled rendering needs a path to a svg file')
+    if arguments.tile_size and arguments.stripe_height:
+        parser.error('an image is rendered either in tiles or in stripes')
+
+    return arguments
+
+
+def get_limits(arguments):
+    """Get the helpers.cost limits given on command line, as a dictionary."""
+    return {name: value for name, value in (('max_pixels', arguments.max_pixels),
+                                            ('max_memory_bytes', arguments.max_memory),
+                                            ('max_seconds', arguments.max_seconds)) if value is not None}
 
 
 def main(argv):
     """Convert a svg file to png format.
 
     :param argv: The list of arguments received from command line.
-           argv[0]: Path to a svg file.
+           argv[0]: Path to a svg file, - for the standard input.
+           -o/--output: Path to the png file, - for the standard output.
+           --tile-size: Size of the tiles rendered in parallel, if any.
+           -j/--workers: Number of processes rendering tiles.
+           --stripe-height: Number of rows of the stripes streamed to the png file, if any.
+           --cache-dir, --cache-size, --cache-stats: Location, size and statistics of the render cache.
+           -q/--quality: Name of the quality profile.
+           --profile: Path to the json profiling report.
+           --max-pixels, --max-memory, --max-seconds, --over-limit: Limits of the render, and what to do over them.
+           --estimate: Print the render plan instead of rendering.
+    :return: Exit status, 1 if the file cannot be converted or its render is rejected by the limits.
+    :rtype: int
     """
 
-    if len(argv) != 1:
-        print('Invalid arguments. Format: svg.py image.svg')
-    else:
-        svg_file = argv[0]
+    arguments = parse_arguments(argv)
+    limits = get_limits(arguments)
+    svg_source, scale, quality_profile = arguments.svg_file, PIXEL_SCALE, arguments.quality
+    if limits or arguments.estimate:
+        if svg_source == xml.STDIO_NAME:
+            # the standard input is read once for the estimate and once for the render
+            svg_source = sys.stdin.buffer.read()
         try:
-            xml.check_if_file_is_svg(svg_file)
-            items = xml.get_items_from_svg_root(svg_file)
-            size = xml.get_svg_dimensions(svg_file)
-            surface = init_surface(size)
-            build_cairo_context(size, items, surface)
-            draw_image(PNG_FILENAME, surface)
+            with xml.open_svg(svg_source) as svg_file:
+                plan = cost.estimate_document(svg_file, scale, quality_profile, limits or None, arguments.over_limit)
         except ValueError:
-            print('Invalid file. Should be a svg')
+            print('Invalid file. Should be a svg', file=sys.stderr)
+            return 1
         except FileNotFoundError:
-            print('File', svg_file, 'not found')
+            print('File', arguments.svg_file, 'not found', file=sys.stderr)
+            return 1
+
+        if arguments.estimate:
+            print(json.dumps(plan, indent=2))
+            return 0
+        if plan['action'] == 'reject':
+            print(cost.CostLimitExceeded(plan), file=sys.stderr)
+            return 1
+        if plan['action'] == 'downgrade':
+            print('Render downgraded to scale {scale} and {quality_profile} quality: {0}'.format(
+                ', '.join(plan['reasons']), **plan), file=sys.stderr)
+        scale, quality_profile = plan['scale'], plan['quality_profile']
+
+    cache = None
+    if arguments.cache_dir is not None:
+        from helpers import render_cache
+
+        cache = render_cache.RenderCache(arguments.cache_dir, arguments.cache_size or render_cache.DEFAULT_MAX_BYTES)
+
+    profiler = None
+    if arguments.profile is not None:
+        from helpers import profiling
+
+        profiler = profiling.Profiler(callback=lambda report: profiling.write_report(report, arguments.profile))
+
+    status = 0
+    try:
+        if arguments.tile_size:
+            from renderers import tiled
+
+            tiled.convert_tiled(arguments.svg_file, arguments.output, arguments.tile_size, arguments.workers, cache,
+                                quality_profile, profiler, scale)
+        elif arguments.stripe_height:
+            from renderers import striped
+
+            striped.render_striped(svg_source, arguments.output, arguments.stripe_height, quality_profile, scale=scale,
+                                   profiler=profiler)
+        else:
+            convert(svg_source, arguments.output, cache=cache, quality_profile=quality_profile, profiler=profiler,
+                    scale=scale)
+    except ValueError:
+        print('Invalid file. Should be a svg', file=sys.stderr)
+        status = 1
+    except FileNotFoundError:
+        print('File', arguments.svg_file, 'not found', file=sys.stderr)
+        status = 1
+
+    if cache is not None and arguments.cache_stats:
+        print('Cache: {hits} hits, {misses} misses, {entries} entries, {bytes} bytes'.format(**cache.stats()),
+              file=sys.stderr)
+    return status
 
 
 if __name__ == '__main__':
-    main(sys.argv[1:])
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,17 @@
+"""
+This module contains the tests of the renderer, run with python -m pytest tests.
+Tests drawing with cairo are skipped when pycairo is not installed.
+
+tests/test_colors: Parsing of svg colors.
+tests/test_path: Tokenizing and parsing of path data.
+tests/test_png: Streaming png encoder.
+tests/test_polyline: Parsing and simplification of polylines.
+tests/test_cost: Estimation of the cost of a render and admission control.
+tests/test_transform: Parsing and combination of transform matrices.
+tests/test_spatial_index: Grid index of bounding boxes.
+tests/test_batch: Output names, error messages and dead workers of batch conversions.
+tests/test_render_cache: Storage, lookup and eviction of cached renders.
+tests/test_server: Deadlines and replacement of dead workers of the render server.
+tests/test_xml: Sniffing and streaming of svg documents, and command line diagnostics.
+tests/test_rendering: Pixel identity of batched, striped, tiled and pooled renders with a single pass render.
+"""
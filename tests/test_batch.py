@@ -0,0 +1,41 @@
+import multiprocessing
+import os
+import unittest
+from unittest import mock
+
+import batch
+
+
+def convert_or_crash(svg_file, png_filename, *arguments, **keywords):
+    """Stand-in for svg.convert whose worker process dies on files named crash.svg."""
+    if os.path.basename(svg_file) == 'crash.svg':
+        os._exit(1)
+
+
+class BatchHelpersTest(unittest.TestCase):
+
+    def test_output_filename(self):
+        self.assertEqual(batch.get_output_filename('out/{parent}/{stem}-{index}.png', 'inputs/icons/a.svg', 3),
+                         'out/icons/a-3.png')
+        self.assertEqual(batch.get_output_filename('{dir}/{name}.png', 'a.svg', 0), './a.svg.png')
+
+    def test_describe_error_leaves_out_the_file_name(self):
+        self.assertEqual(batch.describe_error(FileNotFoundError(2, 'No such file', 'a.svg')), 'File not found')
+        self.assertEqual(batch.describe_error(ValueError('Not a svg document')), 'Invalid file. Should be a svg')
+        self.assertEqual(batch.describe_error(MemoryError('too big')), 'MemoryError: too big')
+
+
+@unittest.skipIf(multiprocessing.get_start_method() != 'fork', 'workers only see the patched convert when forked')
+class BrokenPoolTest(unittest.TestCase):
+
+    def test_files_left_by_a_dead_worker_are_failures(self):
+        jobs = [('a.svg', 'a.png'), ('crash.svg', 'crash.png'), ('b.svg', 'b.png')]
+        with mock.patch.object(batch.svg, 'convert', convert_or_crash):
+            results = list(batch.run_jobs(jobs, workers=2, chunk_size=1, pool_bytes=0))
+
+        self.assertEqual([(svg_file, png_filename) for svg_file, png_filename, _, _ in results], jobs)
+        self.assertEqual(results[1][2], 'Worker process terminated abruptly')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from helpers import colors
+
+
+class ParseColorTest(unittest.TestCase):
+
+    def test_hex_colors(self):
+        self.assertEqual(colors.parse_color('#ff0000'), (1.0, 0.0, 0.0, 1.0))
+        self.assertEqual(colors.parse_color('#F00'), (1.0, 0.0, 0.0, 1.0))
+        self.assertEqual(colors.parse_color('#ff000000'), (1.0, 0.0, 0.0, 0.0))
+        self.assertEqual(colors.parse_color('#f008'), (1.0, 0.0, 0.0, 0x88 / 255))
+
+    def test_functional_colors(self):
+        self.assertEqual(colors.parse_color('rgb(255, 0, 0)'), (1.0, 0.0, 0.0, 1.0))
+        self.assertEqual(colors.parse_color('rgba(255, 0, 0, 0.5)'), (1.0, 0.0, 0.0, 0.5))
+        self.assertEqual(colors.parse_color('rgb(100%, 0%, 0%)'), (1.0, 0.0, 0.0, 1.0))
+        self.assertEqual(colors.parse_color('hsl(120, 100%, 50%)'), (0.0, 1.0, 0.0, 1.0))
+
+    def test_named_colors(self):
+        self.assertEqual(colors.parse_color('red'), (1.0, 0.0, 0.0, 1.0))
+        self.assertEqual(colors.parse_color(' White '), (1.0, 1.0, 1.0, 1.0))
+        self.assertEqual(colors.parse_color('transparent'), colors.TRANSPARENT)
+
+    def test_invalid_colors(self):
+        for color in ('#12', '#1234567', '#1_2', '#+12', '#12 ', 'rgb(1, 2)', 'notacolor', 'none'):
+            with self.subTest(color=color), self.assertRaises(ValueError):
+                colors.parse_color(color)
+
+    def test_convert_color_to_rgb(self):
+        self.assertEqual(colors.convert_color_to_rgb('#00ff00'), (0.0, 1.0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from helpers import cost
+
+DOCUMENT = (b'<svg xmlns="http://www.w3.org/2000/svg" width="300" height="200">'
+            b'<rect x="0" y="0" width="10" height="10"/>'
+            b'<g><path d="M0 0 L10 10 C1 2 3 4 5 6 z"/></g>'
+            b'<polyline points="0,0 1,1 2,2"/>'
+            b'</svg>')
+
+
+class ScanDocumentTest(unittest.TestCase):
+
+    def test_statistics(self):
+        statistics = cost.scan_document(DOCUMENT)
+        self.assertEqual((statistics['width'], statistics['height']), (300, 200))
+        self.assertEqual(statistics['elements'], 4)
+        self.assertEqual(statistics['tags'], {'rect': 1, 'g': 1, 'path': 1, 'polyline': 1})
+        self.assertEqual(statistics['path_commands'], 4)
+        self.assertEqual(statistics['points'], 5 + 3)
+
+    def test_invalid_documents(self):
+        for svg_data in (b'<svg', b'<svg width="a" height="1"/>', b'<svg/>'):
+            with self.subTest(svg_data=svg_data), self.assertRaises(ValueError):
+                cost.scan_document(svg_data)
+
+
+class PlanRenderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.statistics = cost.scan_document(DOCUMENT)
+
+    def test_within_limits(self):
+        plan = cost.plan_render(self.statistics, cost.DEFAULT_LIMITS, 10)
+        self.assertEqual(plan['action'], 'render')
+        self.assertEqual(plan['estimate']['pixels'], 3000 * 2000)
+
+    def test_downgrade_lowers_the_scale(self):
+        plan = cost.plan_render(self.statistics, {'max_pixels': 10 ** 6}, 10)
+        self.assertEqual(plan['action'], 'downgrade')
+        self.assertLess(plan['scale'], 10)
+        self.assertLessEqual(cost.estimate_cost(self.statistics, plan['scale'])['pixels'], 10 ** 6)
+
+    def test_reject_policy(self):
+        plan = cost.plan_render(self.statistics, {'max_pixels': 10 ** 6}, 10, over_limit='reject')
+        self.assertEqual(plan['action'], 'reject')
+        self.assertEqual(len(plan['reasons']), 1)
+        error = cost.CostLimitExceeded(plan)
+        self.assertIsInstance(error, ValueError)
+        self.assertIs(error.plan, plan)
+
+    def test_structural_limits_always_reject(self):
+        plan = cost.plan_render(self.statistics, {'max_elements': 2}, 10)
+        self.assertEqual(plan['action'], 'reject')
+
+    def test_too_small_scale_rejects(self):
+        plan = cost.plan_render(self.statistics, {'max_pixels': 100}, 10)
+        self.assertEqual(plan['action'], 'reject')
+
+    def test_unknown_policy_and_profile(self):
+        with self.assertRaises(ValueError):
+            cost.plan_render(self.statistics, {}, 10, over_limit='ignore')
+        with self.assertRaises(ValueError):
+            cost.plan_render(self.statistics, {}, 10, quality_profile='ultra')
+
+    def test_estimate_document(self):
+        plan = cost.estimate_document(DOCUMENT, 10)
+        self.assertEqual(plan['action'], 'render')
+        self.assertEqual(plan['statistics']['elements'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
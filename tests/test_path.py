@@ -0,0 +1,67 @@
+import unittest
+
+from shapes import path
+
+
+class TokenizePathDataTest(unittest.TestCase):
+
+    def test_separators(self):
+        self.assertEqual(path.tokenize_path_data('M 10,20 L30 , 40'), ['M', '10', '20', 'L', '30', '40'])
+
+    def test_compact_numbers(self):
+        self.assertEqual(path.tokenize_path_data('M10-5.5.5'), ['M', '10', '-5.5', '.5'])
+
+    def test_exponents(self):
+        self.assertEqual(path.tokenize_path_data('M1e2,-2.5E-1'), ['M', '1e2', '-2.5E-1'])
+
+    def test_stops_at_invalid_character(self):
+        self.assertEqual(path.tokenize_path_data('M10,10 L20#20'), ['M', '10', '10', 'L', '20'])
+        self.assertEqual(path.tokenize_path_data('M 1 1 x L 2 2'), ['M', '1', '1'])
+
+
+class ParseCommandsTest(unittest.TestCase):
+
+    def test_implicit_repeats(self):
+        self.assertEqual(path.parse_commands_to_list('M0 0 10 10 20 20'),
+                         [('M', 0.0, 0.0), ('L', 10.0, 10.0), ('L', 20.0, 20.0)])
+        self.assertEqual(path.parse_commands_to_list('m1 1 2 2 z'),
+                         [('M', 1.0, 1.0), ('l', 2.0, 2.0), ('z',)])
+        self.assertEqual(path.parse_commands_to_list('M0 0 C1 1 2 2 3 3 4 4 5 5 6 6'),
+                         [('M', 0.0, 0.0), ('C', 1.0, 1.0, 2.0, 2.0, 3.0, 3.0), ('C', 4.0, 4.0, 5.0, 5.0, 6.0, 6.0)])
+
+    def test_compact_arc_flags(self):
+        self.assertEqual(path.parse_commands_to_list('M0 0 a10 10 0 0150 50'),
+                         [('M', 0.0, 0.0), ('a', 10.0, 10.0, 0.0, 0.0, 1.0, 50.0, 50.0)])
+        self.assertEqual(path.parse_commands_to_list('M0 0 a10 10 0 1 0 50 50'),
+                         [('M', 0.0, 0.0), ('a', 10.0, 10.0, 0.0, 1.0, 0.0, 50.0, 50.0)])
+
+    def test_invalid_arc_flags(self):
+        for path_data in ('M0 0 a10 10 0 1.5 50 50', 'M0 0 a10 10 0 0 2 50 50', 'M0 0 a10 10 0 .5 1 50 50'):
+            with self.subTest(path_data=path_data):
+                self.assertEqual(path.parse_commands_to_list(path_data), [('M', 0.0, 0.0)])
+
+    def test_stops_at_first_error(self):
+        self.assertEqual(path.parse_commands_to_list('M10,10 L20#20'), [('M', 10.0, 10.0)])
+        self.assertEqual(path.parse_commands_to_list('M0 0 L10'), [('M', 0.0, 0.0)])
+        self.assertEqual(path.parse_commands_to_list('L10 10'), [])
+        self.assertEqual(path.parse_commands_to_list(''), [])
+
+    def test_commands_box(self):
+        commands = path.parse_commands_to_list('M0 0 L10 5 l-20 10 z')
+        self.assertEqual(path.get_commands_box(commands), (-10.0, 0.0, 10.0, 15.0))
+
+
+class GetAttributesTest(unittest.TestCase):
+
+    def test_stroke_none(self):
+        attributes = path.get_attributes({'d': 'M0 0 L10 10', 'stroke': 'none', 'stroke-width': '3'}, (100, 100))
+        self.assertIsNone(attributes.stroke_color)
+
+    def test_stroke_color(self):
+        attributes = path.get_attributes({'d': 'M0 0 L10 10', 'stroke': 'red', 'stroke-width': '3'}, (100, 100))
+        self.assertEqual(attributes.stroke_color, (1.0, 0.0, 0.0))
+        self.assertEqual(attributes.stroke_width, 3.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
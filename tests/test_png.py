@@ -0,0 +1,76 @@
+import io
+import random
+import struct
+import unittest
+import zlib
+
+from helpers import png
+
+
+def read_png(png_data):
+    """Decode a png image written by helpers.png.PngWriter to its width, height and rows."""
+    width, height = struct.unpack('>II', png_data[16:24])
+    compressed = []
+    position = len(png.SIGNATURE)
+    while position < len(png_data):
+        length, chunk_type = struct.unpack('>I4s', png_data[position:position + 8])
+        data = png_data[position + 8:position + 8 + length]
+        crc, = struct.unpack('>I', png_data[position + 8 + length:position + 12 + length])
+        assert crc == zlib.crc32(data, zlib.crc32(chunk_type))
+        if chunk_type == b'IDAT':
+            compressed.append(data)
+        position += length + 12
+
+    data = zlib.decompress(b''.join(compressed))
+    row_bytes = width * 3
+    rows = []
+    previous_row = bytes(row_bytes)
+    for row_index in range(height):
+        start = row_index * (row_bytes + 1)
+        filter_type, row = data[start:start + 1], data[start + 1:start + 1 + row_bytes]
+        if filter_type == png.FILTER_UP:
+            row = bytes((a + b) & 0xff for a, b in zip(row, previous_row))
+        rows.append(row)
+        previous_row = row
+
+    return width, height, rows
+
+
+class SubtractBytesTest(unittest.TestCase):
+
+    def test_matches_bytewise_subtraction(self):
+        generator = random.Random(0)
+        for length in (1, 2, 7, 64):
+            row = bytes(generator.randrange(256) for _ in range(length))
+            previous_row = bytes(generator.randrange(256) for _ in range(length))
+            self.assertEqual(png.subtract_bytes(row, previous_row),
+                             bytes((a - b) & 0xff for a, b in zip(row, previous_row)))
+
+
+class PngWriterTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        generator = random.Random(1)
+        width, height = 13, 40
+        rows = [bytes(generator.randrange(256) for _ in range(width * 3)) for _ in range(height)]
+        stream = io.BytesIO()
+        writer = png.PngWriter(stream, width, height)
+        for row in rows:
+            writer.write_row(row)
+        writer.close()
+
+        self.assertTrue(stream.getvalue().startswith(png.SIGNATURE))
+        self.assertEqual(read_png(stream.getvalue()), (width, height, rows))
+
+    def test_row_count_is_checked(self):
+        writer = png.PngWriter(io.BytesIO(), 1, 1)
+        writer.write_row(b'\x00\x00\x00')
+        with self.assertRaises(ValueError):
+            writer.write_row(b'\x00\x00\x00')
+
+        with self.assertRaises(ValueError):
+            png.PngWriter(io.BytesIO(), 1, 2).close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import math
+import unittest
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from shapes import polyline, records
+
+
+class PathRecorder:
+    """Stand-in for a cairo context scaled by 2, recording the points of the path drawn on it."""
+
+    def __init__(self, tolerance):
+        self.tolerance = tolerance
+        self.points = []
+
+    def get_tolerance(self):
+        return self.tolerance
+
+    def device_to_user_distance(self, dx, dy):
+        return dx / 2, dy / 2
+
+    def move_to(self, x, y):
+        self.points.append((x, y))
+
+    line_to = move_to
+
+
+def get_wave(number_of_points):
+    """Get the coordinates of a sine wave sampled much more finely than a pixel."""
+    coordinates = array('d')
+    for index in range(number_of_points):
+        coordinates.extend((index / 10, math.sin(index / 100) * 10))
+    return coordinates
+
+
+class ParsePointsTest(unittest.TestCase):
+
+    def test_separators_and_odd_coordinate(self):
+        self.assertEqual(list(polyline.parse_points('1,2 3 4, 5')), [1.0, 2.0, 3.0, 4.0])
+
+    def test_invalid_coordinate(self):
+        with self.assertRaises(ValueError):
+            polyline.parse_points('1,2 3,x')
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class SimplifyTest(unittest.TestCase):
+
+    def test_straight_line_keeps_its_ends(self):
+        coordinates = array('d', [0, 0, 1, 1, 2, 2, 3, 3, 4, 4])
+        self.assertEqual(list(polyline.simplify_points(coordinates, 0.01)), [0, 0, 4, 4])
+
+    def test_points_beyond_tolerance_are_kept(self):
+        coordinates = array('d', [0, 0, 1, 0, 2, 5, 3, 0, 4, 0])
+        self.assertEqual(list(polyline.simplify_points(coordinates, 0.5)), [0, 0, 1, 0, 2, 5, 3, 0, 4, 0])
+        self.assertEqual(list(polyline.simplify_points(coordinates, 10)), [0, 0, 4, 0])
+
+    def test_add_path_simplifies_with_the_curve_tolerance(self):
+        attributes = records.Polyline(get_wave(1000), None, (0, 0, 0), 1)
+        default_context = PathRecorder(polyline.DEFAULT_TOLERANCE)
+        polyline.add_path(default_context, attributes)
+        self.assertEqual(len(default_context.points), 1000)
+
+        draft_context = PathRecorder(0.5)
+        polyline.add_path(draft_context, attributes)
+        self.assertLess(len(draft_context.points), 100)
+        self.assertEqual(draft_context.points[0], default_context.points[0])
+        self.assertEqual(draft_context.points[-1], default_context.points[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import svg
+from helpers import profiling, render_cache
+
+
+class RenderCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = render_cache.RenderCache(directory.name, max_bytes=100)
+
+    def test_get_and_put(self):
+        key = self.cache.get_key(b'<svg/>', scale=1)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, b'png')
+        self.assertEqual(self.cache.get(key), b'png')
+        self.assertEqual(self.cache.stats(), {'hits': 1, 'misses': 1, 'entries': 1, 'bytes': 3})
+
+    def test_keys_depend_on_parameters(self):
+        self.assertNotEqual(self.cache.get_key(b'<svg/>', scale=1), self.cache.get_key(b'<svg/>', scale=2))
+        self.assertEqual(self.cache.get_key(b'<svg/>', scale=1, region=None),
+                         self.cache.get_key(b'<svg/>', region=None, scale=1))
+
+    def test_entry_evicted_after_read_is_a_hit(self):
+        key = self.cache.get_key(b'<svg/>')
+        self.cache.put(key, b'png')
+        with mock.patch.object(render_cache.os, 'utime', side_effect=FileNotFoundError):
+            self.assertEqual(self.cache.get(key), b'png')
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 0))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        keys = [self.cache.get_key(bytes([index])) for index in range(3)]
+        for index, key in enumerate(keys):
+            self.cache.put(key, b'x' * 40)
+            os.utime(self.cache.get_entry_path(key), (index, index))
+        self.cache.evict()
+        self.assertEqual([self.cache.get(key) is not None for key in keys], [False, True, True])
+
+    def test_cache_hit_is_profiled(self):
+        svg_data = b'<svg width="1" height="1"/>'
+        self.cache.put(svg.get_cache_key(self.cache, svg_data), b'png')
+        reports = []
+        profiler = profiling.Profiler(callback=reports.append)
+        self.assertEqual(svg.render_png_with_cache(svg_data, self.cache, profiler=profiler), b'png')
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0]['phases']['cache']['calls'], 1)
+        self.assertEqual(reports[0]['phases']['draw']['calls'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
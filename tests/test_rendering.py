@@ -0,0 +1,145 @@
+import concurrent.futures
+import io
+import math
+import os
+import tempfile
+import threading
+import unittest
+
+try:
+    import cairo
+except ImportError:
+    cairo = None
+
+import svg
+from benchmarks import batching, generators
+from helpers import png, xml
+from tests.test_png import read_png
+
+CHECK_STRIPE_HEIGHT = 37  # rows, not a divisor of the image heights, so stripes and tiles end inside elements
+CHECK_SCALE = 0.4  # pixels per svg unit, so the 1000x1000 generated documents stay small
+
+
+def get_surface_rows(surface):
+    """Get the rows of a cairo RGB24 surface, 3 bytes per pixel, as written by helpers.png.PngWriter."""
+    surface.flush()
+    data, stride, width = bytes(surface.get_data()), surface.get_stride(), surface.get_width()
+    red, green, blue = png.RGB_OFFSETS
+    rows = []
+    for row_index in range(surface.get_height()):
+        pixels = data[row_index * stride:row_index * stride + width * 4]
+        row = bytearray(width * 3)
+        row[0::3], row[1::3], row[2::3] = pixels[red::4], pixels[green::4], pixels[blue::4]
+        rows.append(bytes(row))
+
+    return rows
+
+
+def get_documents():
+    """Get small documents with overlapping elements, paths, strokes and <use> instances."""
+    return {
+        'overlapping scatter plot': batching.generate_scatter_plot(500, overlapping=True),
+        'random paths': generators.generate_paths(30, 10),
+        'stroked lines': generators.generate_shapes('line', 200),
+        'use instances': generators.generate_instances(50)
+    }
+
+
+@unittest.skipIf(cairo is None, 'pycairo is not installed')
+class BatchingTest(unittest.TestCase):
+
+    def render(self, svg_data, batched):
+        size, items = xml.stream_svg(io.BytesIO(svg_data))
+        surface = svg.init_surface(size)
+        context = svg.init_cairo_context(surface, size)
+        svg.fill_context(context, size, items, batched)
+        return surface
+
+    def test_batched_fills_give_the_same_pixels(self):
+        svg_data = batching.generate_scatter_plot(2000, overlapping=False)
+        self.assertEqual(get_surface_rows(self.render(svg_data, True)),
+                         get_surface_rows(self.render(svg_data, False)))
+
+
+@unittest.skipIf(cairo is None, 'pycairo is not installed')
+class StripedTest(unittest.TestCase):
+
+    def assertSameAsSinglePass(self, svg_data, scale=CHECK_SCALE):
+        from renderers import striped
+
+        expected_rows = get_surface_rows(svg.render(io.BytesIO(svg_data), scale=scale))
+        png_file = io.BytesIO()
+        striped.render_striped(svg_data, png_file, CHECK_STRIPE_HEIGHT, scale=scale)
+        self.assertEqual(read_png(png_file.getvalue())[2], expected_rows)
+
+    def test_stripes_give_the_same_pixels(self):
+        for name, svg_data in get_documents().items():
+            with self.subTest(document=name):
+                self.assertSameAsSinglePass(svg_data)
+
+    def test_fractional_scale(self):
+        self.assertSameAsSinglePass(generators.generate_paths(30, 10), scale=0.37)
+
+    def test_profiled_stripes(self):
+        from helpers import profiling
+        from renderers import striped
+
+        profiler = profiling.Profiler()
+        striped.render_striped(generators.generate_paths(30, 10), io.BytesIO(), CHECK_STRIPE_HEIGHT, scale=CHECK_SCALE,
+                               profiler=profiler)
+        report = profiler.report()
+        self.assertEqual(report['phases']['parse']['calls'], 1)
+        self.assertEqual(report['phases']['draw']['calls'], math.ceil(1000 * CHECK_SCALE / CHECK_STRIPE_HEIGHT))
+
+
+@unittest.skipIf(cairo is None, 'pycairo is not installed')
+class TiledTest(unittest.TestCase):
+
+    def test_tiles_give_the_same_pixels(self):
+        from renderers import tiled
+
+        for name, svg_data in get_documents().items():
+            with self.subTest(document=name):
+                with tempfile.NamedTemporaryFile(suffix='.svg', delete=False) as svg_file:
+                    svg_file.write(svg_data)
+                try:
+                    surface = tiled.render_tiled(svg_file.name, CHECK_STRIPE_HEIGHT, workers=1, scale=CHECK_SCALE)
+                finally:
+                    os.remove(svg_file.name)
+                self.assertEqual(get_surface_rows(surface),
+                                 get_surface_rows(svg.render(io.BytesIO(svg_data), scale=CHECK_SCALE)))
+
+
+@unittest.skipIf(cairo is None, 'pycairo is not installed')
+class SurfacePoolTest(unittest.TestCase):
+
+    def setUp(self):
+        from helpers.surface_pool import SurfacePool
+
+        self.pool = SurfacePool()
+
+    def render_rows(self, svg_data, scale=0.37):
+        surface = svg.render(io.BytesIO(svg_data), self.pool, scale=scale)
+        try:
+            return get_surface_rows(surface)
+        finally:
+            self.pool.release(surface)
+
+    def test_reused_surface_gives_the_same_pixels(self):
+        white_data = b'<svg width="1000" height="1000"><rect width="1000" height="1000" fill="white"/></svg>'
+        svg_data = generators.generate_paths(30, 10)
+        self.render_rows(white_data)
+        self.assertEqual(self.render_rows(svg_data), get_surface_rows(svg.render(io.BytesIO(svg_data), scale=0.37)))
+        self.assertEqual(self.pool.hits, 1)
+
+    def test_failed_render_drops_its_surface(self):
+        cancel_event = threading.Event()
+        cancel_event.set()
+        with self.assertRaises(concurrent.futures.CancelledError):
+            svg.render(io.BytesIO(generators.generate_paths(30, 10)), self.pool, cancel_event=cancel_event)
+        self.assertEqual(self.pool.idle, {})
+        self.assertEqual(self.pool.contexts, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import time
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import cairo
+except ImportError:
+    cairo = None
+
+import server
+
+SVG_DATA = b'<svg width="10" height="10"><rect width="5" height="5" fill="red"/></svg>'
+
+
+class DeadlineTest(unittest.TestCase):
+
+    def test_is_set_once_reached(self):
+        self.assertTrue(server.Deadline(time.time() - 1).is_set())
+        self.assertFalse(server.Deadline(time.time() + 60).is_set())
+
+
+@unittest.skipIf(cairo is None, 'pycairo is not installed')
+class RenderServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.service = server.RenderService(1, timeout=30)
+        self.addCleanup(self.service.shutdown)
+
+    def test_worker_stops_at_the_deadline(self):
+        with self.assertRaises(TimeoutError):
+            server.render_svg_data(SVG_DATA, end_time=time.time() - 1)
+
+    def test_dead_worker_is_replaced(self):
+        broken_executor = self.service.executor
+        with self.assertRaises(BrokenProcessPool):
+            broken_executor.submit(os._exit, 1).result()
+
+        self.assertTrue(self.service.render(SVG_DATA).startswith(b'\x89PNG'))
+        self.assertIsNot(self.service.executor, broken_executor)
+
+
+if __name__ == '__main__':
+    unittest.main()
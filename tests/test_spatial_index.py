@@ -0,0 +1,28 @@
+import random
+import unittest
+
+from helpers import geometry
+from helpers.spatial_index import GridIndex
+
+
+class GridIndexTest(unittest.TestCase):
+
+    def test_query_matches_brute_force(self):
+        generator = random.Random(0)
+        index = GridIndex((100, 50), cells_per_side=8)
+        boxes = []
+        for _ in range(300):
+            x, y = generator.uniform(-20, 110), generator.uniform(-20, 60)
+            box = (x, y, x + generator.uniform(0, 30), y + generator.uniform(0, 30))
+            self.assertEqual(index.insert(box), len(boxes))
+            boxes.append(box)
+
+        for _ in range(100):
+            x, y = generator.uniform(-30, 120), generator.uniform(-30, 70)
+            region = (x, y, x + generator.uniform(0, 40), y + generator.uniform(0, 40))
+            expected = [box_id for box_id, box in enumerate(boxes) if geometry.boxes_intersect(box, region)]
+            self.assertEqual(index.query(region), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import math
+import unittest
+
+from helpers import transform
+
+
+class ParseTransformTest(unittest.TestCase):
+
+    def assertMatrixEqual(self, matrix, expected):
+        for value, expected_value in zip(matrix, expected):
+            self.assertAlmostEqual(value, expected_value)
+
+    def test_functions(self):
+        self.assertEqual(transform.parse_transform('translate(10 20)'), (1.0, 0.0, 0.0, 1.0, 10.0, 20.0))
+        self.assertEqual(transform.parse_transform('translate(10)'), (1.0, 0.0, 0.0, 1.0, 10.0, 0.0))
+        self.assertEqual(transform.parse_transform('scale(2)'), (2.0, 0.0, 0.0, 2.0, 0.0, 0.0))
+        self.assertEqual(transform.parse_transform('matrix(1,2,3,4,5,6)'), (1.0, 2.0, 3.0, 4.0, 5.0, 6.0))
+        self.assertMatrixEqual(transform.parse_transform('rotate(90)'), (0.0, 1.0, -1.0, 0.0, 0.0, 0.0))
+        self.assertMatrixEqual(transform.parse_transform('skewX(45)'), (1.0, 0.0, 1.0, 1.0, 0.0, 0.0))
+
+    def test_rotation_around_a_point(self):
+        matrix = transform.parse_transform('rotate(90, 10, 10)')
+        x, y = 20, 10
+        a, b, c, d, e, f = matrix
+        self.assertAlmostEqual(a * x + c * y + e, 10)
+        self.assertAlmostEqual(b * x + d * y + f, 20)
+
+    def test_functions_apply_right_to_left(self):
+        matrix = transform.parse_transform('translate(10, 0) scale(2)')
+        self.assertEqual(matrix, (2.0, 0.0, 0.0, 2.0, 10.0, 0.0))
+
+    def test_empty_and_invalid(self):
+        self.assertIsNone(transform.parse_transform(''))
+        self.assertIsNone(transform.parse_transform('  '))
+        for value in ('translate(1 2 3)', 'spin(4)', 'scale(2) junk'):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                transform.parse_transform(value)
+
+    def test_transform_box(self):
+        self.assertEqual(transform.transform_box((0, 0, 10, 5), None), (0, 0, 10, 5))
+        box = transform.transform_box((0, 0, 10, 5), transform.parse_transform('rotate(90)'))
+        for value, expected in zip(box, (-5, 0, 0, 10)):
+            self.assertAlmostEqual(value, expected)
+        self.assertTrue(math.isclose(transform.get_scale_factor((2.0, 0.0, 0.0, 2.0, 0.0, 0.0)), 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import svg
+from helpers import xml
+
+NAMESPACED_DOCUMENT = (b'<svg xmlns="http://www.w3.org/2000/svg" width="10" height="20">'
+                       b'<rect width="1" height="1"/></svg>')
+PLAIN_DOCUMENT = b'<?xml version="1.0"?>\n<svg width="10" height="20"><rect width="1" height="1"/></svg>'
+
+
+class SvgContentTest(unittest.TestCase):
+
+    def test_check_svg_content(self):
+        xml.check_svg_content(NAMESPACED_DOCUMENT)
+        xml.check_svg_content(PLAIN_DOCUMENT)
+        xml.check_svg_content(b'\xef\xbb\xbf<!-- comment --><!DOCTYPE svg [<!ENTITY a "b">]><svg:svg>')
+        for head in (b'<html><svg>', b'<svgx>', b'', b'<!-- unterminated'):
+            with self.subTest(head=head), self.assertRaises(ValueError):
+                xml.check_svg_content(head)
+
+    def test_remove_namespace(self):
+        self.assertEqual(xml.remove_namespace('{http://www.w3.org/2000/svg}rect'), 'rect')
+        self.assertEqual(xml.remove_namespace('rect'), 'rect')
+
+    def test_stream_documents_without_namespace(self):
+        for document in (NAMESPACED_DOCUMENT, PLAIN_DOCUMENT):
+            with self.subTest(document=document), xml.open_svg(document) as svg_file:
+                size, items = xml.stream_svg(svg_file)
+                self.assertEqual(size, (10, 20))
+                self.assertEqual([xml.remove_namespace(item.tag) for item in items], ['rect'])
+
+
+class MainTest(unittest.TestCase):
+
+    def run_main(self, arguments):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            status = svg.main(arguments)
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_diagnostics_go_to_stderr(self):
+        status, stdout, stderr = self.run_main(['--estimate', os.path.join(tempfile.gettempdir(), 'missing.svg')])
+        self.assertEqual(status, 1)
+        self.assertEqual(stdout, '')
+        self.assertIn('not found', stderr)
+
+    def test_estimate_document_without_namespace(self):
+        with tempfile.NamedTemporaryFile(suffix='.svg', delete=False) as svg_file:
+            svg_file.write(PLAIN_DOCUMENT)
+        try:
+            status, stdout, stderr = self.run_main(['--estimate', svg_file.name])
+        finally:
+            os.remove(svg_file.name)
+        self.assertEqual(status, 0)
+        self.assertEqual(json.loads(stdout)['action'], 'render')
+        self.assertEqual(stderr, '')
+
+
+if __name__ == '__main__':
+    unittest.main()
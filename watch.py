@@ -0,0 +1,129 @@
+import argparse
+import os
+import sys
+import time
+
+import svg
+from helpers import xml
+from renderers.document import load_document
+from renderers.incremental import IncrementalRenderer
+
+DEFAULT_POLL_INTERVAL = 0.5
+
+
+def get_file_version(svg_file):
+    """Get a value which changes each time a file is saved.
+
+    :param svg_file: Path to a file.
+    :return: A tuple (modification time, size), or None if the file does not exist.
+    :rtype: tuple
+    """
+
+    try:
+        status = os.stat(svg_file)
+    except FileNotFoundError:
+        return None
+
+    return status.st_mtime_ns, status.st_size
+
+
+def get_redrawn_ratio(regions, size):
+    """Get the share of the image covered by disjoint regions.
+
+    :param regions: List of regions (min x, min y, max x, max y).
+    :param size: Size of the image (i.e. width and height).
+    :return: A value between 0 and 1.
+    :rtype: float
+    """
+
+    width, height = size
+    redrawn_area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in regions)
+    return redrawn_area / (width * height) if width and height else 0
+
+
+def update_image(renderer, svg_file, png_filename):
+    """Parse a new version of a svg file, repaint the changed regions and save the image.
+
+    :param renderer: The renderers.incremental.IncrementalRenderer holding the previous image.
+    :param svg_file: Path to a svg file.
+    :param png_filename: Path to the png file.
+    :return: Report of the update.
+    :rtype: str
+    """
+
+    start_time = time.perf_counter()
+    document = load_document(svg_file)
+    regions = renderer.update(document)
+    svg.draw_image(png_filename, renderer.surface)
+    elapsed_time = time.perf_counter() - start_time
+
+    return 'Redrew {0:.2%} of the canvas in {1} regions ({2} elements) in {3:.0f} ms'.format(
+        get_redrawn_ratio(regions, document.size), len(regions), len(document.elements), elapsed_time * 1000)
+
+
+def watch(svg_file, png_filename, poll_interval=DEFAULT_POLL_INTERVAL):
+    """Convert a svg file each time it is saved, until interrupted.
+
+    :param svg_file: Path to a svg file.
+    :param png_filename: Path to the png file.
+    :param poll_interval: Number of seconds between two checks of the file.
+    """
+
+    renderer = IncrementalRenderer()
+    version = None
+    while True:
+        new_version = get_file_version(svg_file)
+        if new_version is not None and new_version != version:
+            version = new_version
+            try:
+                print(update_image(renderer, svg_file, png_filename))
+            except FileNotFoundError:
+                print('File', svg_file, 'not found')
+            except (ValueError, KeyError, SyntaxError) as error:
+                # the file may be saved again in a moment, keep the last good image
+                print('Invalid file:', error)
+        time.sleep(poll_interval)
+
+
+def parse_arguments(argv):
+    """Parse the arguments received from command line.
+
+    :param argv: The list of arguments received from command line.
+    :return: The parsed arguments.
+    :rtype: argparse.Namespace
+    """
+
+    parser = argparse.ArgumentParser(prog='watch.py',
+                                     description='Convert a svg file to png format each time it is saved.')
+    parser.add_argument('svg_file', help='path to a svg file')
+    parser.add_argument('-o', '--output', default=svg.PNG_FILENAME, help='path to the png file (default: %(default)s)')
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help='seconds between two checks of the file (default: %(default)s)')
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    """Watch a svg file and re-render the regions which change.
+
+    :param argv: The list of arguments received from command line.
+    """
+
+    arguments = parse_arguments(argv)
+    try:
+        with xml.open_svg(arguments.svg_file):
+            pass
+    except ValueError:
+        print('Invalid file. Should be a svg')
+        return
+    except FileNotFoundError:
+        print('File', arguments.svg_file, 'not found')
+        return
+
+    try:
+        watch(arguments.svg_file, arguments.output, arguments.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])